@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "core"))
+
+import aggregates
+
+VARIABLE_COUNTS = [5, 50, 200]
+DAYS = 20_000
+
+def make_dataset(variables: int) -> pd.DataFrame:
+    """
+    Daily readings of random variables with gaps, about the length of the physical dataset.
+    """
+    rng = np.random.default_rng(42)
+    values = rng.normal(size=(DAYS, variables))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    data = pd.DataFrame(values, columns=[f'variable_{i}' for i in range(variables)])
+    data.insert(0, 'date', pd.date_range('1970-01-01', periods=DAYS, freq='D'))
+    return data
+
+def per_variable_aggregation(data: pd.DataFrame) -> None:
+    """
+    Aggregations the graph functions used to repeat for every variable.
+    """
+    for variable in data.columns[1:]:
+        data.set_index('date').resample('YE')[variable].mean()  # Time series
+        data.set_index('date').resample('ME')[variable].mean()  # Monthly correlation
+        seasonal_data = data.copy()
+        seasonal_data['month'] = seasonal_data['date'].dt.month
+        seasonal_data.groupby('month')[variable].mean()  # Seasonal
+
+def main() -> None:
+    print(f"{'variables':>10} {'per variable':>14} {'pyramid':>10} {'speedup':>9}")
+    for variables in VARIABLE_COUNTS:
+        data = make_dataset(variables)
+
+        start = time.perf_counter()
+        per_variable_aggregation(data)
+        per_variable_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        aggregates.build_aggregate_pyramid(data)
+        pyramid_seconds = time.perf_counter() - start
+
+        print(f"{variables:>10} {per_variable_seconds:>12.2f} s {pyramid_seconds:>8.2f} s {per_variable_seconds / pyramid_seconds:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
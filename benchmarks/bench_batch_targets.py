@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "src" / "app" / "cli.py"
+
+PARAMETER_SOURCE = 'data/biological_data.csv'
+TARGETS = [
+    'data/lakelevel_data.csv:lakelevel',
+    'data/chemical_data.csv:chlorophyll a',
+    'data/chemical_data.csv:secchi depth',
+]
+COMMON_ARGUMENTS = ['--no-cache', '--force-render', '--profile', 'draft', '--bootstrap_replicates', '0']
+
+def run_cli(folderpath: str, *arguments: str) -> float:
+    """
+    Run the CLI in a fresh output folder and return its wall time.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(CLI), PARAMETER_SOURCE, *arguments, *COMMON_ARGUMENTS],
+                   cwd=folderpath, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def count_graphs(folderpath: str) -> int:
+    return sum(len([f for f in files if f.endswith('.png')]) for _, _, files in os.walk(os.path.join(folderpath, 'output')))
+
+def prepare_folder(folderpath: str) -> None:
+    os.makedirs(os.path.join(folderpath, 'src', 'website'))  # The website index is written here
+    for name in ('data', 'assets'):
+        os.symlink(ROOT / name, os.path.join(folderpath, name))
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        separate_path = os.path.join(tmpdir, 'separate')
+        batch_path = os.path.join(tmpdir, 'batch')
+        prepare_folder(separate_path)
+        prepare_folder(batch_path)
+
+        separate_seconds = 0
+        for target in TARGETS:
+            source, _, y_variable = target.rpartition(':')
+            separate_seconds += run_cli(separate_path, '--y_variable_source', source, '--y_variable', y_variable)
+
+        batch_seconds = run_cli(batch_path, '--targets', *TARGETS)
+
+        print(f"{PARAMETER_SOURCE} against {len(TARGETS)} y variables")
+        print(f"{'mode':<22} {'time':>9} {'graphs':>8}")
+        print(f"{f'{len(TARGETS)} separate runs':<22} {separate_seconds:>7.1f} s {count_graphs(separate_path):>8}")
+        print(f"{'one batch run':<22} {batch_seconds:>7.1f} s {count_graphs(batch_path):>8}")
+
+if __name__ == '__main__':
+    main()
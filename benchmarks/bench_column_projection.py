@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli
+
+DATASET = 'data/biological_data.csv'
+SYNTHETIC_FACTOR = 2000  # The bundled sheet has only a handful of rows
+VARIABLE_COUNTS = [2, 10, 50, None]
+REPEATS = 3
+
+def write_synthetic_dataset(filepath: str, factor: int, folderpath: str) -> str:
+    """
+    Stack a dataset `factor` times with consecutive dates, so the loaders see a long and wide sheet.
+    """
+    raw = pd.read_csv(filepath, dtype=str)
+    synthetic = pd.concat([raw] * factor, ignore_index=True)
+    synthetic['Date'] = pd.date_range('1970-01-02', periods=len(synthetic), freq='D').strftime('%Y-%m-%d')
+    synthetic_path = os.path.join(folderpath, f"{Path(filepath).stem}_x{factor}.csv")
+    synthetic.to_csv(synthetic_path, index=False)
+    return synthetic_path
+
+def time_load(filepath: str, variables: list) -> tuple:
+    """
+    Return the best wall time of REPEATS parses and the size of the loaded frame in MB.
+    """
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        data = cli.parse_and_process_x_data(filepath, variables)
+        timings.append(time.perf_counter() - start)
+    return min(timings), data.memory_usage(deep=True).sum() / 1e6
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as folderpath:
+        filepath = write_synthetic_dataset(DATASET, SYNTHETIC_FACTOR, folderpath)
+        headers = [header for header in cli.read_csv_headers(filepath) if header != 'date']
+
+        start = time.perf_counter()
+        cli.read_csv_headers(filepath)
+        print(f"{os.path.basename(filepath)}: {len(headers)} variables, header scan {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        print(f"{'variables':>10} {'load':>10} {'memory':>10}")
+        for count in VARIABLE_COUNTS:
+            variables = None if count is None else headers[:count]
+            seconds, megabytes = time_load(filepath, variables)
+            print(f"{count or len(headers):>10} {seconds * 1000:>7.0f} ms {megabytes:>7.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli  # Also puts src/core on the path
+import generate_plots
+
+POINT_COUNTS = [2_000, 20_000, 200_000]
+
+def make_correlation_data(points: int) -> pd.DataFrame:
+    """
+    Temperature and lake level readings with a weak negative correlation.
+    """
+    rng = np.random.default_rng(3)
+    temperature = rng.normal(10, 5, points)
+    return pd.DataFrame({'temperature': temperature, 'lakelevel': 20 - 0.02 * temperature + rng.normal(0, 0.2, points)})
+
+def render(data: pd.DataFrame, path: str, density_threshold: int) -> float:
+    start = time.perf_counter()
+    generate_plots.plot_correlation(data, 'temperature', 'lakelevel', path, density_threshold=density_threshold)
+    return time.perf_counter() - start
+
+def main() -> None:
+    print(f"{'points':>8} {'scatter':>10} {'density':>10} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = tmpdir + os.sep
+        # Build both templates first
+        render(make_correlation_data(100), path, 0)
+        render(make_correlation_data(100), path, 1)
+        for points in POINT_COUNTS:
+            data = make_correlation_data(points)
+            scatter_seconds = render(data, path, 0)
+            density_seconds = render(data, path, 1)
+            print(f"{points:>8} {scatter_seconds * 1000:>7.0f} ms {density_seconds * 1000:>7.0f} ms {scatter_seconds / density_seconds:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
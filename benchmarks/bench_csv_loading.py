@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli
+
+DATASETS = [
+    'data/physical_data.csv',
+    'data/chemical_data.csv',
+    'data/biological_data.csv',
+    'data/lakelevel_data.csv',
+]
+SYNTHETIC_FACTOR = 10
+REPEATS = 5
+
+def legacy_read_measurement_csv(filepath: str) -> pd.DataFrame:
+    """
+    Per-cell cleaning path the CLI loaders used before read_measurement_csv.
+    """
+    dataframe = pd.read_csv(filepath, dtype=str)
+    dataframe = dataframe.map(lambda x: x.strip().replace(',', '') if isinstance(x, str) else x)
+    dataframe = dataframe.replace('', np.nan)
+    dataframe.columns = [col.lower() for col in dataframe.columns]
+    for col in dataframe.columns:
+        if col != 'date':
+            dataframe[col] = pd.to_numeric(dataframe[col], errors='coerce')
+    return dataframe
+
+def time_call(function, filepath: str) -> float:
+    """
+    Return the best wall time of REPEATS calls in seconds.
+    """
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(filepath)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def write_synthetic_dataset(filepath: str, factor: int, folderpath: str) -> str:
+    """
+    Stack a dataset `factor` times into a new CSV so the loaders see `factor` times the rows.
+    """
+    raw = pd.read_csv(filepath, dtype=str)
+    synthetic = pd.concat([raw] * factor, ignore_index=True)
+    synthetic_path = os.path.join(folderpath, f"{Path(filepath).stem}_x{factor}.csv")
+    synthetic.to_csv(synthetic_path, index=False)
+    return synthetic_path
+
+def benchmark(filepath: str) -> None:
+    pd.testing.assert_frame_equal(legacy_read_measurement_csv(filepath), cli.read_measurement_csv(filepath))
+
+    legacy = time_call(legacy_read_measurement_csv, filepath)
+    vectorized = time_call(cli.read_measurement_csv, filepath)
+    print(f"{os.path.basename(filepath):<32} legacy {legacy * 1000:9.1f} ms   "
+          f"vectorized {vectorized * 1000:8.1f} ms   speedup {legacy / vectorized:6.1f}x")
+
+def main() -> None:
+    print("Bundled datasets:")
+    for filepath in DATASETS:
+        benchmark(filepath)
+
+    print(f"\nSynthetic datasets ({SYNTHETIC_FACTOR}x rows):")
+    with tempfile.TemporaryDirectory() as folderpath:
+        for filepath in DATASETS:
+            benchmark(write_synthetic_dataset(filepath, SYNTHETIC_FACTOR, folderpath))
+
+if __name__ == '__main__':
+    main()
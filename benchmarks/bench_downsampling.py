@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli  # Also puts src/core on the path
+import generate_plots
+
+MAX_POINTS = 4000
+# The length of the lake level record, a longer daily record and a sub-daily logger record
+SERIES = [(55, 'D'), (200, 'D'), (30, 'h')]
+REPEATS = 3
+
+def make_series(years: int, frequency: str) -> pd.DataFrame:
+    """
+    Lake level like readings: a slow trend, a seasonal cycle and noise.
+    """
+    rng = np.random.default_rng(7)
+    dates = pd.date_range('1825-01-01', end=pd.Timestamp('1825-01-01') + pd.DateOffset(years=years), freq=frequency)
+    day = (dates - dates[0]).days.to_numpy()
+    level = 400 - day * 1e-4 + 0.5 * np.sin(2 * np.pi * day / 365.25) + np.cumsum(rng.normal(scale=0.02, size=len(dates)))
+    return pd.DataFrame({'date': dates, 'lakelevel': level})
+
+def render(data: pd.DataFrame, path: str, max_points: int, method: str) -> tuple:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        generate_plots.plot_timeseries(data, 'lakelevel', path, max_points=max_points, downsampling_method=method)
+    seconds = (time.perf_counter() - start) / REPEATS
+    return seconds, os.path.getsize(path + 'lakelevel_timeseries.png')
+
+def main() -> None:
+    print(f"{'points':>8} {'method':>8} {'render':>10} {'png size':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_plots.plot_timeseries(make_series(1, 'D'), 'lakelevel', tmpdir + os.sep)  # Build the template first
+        for years, frequency in SERIES:
+            data = make_series(years, frequency)
+            for max_points, method in ((0, 'lttb'), (MAX_POINTS, 'lttb'), (MAX_POINTS, 'minmax')):
+                seconds, size = render(data, tmpdir + os.sep, max_points, method)
+                name = method if max_points else 'none'
+                print(f"{len(data):>8} {name:>8} {seconds * 1000:>7.0f} ms {size / 1024:>7.0f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli  # Also puts src/core on the path
+import aggregates
+import generate_plots
+
+PARAMETER_SOURCE = 'data/biological_data.csv'
+WRITER_THREADS = [0, 1, 2, 4]
+
+def render_all(pyramid: dict, variables: list, path: str) -> float:
+    start = time.perf_counter()
+    for variable in variables:
+        generate_plots.plot_timeseries(aggregates.get_aggregate(pyramid, 'daily', variable).dropna(), variable, path)
+        generate_plots.plot_seasonal_correlation(aggregates.get_aggregate(pyramid, 'month_of_year', variable), variable, path)
+    errors = generate_plots.flush_images()
+    assert not errors, errors
+    return time.perf_counter() - start
+
+def main() -> None:
+    data = cli.load_and_process_x_data(PARAMETER_SOURCE)
+    pyramid = aggregates.build_aggregate_pyramid(data)
+    variables = [variable for variable in data.columns if variable != 'date' and data[variable].notna().sum() >= 2]
+
+    print(f"{PARAMETER_SOURCE}: {2 * len(variables)} plots, web profile, {os.cpu_count()} CPU(s)")
+    print(f"{'writer threads':>15} {'total':>10} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline = None
+        for threads in WRITER_THREADS:
+            generate_plots.configure_image_writer(threads)
+            seconds = render_all(pyramid, variables, tmpdir + os.sep)
+            baseline = baseline or seconds
+            print(f"{threads:>15} {seconds:>8.2f} s {baseline / seconds:>8.2f}x")
+    generate_plots.configure_image_writer(0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "src" / "app" / "cli.py"
+
+COMMANDS = [
+    ['--help'],
+    ['plot', '--help'],
+    ['headers', 'data/chemical_data.csv'],
+    ['index'],
+]
+# What every command paid before the imports were deferred: the CLI with all of its modules loaded
+ALL_MODULES = ("import sys; sys.path.insert(0, {app!r}); import cli; "
+               "[module.__name__ for module in (cli.np, cli.pd, cli.generate_plots, cli.analysis, cli.correlation, cli.aggregates)]")
+HEAVY_MODULES = ['numpy', 'pandas', 'matplotlib', 'scipy']
+REPEATS = 5
+
+def parse_import_times(stderr: str) -> dict:
+    """
+    Cumulative import time in microseconds of every top-level import in -X importtime output.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):  # Nested imports are indented and already counted by their importer
+            times[name.strip()] = int(cumulative)
+    return times
+
+def run(folderpath: str, arguments: list) -> tuple:
+    """
+    Run the CLI REPEATS times and return the best wall time and the import times of the fastest run.
+    """
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=folderpath,
+                                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best[0]:
+            best = (seconds, parse_import_times(result.stderr))
+    return best
+
+def prepare_folder(folderpath: str) -> None:
+    os.makedirs(os.path.join(folderpath, 'src', 'website'))  # The website index is written here
+    for name in ('timeseries_graphs', 'seasonal_graphs', 'correlation_graphs'):
+        os.makedirs(os.path.join(folderpath, 'output', name))
+    os.symlink(ROOT / 'data', os.path.join(folderpath, 'data'))
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        prepare_folder(tmpdir)
+        runs = [(' '.join(command), [str(CLI), *command]) for command in COMMANDS]
+        runs.append(('(all modules loaded)', ['-c', ALL_MODULES.format(app=str(CLI.parent))]))
+
+        print(f"{'command':<40} {'wall':>8} {'imports':>9}  heavy modules")
+        for label, arguments in runs:
+            seconds, times = run(tmpdir, arguments)
+            heavy = [name for name in HEAVY_MODULES if any(module.split('.')[0] == name for module in times)]
+            print(f"{label:<40} {seconds * 1000:>5.0f} ms {sum(times.values()) / 1000:>6.0f} ms  {', '.join(heavy) or '-'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli
+import interpolation
+
+DATASETS = [
+    'data/physical_data.csv',
+    'data/chemical_data.csv',
+    'data/biological_data.csv',
+]
+MAX_GAP_DAYS = 90
+REPEATS = 5
+
+def pandas_interpolation(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    What load_x_variable_data() used to do.
+    """
+    return data.set_index('date').interpolate(method='time').reset_index()
+
+def engine_interpolation(data: pd.DataFrame, max_gap: float = np.inf) -> pd.DataFrame:
+    data = data.copy()
+    times = data['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    columns = list(data.columns[1:])
+    data[columns] = interpolation.interpolate_columns(times, data[columns].to_numpy(), [max_gap] * len(columns))
+    return data
+
+def best_of(function, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    print(f"{'dataset':<26} {'pandas':>10} {'engine':>10} {'readings':>9} {'filled':>8} {f'filled <= {MAX_GAP_DAYS} d':>14}")
+    for filepath in DATASETS:
+        data = cli.read_measurement_csv(filepath)
+        data['date'] = pd.to_datetime(data['date'], errors='coerce')
+
+        pandas_seconds = best_of(pandas_interpolation, data)
+        engine_seconds = best_of(engine_interpolation, data)
+
+        readings = data.iloc[:, 1:].notna().to_numpy().sum()
+        filled = engine_interpolation(data).iloc[:, 1:].notna().to_numpy().sum() - readings
+        limited = engine_interpolation(data, MAX_GAP_DAYS * interpolation.NANOSECONDS_PER_DAY).iloc[:, 1:].notna().to_numpy().sum() - readings
+
+        print(f"{Path(filepath).name:<26} {pandas_seconds * 1000:>7.1f} ms {engine_seconds * 1000:>7.1f} ms {readings:>9} {filled:>8} {limited:>14}")
+
+if __name__ == '__main__':
+    main()
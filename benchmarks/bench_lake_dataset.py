@@ -0,0 +1,68 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "core"))
+
+import aggregates
+from lake_dataset import LakeDataset
+
+VARIABLE_COUNTS = [5, 50, 200]
+DAYS = 20_000
+REPEATS = 3
+
+def make_sources(variables: int) -> tuple:
+    """
+    Daily readings of random variables with gaps, about the length of the physical dataset, and a lake level every other day.
+    """
+    rng = np.random.default_rng(42)
+    values = rng.normal(size=(DAYS, variables))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    x_data = pd.DataFrame(values, columns=[f'variable_{i}' for i in range(variables)])
+    x_data.insert(0, 'date', pd.date_range('1970-01-01', periods=DAYS, freq='D'))
+    y_data = pd.DataFrame({'date': x_data['date'].iloc[::2], 'lakelevel': rng.normal(size=DAYS // 2)})
+    return x_data, y_data
+
+def merged_pyramids(x_data: pd.DataFrame, y_data: pd.DataFrame) -> None:
+    """
+    What the CLI used to do: merge the y variable onto the x data, then aggregate both frames.
+    """
+    merged = pd.merge(x_data, y_data, on='date', how='left')
+    aggregates.build_aggregate_pyramid(merged)
+    aggregates.build_aggregate_pyramid(y_data)
+
+def dataset_pyramids(x_data: pd.DataFrame, y_data: pd.DataFrame, dtype) -> LakeDataset:
+    dataset = LakeDataset.from_frames({'x': x_data, 'y': y_data}, dtype=dtype)
+    aggregates.build_dataset_pyramid(dataset, 'x', dataset.get_variables('x') + ['lakelevel'])
+    aggregates.build_dataset_pyramid(dataset, 'y')
+    return dataset
+
+def best_of(function, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    print(f"{'variables':>10} {'merge':>10} {'dataset':>10} {'float32':>10} {'float64 MB':>11} {'float32 MB':>11}")
+    for variables in VARIABLE_COUNTS:
+        x_data, y_data = make_sources(variables)
+
+        merge_seconds = best_of(merged_pyramids, x_data, y_data)
+        dataset_seconds = best_of(dataset_pyramids, x_data, y_data, np.float64)
+        compact_seconds = best_of(dataset_pyramids, x_data, y_data, np.float32)
+
+        sizes = []
+        for dtype in (np.float64, np.float32):
+            dataset = LakeDataset.from_frames({'x': x_data, 'y': y_data}, dtype=dtype)
+            sizes.append(sum(values.nbytes for columns in dataset.columns.values() for values in columns.values()) / 1e6)
+
+        print(f"{variables:>10} {merge_seconds:>8.2f} s {dataset_seconds:>8.2f} s {compact_seconds:>8.2f} s {sizes[0]:>11.1f} {sizes[1]:>11.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import calendar
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli  # Also puts src/core on the path
+import aggregates
+import generate_plots
+
+PARAMETER_SOURCE = 'data/biological_data.csv'
+
+def legacy_plot_timeseries(data: pd.DataFrame, variable: str, path: str, marker_threshold: int = 50, max_labels: int = 15) -> None:
+    """
+    Per-plot pyplot path plot_timeseries used before PlotRenderer (daily ticks).
+    """
+    plt.figure(figsize=(10, 6))
+    label = generate_plots.get_variable_label(variable)
+    marker_style = '.' if len(data) <= marker_threshold else None
+    plt.plot(data['date'], data[variable], marker=marker_style, label=label, color=generate_plots.get_variable_color(variable))
+    numeric_dates = mdates.date2num(data['date'])
+    trend_line_function = generate_plots.calculate_trend(data, 'date', variable)
+    plt.plot(data['date'], trend_line_function(numeric_dates), linestyle='--', color='gray', label=f'{label} Trend')
+    plt.xlabel('Date')
+    plt.ylabel(label)
+    plt.title(f"{label} over time")
+    plt.xticks(data['date'][::max(1, len(data) // max_labels)], rotation=45)
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path + f'{variable}_timeseries.png', dpi=300)
+    plt.close()
+
+def legacy_plot_seasonal_correlation(data: pd.DataFrame, variable: str, path: str) -> None:
+    """
+    Per-plot pyplot path plot_seasonal_correlation used before PlotRenderer.
+    """
+    label = generate_plots.get_variable_label(variable)
+    plt.figure(figsize=(10, 6))
+    plt.plot(data['month'], data[variable], marker='o', color=generate_plots.get_variable_color(variable), label=label)
+    plt.xticks(data['month'], data['month'].apply(lambda x: calendar.month_name[x]), rotation=45)
+    plt.xlabel('Month')
+    plt.ylabel(label)
+    plt.title(f"Seasonal Correlation of {label}")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path + f'{variable}_seasonal_correlation.png', dpi=300)
+    plt.close()
+
+def render_all(timeseries, seasonal, pyramid: dict, variables: list, path: str) -> float:
+    start = time.perf_counter()
+    for variable in variables:
+        timeseries(aggregates.get_aggregate(pyramid, 'daily', variable).dropna(), variable, path)
+        seasonal(aggregates.get_aggregate(pyramid, 'month_of_year', variable), variable, path)
+    return time.perf_counter() - start
+
+def main() -> None:
+    data = cli.load_and_process_x_data(PARAMETER_SOURCE)
+    pyramid = aggregates.build_aggregate_pyramid(data)
+    variables = [variable for variable in data.columns if variable != 'date' and data[variable].notna().sum() >= 2]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_seconds = render_all(legacy_plot_timeseries, legacy_plot_seasonal_correlation, pyramid, variables, tmpdir + os.sep)
+        renderer_seconds = render_all(generate_plots.plot_timeseries, generate_plots.plot_seasonal_correlation, pyramid, variables, tmpdir + os.sep)
+
+    plots = 2 * len(variables)
+    print(f"{PARAMETER_SOURCE}: {plots} plots")
+    print(f"{'pyplot per plot':>20} {legacy_seconds:>8.2f} s {legacy_seconds / plots * 1000:>8.0f} ms/plot")
+    print(f"{'PlotRenderer':>20} {renderer_seconds:>8.2f} s {renderer_seconds / plots * 1000:>8.0f} ms/plot")
+    print(f"{'speedup':>20} {legacy_seconds / renderer_seconds:>8.2f}x")
+
+if __name__ == '__main__':
+    main()
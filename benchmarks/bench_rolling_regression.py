@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "core"))
+
+import analysis
+
+SIZES = [20_000, 200_000, 2_000_000]
+POLYFIT_SAMPLE_WINDOWS = 200  # Windows actually timed with polyfit, the rest is extrapolated
+
+def make_lake_level_series(n: int) -> tuple:
+    """
+    Daily dates as matplotlib numbers and a random walk around 20 m.
+    """
+    rng = np.random.default_rng(42)
+    x = 365.0 + np.arange(n, dtype=float)
+    y = 20.0 + np.cumsum(rng.normal(0.0, 0.01, n))
+    return x, y
+
+def time_polyfit_windows(x: np.ndarray, y: np.ndarray, window: int, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        np.polyfit(x[i:i+window], y[i:i+window], 1)
+    return time.perf_counter() - start
+
+def main() -> None:
+    print(f"{'points':>10} {'window':>8} {'windows':>9} {'polyfit loop':>16} {'cumulative sums':>17} {'speedup':>10}")
+    for n in SIZES:
+        x, y = make_lake_level_series(n)
+        window = max(10, n // 10)  # Same rule as forecast_future_lake_level
+        windows = n - window + 1
+
+        sampled = min(POLYFIT_SAMPLE_WINDOWS, windows)
+        polyfit_seconds = time_polyfit_windows(x, y, window, sampled) * windows / sampled
+
+        start = time.perf_counter()
+        slopes, _ = analysis.rolling_linear_regression(x, y, window)
+        closed_form_seconds = time.perf_counter() - start
+
+        reference = np.array([np.polyfit(x[i:i+window], y[i:i+window], 1)[0] for i in range(0, windows, max(1, windows // 20))])
+        np.testing.assert_allclose(slopes[::max(1, windows // 20)], reference, rtol=1e-6, atol=1e-12)
+
+        estimate = '~' if sampled < windows else ' '
+        print(f"{n:>10} {window:>8} {windows:>9} {estimate}{polyfit_seconds:>14.2f} s {closed_form_seconds * 1000:>14.1f} ms "
+              f"{polyfit_seconds / closed_form_seconds:>9.0f}x")
+
+    print(f"\n~ polyfit time extrapolated from {POLYFIT_SAMPLE_WINDOWS} timed windows")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+
+import cli
+
+YEARS = 50
+VARIABLES = 24
+CHUNK_ROWS = 100_000
+
+def write_hourly_export(filepath: str) -> None:
+    """
+    Hourly readings of several sensors over YEARS years, with missing readings and a few long outages.
+    """
+    dates = pd.date_range('1990-01-01', periods=YEARS * 8766, freq='h')
+    rng = np.random.default_rng(11)
+    values = rng.normal(size=(len(dates), VARIABLES)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    for start in rng.integers(0, len(dates) - 2000, size=10):
+        values[start:start + 2000, rng.integers(VARIABLES)] = np.nan
+    data = pd.DataFrame(values, columns=[f'sensor {i}' for i in range(VARIABLES)]).round(3)
+    data.insert(0, 'Date', dates.strftime('%Y-%m-%d %H:%M'))
+    data.to_csv(filepath, index=False)
+
+def get_peak_memory() -> float:
+    """
+    Peak resident memory of this process in MB. VmHWM starts over on exec, unlike ru_maxrss which children inherit.
+    """
+    with open('/proc/self/status', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+def measure(mode: str, filepath: str) -> None:
+    """
+    Load the file in this (fresh) process and print the wall time and the peak resident memory.
+    """
+    start = time.perf_counter()
+    if mode == 'whole':
+        data = cli.parse_and_process_x_data(filepath)
+    else:
+        data = cli.stream_and_process_x_data(filepath, chunk_rows=CHUNK_ROWS, daily=mode == 'daily')
+    seconds = time.perf_counter() - start
+    peak_mb = get_peak_memory()
+    print(f"{mode:>10} {seconds:>8.2f} s {peak_mb:>9.0f} MB {len(data):>10}")
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as folderpath:
+        filepath = os.path.join(folderpath, 'hourly_export.csv')
+        write_hourly_export(filepath)
+        print(f"{YEARS} years hourly, {VARIABLES} variables, {os.path.getsize(filepath) / 1e6:.0f} MB CSV, chunks of {CHUNK_ROWS} rows")
+        print(f"{'loader':>10} {'time':>10} {'peak RSS':>12} {'rows':>10}")
+
+        # Every loader runs in its own process, so the peak memory of one does not hide the other
+        for mode in ('whole', 'streamed', 'daily'):
+            subprocess.run([sys.executable, __file__, mode, filepath], check=True)
+
+        subprocess.run([sys.executable, __file__, 'imports'], check=True)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+    elif sys.argv[1:] == ['imports']:
+        print(f"(peak RSS after importing the CLI: {get_peak_memory():.0f} MB)")
+    else:
+        main()
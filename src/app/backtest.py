@@ -0,0 +1,69 @@
+import argparse
+import os
+
+import cli
+import analysis
+import generate_plots
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse command-line arguments for the lake level forecast backtest.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description='Lake Trend Analyzer forecast backtest')
+
+    parser.add_argument('--lakelevel_source', type=str, default='data/lakelevel_data.csv', help='Source CSV file for the lake level.')
+    parser.add_argument('--horizons', type=int, nargs='+', default=[1, 10], help='Forecast horizons in years.')
+    parser.add_argument('--step_days', type=int, default=30, help='Days between successive forecast origins.')
+    parser.add_argument('--min_history_years', type=float, default=10, help='History required before the first forecast origin.')
+    parser.add_argument('--changepoint_method', type=str, choices=['pelt', 'binseg'], default='pelt', help='Change point method used to find the recent lake level trend.')
+
+    return parser.parse_args()
+
+def run_backtest(arguments: argparse.Namespace, table_path: str, summary_path: str, graph_folder_path: str) -> None:
+    """
+    Backtest the lake level forecast and write the table, summary and summary plot.
+
+    Args:
+        arguments (argparse.Namespace): Backtest settings.
+        table_path (str): Path of the CSV table with one row per origin and horizon.
+        summary_path (str): Path of the text summary.
+        graph_folder_path (str): Path to the folder where the summary plot will be saved to.
+    """
+
+    data = cli.load_y_variable_data(arguments.lakelevel_source, 'lakelevel')
+
+    table = analysis.backtest_lake_level_forecast(data,
+                                                  horizons=tuple(arguments.horizons),
+                                                  step_days=arguments.step_days,
+                                                  min_history_years=arguments.min_history_years,
+                                                  method=arguments.changepoint_method)
+    summary = analysis.summarize_backtest(table)
+
+    table.to_csv(table_path, index=False, float_format='%.4f', date_format='%Y-%m-%d')
+
+    with open(summary_path, 'w', encoding='utf-8') as file:
+        file.write(f"Lake level forecast backtest ({arguments.changepoint_method}, origins every {arguments.step_days} days "
+                   f"from {table['origin_date'].min().date()} to {table['origin_date'].max().date()}):\n\n")
+        file.write(summary.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        file.write("\n\nErrors are forecast minus actual lake level in m. "
+                   "persistence_mae is the error of simply repeating the last reading.\n")
+
+    generate_plots.plot_backtest(table, graph_folder_path)
+
+    print(summary.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    print(f"Backtest saved to {table_path} and {summary_path}")
+
+def main() -> None:
+    arguments = parse_arguments()
+
+    graph_folder_path = 'output/backtest_graphs/'
+    os.makedirs(graph_folder_path, exist_ok=True)
+
+    run_backtest(arguments, 'output/lake_level_backtest.csv', 'output/lake_level_backtest.txt', graph_folder_path)
+
+if __name__ == '__main__':
+    main()
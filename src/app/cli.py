@@ -1,66 +1,223 @@
+from __future__ import annotations  # Annotations name pandas and core types without importing them
+
 import argparse
-import numpy as np
-import pandas as pd
-import matplotlib.dates as mdates
-import difflib
+import contextlib
+import csv
+import importlib.util
+import multiprocessing
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import os
 
+# Graphs are only drawn on Agg canvases, never let matplotlib look for an interactive backend
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
 core_path = Path(__file__).resolve().parent.parent / "core"
 sys.path.append(str(core_path))
 
-import generate_plots
-import analysis
-import generate_website_index
+def lazy_import(name: str):
+    """
+    Import a module on its first attribute access, so commands that do not need numpy, pandas or matplotlib
+    (help, headers, index) start without their import time.
+
+    Args:
+        name (str): Module name, e.g. 'pandas' or a core module.
+
+    Returns:
+        module: The module, loaded once something is looked up on it.
+    """
 
-def parse_arguments() -> argparse.Namespace:
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+generate_plots = lazy_import('generate_plots')
+aggregates = lazy_import('aggregates')
+analysis = lazy_import('analysis')
+build_manifest = lazy_import('build_manifest')
+correlation = lazy_import('correlation')
+dataset_cache = lazy_import('dataset_cache')
+downsampling = lazy_import('downsampling')
+generate_website_index = lazy_import('generate_website_index')
+interpolation = lazy_import('interpolation')
+lake_dataset = lazy_import('lake_dataset')
+streaming = lazy_import('streaming')
+
+COMMANDS = ['plot', 'forecast', 'index', 'headers']
+
+# Choices of --profile and --downsampling, see generate_plots.RENDER_PROFILES and downsampling.DOWNSAMPLING_METHODS.
+# Listed here so parsing the arguments does not import matplotlib and numpy.
+RENDER_PROFILES = ['draft', 'web', 'publication']
+DEFAULT_RENDER_PROFILE = 'web'
+DOWNSAMPLING_METHODS = ['lttb', 'minmax']
+
+FORECAST_PATH = 'output/lake_level_forecast.txt'
+FORECAST_BUILD = 'forecast'  # Manifest build of the forecast, shared by full runs and the forecast command
+
+def parse_arguments(argv: list = None) -> argparse.Namespace:
     """
     Parse command-line arguments for the Lake Trend Analyzer.
+    Arguments without a command, e.g. 'data/chemical_data.csv --variables calcium', are a full run:
+    the options of the plot command, and the forecast is written as well.
+
+    Args:
+        argv (list): Arguments to parse instead of sys.argv, e.g. from the GUI.
 
     Returns:
-        argparse.Namespace: Parsed arguments with input file and variables.
+        argparse.Namespace: Parsed arguments with the command, input file and variables.
     """
 
-    parser = argparse.ArgumentParser(description='Lake Trend Analyzer')
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument('--no-cache', action='store_true', help='Parse the CSV files without reading or writing the dataset cache.')
+    common_parser.add_argument('--rebuild-cache', action='store_true', help='Re-parse the CSV files and overwrite their dataset cache entries.')
+    common_parser.add_argument('--force-render', action='store_true', help='Re-render every graph, even if its inputs are unchanged since the last run.')
+    common_parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes for rendering graphs (0 uses all CPU cores).')
+
+    forecast_parser = argparse.ArgumentParser(add_help=False)
+    forecast_parser.add_argument('--changepoint_method', type=str, choices=['pelt', 'binseg'], default='pelt', help='Change point method used to find the recent lake level trend.')
+    forecast_parser.add_argument('--bootstrap_replicates', type=int, default=10000, help='Bootstrap replicates for the forecast prediction intervals (0 disables them).')
+
+    plot_parser = argparse.ArgumentParser(add_help=False)
+    plot_parser.add_argument('parameter_source', type=str, help='Source CSV file for parameters')
+    plot_parser.add_argument('--variables', type=str, nargs='+', help='Variables to analyze')
+    plot_parser.add_argument('--y_variable_source', type=str, help='Source CSV file for the y variable on correlation graphs.')
+    plot_parser.add_argument('--y_variable', type=str, help='Variable on correlation graphs.')
+    plot_parser.add_argument('--targets', type=str, nargs='+',
+                             help="Several y variables in one run as 'source_csv:y_variable', the parameter source is loaded and its graphs rendered once.")
+    plot_parser.add_argument('--targets_file', type=str, help='Text file with one source_csv:y_variable target per line, added to --targets.')
+    plot_parser.add_argument('--max_lag_days', type=int, default=365, help='Largest lag in days for the lagged correlation analysis (0 disables it).')
+    plot_parser.add_argument('--max_points', type=int, default=4000, help='Most points drawn per timeseries line, longer series are downsampled (0 draws every point).')
+    plot_parser.add_argument('--downsampling', type=str, choices=DOWNSAMPLING_METHODS, default='lttb', help='Downsampling method for long timeseries lines.')
+    plot_parser.add_argument('--density_threshold', type=int, default=5000, help='Draw correlation graphs with more points as 2D histograms (0 always draws scatter plots).')
+    plot_parser.add_argument('--density_bins', type=int, default=100, help='Bins per axis of the 2D histogram correlation graphs.')
+    plot_parser.add_argument('--profile', type=str, choices=RENDER_PROFILES, default=DEFAULT_RENDER_PROFILE,
+                             help='Render profile: draft (fast, low resolution), web (full images and thumbnails) or publication (300 dpi, PDF and SVG).')
+    plot_parser.add_argument('--writer_threads', type=int, default=2, help='Threads encoding and writing graphs while the next one is drawn (0 writes every graph before drawing the next).')
+    plot_parser.add_argument('--max_gap_days', type=str, nargs='+',
+                             help="Only interpolate the parameter source over gaps of at most this many days, as a default for every variable and/or as 'variable=days' overrides (0 fills every gap).")
+    plot_parser.add_argument('--chunk_rows', type=int, default=0, help='Stream the parameter source in chunks of this many rows (0 parses the whole file at once).')
+    plot_parser.add_argument('--daily_means', action='store_true', help='Reduce the parameter source to daily means while streaming it (in chunks of 100000 rows unless --chunk_rows is set).')
+
+    if argv and argv[0] not in COMMANDS and argv[0] not in ('-h', '--help'):
+        # Runs from before the commands existed, also used by the GUI
+        parser = argparse.ArgumentParser(description='Lake Trend Analyzer', parents=[plot_parser, forecast_parser, common_parser])
+        parser.set_defaults(command='plot', forecast=True)
+        return parser.parse_args(argv)
+
+    parser = argparse.ArgumentParser(description='Lake Trend Analyzer',
+                                     epilog='Without a command, e.g. "cli.py data/chemical_data.csv", the graphs and the forecast are written in one run.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command_parser = commands.add_parser('plot', parents=[plot_parser, common_parser],
+                                         help='Write the graphs, lagged correlation reports and website index of a parameter source.')
+    command_parser.set_defaults(forecast=False)
+
+    commands.add_parser('forecast', parents=[forecast_parser, common_parser],
+                        help='Write the lake level forecast from data/lakelevel_data.csv.')
+
+    commands.add_parser('index', help='Write the website index of the graphs in output/.')
+
+    command_parser = commands.add_parser('headers', help='List the variables of a CSV file.')
+    command_parser.add_argument('source', type=str, help='CSV file to read the header of.')
+
+    return parser.parse_args(argv)
+
+def read_csv_headers(filepath: str) -> list:
+    """
+    Read only the header line of a measurement CSV, without pandas so listing the variables stays fast.
+
+    Args:
+        filepath (str): Path to the CSV file, or an open text file.
 
-    parser.add_argument('parameter_source', type=str, help='Source CSV file for parameters')
-    parser.add_argument('--variables', type=str, nargs='+', help='Variables to analyze')
-    parser.add_argument('--y_variable_source', type=str, help='Source CSV file for the y variable on correlation graphs.')
-    parser.add_argument('--y_variable', type=str, help='Variable on correlation graphs.')
+    Returns:
+        list: Column names in lower case, including 'date'.
+    """
 
-    return parser.parse_args()
+    opened = contextlib.nullcontext(filepath) if hasattr(filepath, 'read') else open(filepath, newline='', encoding='utf-8-sig')
+    with opened as file:
+        return [col.lower() for col in next(csv.reader(file, skipinitialspace=True), [])]
 
-def load_x_variable_data(filepath: str) -> pd.DataFrame:
+def read_measurement_csv(filepath: str, variables: list = None) -> pd.DataFrame:
     """
-    Load CSV data from the given file path, cleaning stray commas and empty values.
-    Interpolates missing values for numeric columns.
+    Read a measurement CSV and clean it column by column.
+    Numeric columns are parsed directly by the C engine with ',' as thousands separator,
+    only columns the parser leaves as text are stripped, de-comma'd and coerced with vectorized string ops.
 
     Args:
         filepath (str): Path to the CSV file.
+        variables (list): Lower case variables to read besides 'date', None reads every column.
+                          Other columns are skipped by the parser.
 
     Returns:
-        pd.DataFrame: Loaded data as a pandas DataFrame.
+        pd.DataFrame: Data with lower case column names, numeric columns as numbers and 'date' as text.
+    """
+
+    dataframe = pd.read_csv(filepath, thousands=',', skipinitialspace=True, usecols=get_usecols(variables))
+    return clean_measurement_columns(dataframe)
+
+def get_usecols(variables: list = None):
+    """
+    Get the read_csv usecols filter that keeps 'date' and the lower case variables, None keeps every column.
     """
 
-    dataframe = pd.read_csv(filepath, dtype=str)
+    if variables is None:
+        return None
+    wanted = {'date', *variables}
+    return lambda col: col.lower() in wanted
+
+def clean_measurement_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lower case the column names and coerce the columns the parser left as text, see read_measurement_csv().
+    """
 
-    dataframe = dataframe.map(lambda x: x.strip().replace(',', '') if isinstance(x, str) else x)
-    dataframe = dataframe.replace('', np.nan)
     dataframe.columns = [col.lower() for col in dataframe.columns]  # Standardize column names to lowercase
 
-    # Try to convert columns to numeric where possible (except 'date')
     for col in dataframe.columns:
-        if col.lower() != 'date':
-            dataframe[col] = pd.to_numeric(dataframe[col], errors='coerce')
+        if dataframe[col].dtype != object:
+            continue
+
+        cleaned = dataframe[col].str.strip().str.replace(',', '', regex=False).replace('', np.nan)
+
+        # Try to convert columns to numeric where possible (except 'date')
+        dataframe[col] = cleaned if col == 'date' else pd.to_numeric(cleaned, errors='coerce')
+
+    return dataframe
+
+def load_x_variable_data(filepath: str, variables: list = None, max_gap_days: list = None) -> pd.DataFrame:
+    """
+    Load CSV data from the given file path, cleaning stray commas and empty values.
+    Interpolates missing values for numeric columns.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        variables (list): Variables to load, None loads every column.
+        max_gap_days (list): Longest gaps to interpolate over, see interpolation.parse_max_gap_days(). None fills every gap.
+
+    Returns:
+        pd.DataFrame: Loaded data as a pandas DataFrame.
+    """
 
-    # Convert 'date' to datetime and set as index for interpolation
+    dataframe = read_measurement_csv(filepath, variables)
     dataframe['date'] = pd.to_datetime(dataframe['date'], errors='coerce')
-    dataframe = dataframe.set_index('date')
 
-    # Interpolate numeric columns
-    dataframe = dataframe.interpolate(method='time')
-    dataframe = dataframe.reset_index()
+    # Interpolate numeric columns in time, longer gaps than their max gap stay NaN
+    times = dataframe['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    max_gaps = interpolation.parse_max_gap_days(max_gap_days)
+    columns = [col for col in dataframe.columns if col != 'date' and dataframe[col].dtype.kind == 'f']
+    if columns:
+        dataframe[columns] = interpolation.interpolate_columns(times, dataframe[columns].to_numpy(),
+                                                               [interpolation.get_max_gap(max_gaps, col) for col in columns])
 
     # Filter out years 1970 and 2025
     dataframe = dataframe[~dataframe['date'].dt.year.isin([1970, 2025])]
@@ -69,7 +226,7 @@ def load_x_variable_data(filepath: str) -> pd.DataFrame:
 
 def load_y_variable_data(filepath: str, y_variable: str) -> pd.DataFrame:
     """
-    Load y variable data from the dedicated CSV.
+    Load y variable data from the dedicated CSV, served from the dataset cache when the file is unchanged.
 
     Args:
         filepath (str): Path to the CSV file.
@@ -79,33 +236,125 @@ def load_y_variable_data(filepath: str, y_variable: str) -> pd.DataFrame:
         pd.DataFrame: Loaded data as a pandas DataFrame.
     """
 
-    dataframe = pd.read_csv(filepath, dtype=str)
+    return dataset_cache.cached_load(filepath, parse_y_variable_data, y_variable)
+
+def parse_y_variable_data(filepath: str, y_variable: str) -> pd.DataFrame:
+    """
+    Parse y variable data from the dedicated CSV.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        y_variable (str): y variable decided by the user.
 
-    dataframe = dataframe.map(lambda x: x.strip().replace(',', '') if isinstance(x, str) else x)
-    dataframe = dataframe.replace('', np.nan)
-    dataframe.columns = [col.lower() for col in dataframe.columns]
+    Returns:
+        pd.DataFrame: Loaded data as a pandas DataFrame.
+    """
+
+    dataframe = read_measurement_csv(filepath)
     dataframe = dataframe.dropna(subset=['date', y_variable])
 
     if not np.issubdtype(dataframe['date'].dtype, np.datetime64):
         dataframe['date'] = pd.to_datetime(dataframe['date'], errors='coerce')
 
-    dataframe[y_variable] = pd.to_numeric(dataframe[y_variable], errors='coerce')
     dataframe = dataframe.dropna(subset=['date', y_variable])
 
     return dataframe[['date', y_variable]]
 
-def load_and_process_x_data(filepath: str) -> pd.DataFrame:
+def load_y_targets_data(targets: list) -> dict:
+    """
+    Load the y data of several targets, parsing every source CSV once for all of its y variables.
+
+    Args:
+        targets (list): (y_variable, filepath) tuples.
+
+    Returns:
+        dict: y variable -> its data as returned by load_y_variable_data().
+    """
+
+    y_variables_by_source = {}
+    for y_variable, filepath in targets:
+        # Always use lakelevel from data/lakelevel_data.csv
+        filepath = 'data/lakelevel_data.csv' if y_variable == 'lakelevel' else filepath
+        y_variables_by_source.setdefault(filepath, []).append(y_variable)
+
+    y_data = {}
+    for filepath, y_variables in y_variables_by_source.items():
+        if len(y_variables) == 1:
+            y_data[y_variables[0]] = load_y_variable_data(filepath, y_variables[0])
+            continue
+
+        dataframe = dataset_cache.cached_load(filepath, parse_y_variables_data, *y_variables)
+        for y_variable in y_variables:
+            y_data[y_variable] = dataframe.dropna(subset=['date', y_variable])[['date', y_variable]]
+
+    return y_data
+
+def parse_y_variables_data(filepath: str, *y_variables: str) -> pd.DataFrame:
+    """
+    Parse the date and several y variable columns of a CSV, without dropping rows where only some are missing.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        y_variables (str): y variables decided by the user.
+
+    Returns:
+        pd.DataFrame: Rows with a valid date.
+    """
+
+    dataframe = read_measurement_csv(filepath, list(y_variables))
+    missing = [y_variable for y_variable in y_variables if y_variable not in dataframe.columns]
+    if missing:
+        raise KeyError(missing)
+
+    if not np.issubdtype(dataframe['date'].dtype, np.datetime64):
+        dataframe['date'] = pd.to_datetime(dataframe['date'], errors='coerce')
+
+    return dataframe.dropna(subset=['date'])[['date', *y_variables]]
+
+def load_and_process_x_data(filepath: str,
+                            variables: list = None,
+                            chunk_rows: int = 0,
+                            daily: bool = False,
+                            max_gap_days: list = None) -> pd.DataFrame:
+    """
+    Load and preprocess x variable data from the dedicated CSV before graphing,
+    served from the dataset cache when the file is unchanged.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        variables (list): Variables to load, None loads every column. Part of the cache key.
+        chunk_rows (int): Stream the file in chunks of this many rows, 0 parses it at once. Not part of the cache key.
+        daily (bool): Reduce streamed rows to daily means, see stream_and_process_x_data().
+        max_gap_days (list): Longest gaps to interpolate over, see interpolation.parse_max_gap_days(). Part of the cache key.
+
+    Returns:
+        pd.DataFrame: Loaded and preprocessed x_data as a pandas DataFrame.
     """
-    Load and preprocess x variable data from the dedicated CSV before graphing.
+
+    variables = None if variables is None else sorted(variables)
+    if chunk_rows > 0:
+        # Every chunk size gives the same frame, keep it out of the cache key so it is cached once
+        def stream_x_data(filepath, variables, daily, max_gap_days):
+            return stream_and_process_x_data(filepath, variables, chunk_rows, daily, max_gap_days)
+        return dataset_cache.cached_load(filepath, stream_x_data, variables, daily, max_gap_days)
+    if variables is None and max_gap_days is None:
+        return dataset_cache.cached_load(filepath, parse_and_process_x_data)
+    return dataset_cache.cached_load(filepath, parse_and_process_x_data, variables, max_gap_days)
+
+def parse_and_process_x_data(filepath: str, variables: list = None, max_gap_days: list = None) -> pd.DataFrame:
+    """
+    Parse and preprocess x variable data from the dedicated CSV.
 
     Args:
         filepath (str): Path to the CSV file.
+        variables (list): Variables to load, None loads every column.
+        max_gap_days (list): Longest gaps to interpolate over, see interpolation.parse_max_gap_days().
 
     Returns:
         pd.DataFrame: Loaded and preprocessed x_data as a pandas DataFrame.
     """
 
-    x_data = load_x_variable_data(filepath)
+    x_data = load_x_variable_data(filepath, variables, max_gap_days)
     x_data.columns = [col.lower() for col in x_data.columns]  # Standardize column names to lowercase
 
     # Remove rows with NaN in 'date'
@@ -119,233 +368,872 @@ def load_and_process_x_data(filepath: str) -> pd.DataFrame:
 
     return x_data
 
-def get_variables_from_data(arguments: argparse.Namespace, data: pd.DataFrame) -> list:
+def stream_and_process_x_data(filepath: str,
+                              variables: list = None,
+                              chunk_rows: int = 100_000,
+                              daily: bool = False,
+                              max_gap_days: list = None,
+                              dtype='float64') -> pd.DataFrame:
+    """
+    Parse and preprocess x variable data like parse_and_process_x_data(), reading the CSV in chunks.
+    Every chunk is cleaned and converted to numbers right away and interpolated in time with the state carried over from
+    the previous chunks, so peak memory is one chunk plus the numeric result instead of the whole parsed file.
+    The rows have to be in date order, rows without a date are skipped.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        variables (list): Variables to load, None loads every column.
+        chunk_rows (int): Rows parsed per chunk.
+        daily (bool): Only keep the daily means of the interpolated rows, e.g. for hourly sensor exports.
+        max_gap_days (list): Longest gaps to interpolate over, see interpolation.parse_max_gap_days().
+        dtype: Storage type of the kept rows.
+
+    Returns:
+        pd.DataFrame: 'date' and one numeric column per variable, one row per reading or per day.
+    """
+
+    # Rows are at most the lines of the file, so the result is allocated once instead of grown chunk by chunk
+    with open(filepath, 'rb') as file:
+        lines = sum(block.count(b'\n') for block in iter(lambda: file.read(1 << 20), b''))
+
+    interpolator = None
+    columns = []
+    for chunk in pd.read_csv(filepath, thousands=',', skipinitialspace=True, usecols=get_usecols(variables), chunksize=chunk_rows):
+        chunk = clean_measurement_columns(chunk)
+        dates = pd.to_datetime(chunk['date'], errors='coerce')
+        has_date = dates.notna().to_numpy()
+
+        if interpolator is None:
+            columns = [col for col in chunk.columns if col != 'date']
+            max_gaps = interpolation.parse_max_gap_days(max_gap_days)
+            interpolator = streaming.StreamingInterpolator(len(columns), daily=daily, dtype=dtype, expected_rows=lines,
+                                                           max_gaps=[interpolation.get_max_gap(max_gaps, col) for col in columns])
+        interpolator.add_chunk(dates.to_numpy(dtype='datetime64[ns]')[has_date].view(np.int64),
+                               chunk[columns].to_numpy(dtype=np.float64)[has_date])
+
+    if interpolator is None:
+        return pd.DataFrame(columns=[col for col in read_csv_headers(filepath) if variables is None or col == 'date' or col in variables])
+
+    times, values = interpolator.finish()
+    dates = pd.DatetimeIndex(times.astype('datetime64[ns]'))
+
+    # Filter out years 1970 and 2025, after interpolating like load_x_variable_data()
+    keep = ~dates.year.isin([1970, 2025])
+    if not keep.all():
+        values, dates = values[keep], dates[keep]
+    x_data = pd.DataFrame(values, columns=columns)
+    x_data.insert(0, 'date', dates)
+
+    return x_data
+
+def get_variables_from_data(arguments: argparse.Namespace, columns: list) -> list:
     """
     Get all variables from the dataset which have been specified through arguments.
 
     Args:
         arguments (argparse.Namespace): Command line arguments where the input variables are stored.
-        data (pd.DataFrame): Data from which to grab the variables from if none where specified.
+        columns (list): Variables from which to grab the variables from if none where specified.
 
     Returns:
         list: List of variable names in lower case.
     """
     if arguments.variables is None:
-        variables = [col for col in data.columns if col != 'date']
+        variables = [col for col in columns if col != 'date']
         return variables
 
     variables = arguments.variables
     
     for variable in variables:
-        if variable not in data.columns:
-            close_matches = difflib.get_close_matches(variable, data.columns, n=1)
+        if variable not in columns:
+            import difflib
+            close_matches = difflib.get_close_matches(variable, columns, n=1)
             suggestion = f" Did you mean '{close_matches[0]}'?" if close_matches else ""
             raise ValueError(f"No variable '{variable}' found in data.{suggestion}")
     
     return variables
 
-def generate_timeseries_graph(data: pd.DataFrame, 
+def parse_target(spec: str) -> tuple:
+    """
+    Parse a 'source_csv:y_variable' target, split at the last colon so Windows drive letters survive.
+
+    Returns:
+        tuple: (y_variable in lower case, source CSV path).
+    """
+
+    filepath, separator, y_variable = spec.rpartition(':')
+    if not separator or not filepath.strip() or not y_variable.strip():
+        raise ValueError(f"Invalid target '{spec}', expected source_csv:y_variable.")
+    return y_variable.strip().lower(), filepath.strip()
+
+def get_targets(arguments: argparse.Namespace) -> list:
+    """
+    Get the (y_variable, source CSV) targets of the run, from --targets and --targets_file
+    or the single --y_variable and --y_variable_source.
+
+    Args:
+        arguments (argparse.Namespace): Command line arguments.
+
+    Returns:
+        list: (y_variable, filepath) tuples in the given order.
+    """
+
+    specs = list(arguments.targets or [])
+    if arguments.targets_file is not None:
+        with open(arguments.targets_file, encoding='utf-8') as file:
+            specs += [line.strip() for line in file if line.strip() and not line.lstrip().startswith('#')]
+
+    if not specs:
+        return [(arguments.y_variable or 'lakelevel', arguments.y_variable_source or 'data/lakelevel_data.csv')]
+
+    if arguments.y_variable is not None or arguments.y_variable_source is not None:
+        raise ValueError("--y_variable and --y_variable_source cannot be combined with --targets or --targets_file.")
+
+    targets = [parse_target(spec) for spec in specs]
+    y_variables = [y_variable for y_variable, _ in targets]
+    duplicates = sorted({y_variable for y_variable in y_variables if y_variables.count(y_variable) > 1})
+    if duplicates:
+        raise ValueError(f"Targets share the y variable(s) {', '.join(duplicates)}, their graphs would overwrite each other.")
+    return targets
+
+def get_target_source(index: int) -> str:
+    """
+    Dataset source name of the index-th y variable: 'y', 'y2', 'y3', ...
+    """
+
+    return 'y' if index == 0 else f'y{index + 1}'
+
+def get_style_entries(*variables: str) -> list:
+    """
+    Get the render profile and the label and color of every variable, the style entries a graph of these variables depends on.
+    """
+
+    renderer = generate_plots.get_plot_renderer()
+    return [renderer.profile_name] + [[variable, renderer.get_label(variable), renderer.get_color(variable)] for variable in variables]
+
+def get_graph_outputs(file_path: str) -> list:
+    """
+    Get every file the render profile writes for a graph, so the build manifest tracks thumbnails and vector copies too.
+    """
+
+    return generate_plots.get_plot_renderer().get_output_paths(file_path)
+
+def generate_timeseries_graph(pyramid: dict, 
                               variable: str, 
                               folderpath: str, 
                               use_months: bool = False, 
-                              use_years: bool = False) -> None:
+                              use_years: bool = False,
+                              max_points: int = 0,
+                              downsampling_method: str = 'lttb') -> None:
     """
     Generate timeseries graph for given variable.
 
     Args:
-        data (pd.DataFrame): Dataframe for the variable.
+        pyramid (dict): Aggregate pyramid of the data holding the variable, see aggregates.build_aggregate_pyramid().
         variable (str): Name of the variable header in lower case.
         folderpath (str): Path to the folder where the correlation graphs will be saved to.
         use_months (bool): Flag if the graph should use monthly averages.
         use_years (bool): Flag if the graph should use yearly averages.
+        max_points (int): Most points drawn for the line, 0 draws every point.
+        downsampling_method (str): 'lttb' or 'minmax', see downsampling.downsample().
+    """
+
+    plot_data = get_timeseries_data(pyramid, variable, use_months=use_months, use_years=use_years)
+
+    if plot_data.empty:
+        print(f"Skipping timeseries plot for '{variable}' due to insufficient data.")
+        return
+
+    if not build_manifest.needs_render(get_graph_outputs(folderpath + f'{variable}_timeseries.png'), plot_data, get_style_entries(variable),
+                                     {'use_years': use_years, 'max_points': max_points, 'downsampling': downsampling_method}):
+        return
+
+    generate_plots.plot_timeseries(plot_data, variable, folderpath, use_years=use_years,
+                                   max_points=max_points, downsampling_method=downsampling_method)
+
+def get_timeseries_data(pyramid: dict, variable: str, use_months: bool = False, use_years: bool = False) -> pd.DataFrame:
+    """
+    Get the data of a timeseries graph at the resolution of its time scale, see generate_timeseries_graph().
+
+    Returns:
+        pd.DataFrame: 'date' and the variable, empty if there is nothing to plot.
     """
 
     if variable == 'lakelevel':
-        plot_data = data.copy()
+        plot_data = aggregates.get_aggregate(pyramid, 'daily', variable)
         plot_data = plot_data.dropna(subset=['date', 'lakelevel'])
     elif use_years:
-        plot_data = data.set_index('date').resample('YE')[variable].mean().reset_index()    
+        plot_data = aggregates.get_aggregate(pyramid, 'yearly', variable)
     elif use_months:
-        plot_data = data.set_index('date').resample('ME')[variable].mean().reset_index()
+        plot_data = aggregates.get_aggregate(pyramid, 'monthly', variable)
     else:  # use_days
-        plot_data = data[['date', variable]].copy()
+        plot_data = aggregates.get_aggregate(pyramid, 'daily', variable)
     
     # Interpolate after resampling
     plot_data[variable] = plot_data[variable].interpolate(method='linear')
     plot_data = plot_data.dropna(subset=[variable])
     
     # Always drop rows with missing date (shouldn't happen, but for safety)
-    plot_data = plot_data.dropna(subset=['date'])
-
-    if plot_data.empty:
-        print(f"Skipping timeseries plot for '{variable}' due to insufficient data.")
-        return
-
-    generate_plots.plot_timeseries(plot_data, variable, folderpath, use_years=use_years)
+    return plot_data.dropna(subset=['date'])
 
-def generate_correlation_graph(x_data: pd.DataFrame, 
-                               y_data: pd.DataFrame, 
+def generate_correlation_graph(x_pyramid: dict, 
+                               y_pyramid: dict, 
                                x_variable: str, 
                                y_variable: str, 
                                folderpath: str, 
-                               use_monthly_averages: bool = False) -> None:
+                               use_monthly_averages: bool = False,
+                               density_threshold: int = 0,
+                               density_bins: int = 100) -> None:
     """
     Generate correlation graph for an x variable and a y variable.
 
     Args:
-        x_data (pd.DataFrame): Dataframe for the x variable.
-        y_data (pd.DataFrame): Dataframe for the y variable.
+        x_pyramid (dict): Aggregate pyramid of the x data.
+        y_pyramid (dict): Aggregate pyramid of the y data.
         x_variable (str): Name of the x variable header in lower case.
         y_variable (str): Name of the y variable header in lower case.
         folderpath (str): Path to the folder where the correlation graphs will be saved to.
         use_monthly_averages (bool): Flag if the graph should use monthly averages.
+        density_threshold (int): Draw a 2D histogram instead of a scatter plot above this many points, 0 never does.
+        density_bins (int): Bins per axis of the 2D histogram.
     """
 
-    correlation_data = None
-
-    if use_monthly_averages:
-        x_monthly_data = x_data.set_index('date').resample('ME')[x_variable].mean().reset_index()
-        y_monthly_data = y_data.set_index('date').resample('ME')[y_variable].mean().reset_index()
-        
-        correlation_data = pd.merge(x_monthly_data, y_monthly_data, on='date', how='left')
-        correlation_data = correlation_data.dropna(subset=[x_variable, y_variable])
-    else:
-        correlation_data = pd.merge(x_data[['date', x_variable]], y_data, on='date', how='left')
-        correlation_data = correlation_data.dropna(subset=[x_variable, y_variable])
+    correlation_data = get_correlation_data(x_pyramid, y_pyramid, x_variable, y_variable, use_monthly_averages)
 
     # Add warning if correlation_data is empty
     if correlation_data.empty:
         print(f"Skipping correlation plot for '{x_variable}' due to insufficient data after merging.")
         return
 
-    generate_plots.plot_correlation(correlation_data, x_variable, y_variable, folderpath)
+    # The renderer leaves out zero x values, check before fingerprinting a graph that would not be written
+    if not (correlation_data[x_variable] != 0).any():
+        print(f"Skipping correlation plot for '{x_variable}' due to insufficient data after filtering.")
+        return
+
+    # Only the mode actually drawn is part of the fingerprint, so changing the threshold keeps unaffected graphs
+    density_settings = {'bins': density_bins} if density_threshold and len(correlation_data) > density_threshold else {}
+    if not build_manifest.needs_render(get_graph_outputs(folderpath + f'{x_variable}_correlation.png'), correlation_data, get_style_entries(x_variable, y_variable), density_settings):
+        return
+
+    generate_plots.plot_correlation(correlation_data, x_variable, y_variable, folderpath,
+                                    density_threshold=density_threshold, density_bins=density_bins)
+
+def get_correlation_data(x_pyramid: dict, y_pyramid: dict, x_variable: str, y_variable: str, use_monthly_averages: bool = False) -> pd.DataFrame:
+    """
+    Get the data of a correlation graph: the y values at the dates of the x values, see generate_correlation_graph().
+
+    Returns:
+        pd.DataFrame: 'date', the x and the y variable, only rows where both are present.
+    """
+
+    level = 'monthly' if use_monthly_averages else 'daily'
+    x_level_data = aggregates.get_aggregate(x_pyramid, level, x_variable)
+    y_level_data = aggregates.get_aggregate(y_pyramid, level, y_variable)
+
+    # Both levels are indexed by unique dates, so looking the y values up at the x dates is the left merge of the two
+    y_values = y_level_data.set_index('date')[y_variable].reindex(x_level_data['date']).to_numpy()
+    correlation_data = x_level_data.assign(**{y_variable: y_values})
+    return correlation_data.dropna(subset=[x_variable, y_variable])
+
+def generate_cross_correlation_graph(x_pyramid: dict,
+                                     y_pyramid: dict,
+                                     x_variable: str,
+                                     y_variable: str,
+                                     folderpath: str,
+                                     max_lag_days: int) -> None:
+    """
+    Generate a cross-correlogram of an x variable against the y variable at every lag up to max_lag_days.
+
+    Args:
+        x_pyramid (dict): Aggregate pyramid of the x data.
+        y_pyramid (dict): Aggregate pyramid of the y data.
+        x_variable (str): Name of the x variable header in lower case.
+        y_variable (str): Name of the y variable header in lower case.
+        folderpath (str): Path to the folder where the cross-correlation graphs will be saved to.
+        max_lag_days (int): Largest lag in days in either direction.
+    """
+
+    x_daily_data = aggregates.get_aggregate(x_pyramid, 'daily', x_variable)
+    y_daily_data = aggregates.get_aggregate(y_pyramid, 'daily', y_variable)
+
+    outputs = get_graph_outputs(folderpath + f'{x_variable}_cross_correlation.png')
+    if not build_manifest.needs_render(outputs, x_daily_data, y_daily_data, get_style_entries(x_variable, y_variable), {'max_lag_days': max_lag_days}):
+        return
+
+    start = min(x_daily_data['date'].min(), y_daily_data['date'].min())
+    end = max(x_daily_data['date'].max(), y_daily_data['date'].max())
+    x = correlation.regularize_daily(x_daily_data, [x_variable], start, end)[:, 0]
+    y = correlation.regularize_daily(y_daily_data, [y_variable], start, end)[:, 0]
+
+    lags, correlations, _ = correlation.lagged_cross_correlation(x, y, max_lag_days)
+
+    if np.all(np.isnan(correlations)):
+        print(f"Skipping cross-correlation plot for '{x_variable}' due to insufficient overlapping data.")
+        # Only known after the correlogram was computed, remember it so runs with the same data skip it right away
+        build_manifest.record_skip(outputs)
+        return
+
+    generate_plots.plot_cross_correlation(lags, correlations, x_variable, y_variable, folderpath)
+
+def write_lagged_correlation_report(dataset: lake_dataset.LakeDataset,
+                                    variables: list,
+                                    y_variable: str,
+                                    max_lag_days: int,
+                                    file_path: str,
+                                    y_source: str = 'y') -> None:
+    """
+    Write the best lag of every x variable against the y variable to a text file.
+
+    Args:
+        dataset (lake_dataset.LakeDataset): Dataset with the x variables under source 'x' and the y variable under source y_source.
+        variables (list): List of x variable header names in lower case.
+        y_variable (str): Name of the y variable header in lower case.
+        max_lag_days (int): Largest lag in days in either direction.
+        file_path (str): Path of the report.
+        y_source (str): Dataset source of the y variable.
+    """
+
+    drivers = [variable for variable in variables if variable != y_variable]
+    best_lags = correlation.find_dataset_best_lags(dataset, drivers, y_variable, max_lag_days, y_source=y_source)
+
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(f"Lagged correlation with {y_variable} (lags up to {max_lag_days} days, positive lags mean the variable leads):\n\n")
+        file.write(best_lags.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        file.write("\n")
 
-def generate_seasonal_graph(data: pd.DataFrame, variable: str, folderpath: str) -> None:
+def generate_seasonal_graph(pyramid: dict, variable: str, folderpath: str) -> None:
     """
     Generate seasonal graphs for a variable.
 
     Args:
-        data: Dataframe to the CSV from which the variable is from.
+        pyramid: Aggregate pyramid of the CSV from which the variable is from.
         variable: Name of the variable header in lower case.
         folderpath: Path to the folder where the graph will be saved to.
     """
 
-    if data.empty:
+    seasonal_data = get_seasonal_data(pyramid, variable)
+    if seasonal_data is None:
         print(f"Skipping seasonal correlation plot for {variable} due to insufficient data.")
         return
 
-    if variable == 'lakelevel':
-        seasonal_data = load_y_variable_data('data/lakelevel_data.csv', 'lakelevel')
-    else:
-        seasonal_data = data
+    if not build_manifest.needs_render(get_graph_outputs(folderpath + f'{variable}_seasonal_correlation.png'), seasonal_data, get_style_entries(variable)):
+        return
 
     generate_plots.plot_seasonal_correlation(seasonal_data, variable, folderpath)
 
-def generate_graphs(x_data: pd.DataFrame, 
-                    y_data: pd.DataFrame, 
+def get_seasonal_data(pyramid: dict, variable: str) -> pd.DataFrame:
+    """
+    Get the monthly means of a seasonal graph, see generate_seasonal_graph().
+
+    Returns:
+        pd.DataFrame: 'month' and the variable, None if the pyramid holds no data.
+    """
+
+    if pyramid['daily'].empty:
+        return None
+
+    # Lake level always comes from data/lakelevel_data.csv, even when it is not the y variable
+    if variable == 'lakelevel' and variable not in pyramid['month_of_year']['mean'].columns:
+        pyramid = aggregates.build_aggregate_pyramid(load_y_variable_data('data/lakelevel_data.csv', 'lakelevel'))
+
+    return aggregates.get_aggregate(pyramid, 'month_of_year', variable)
+
+# Per-worker aggregate pyramids, filled once by init_graph_worker() instead of being pickled with every task
+GRAPH_WORKER_STATE = {}
+
+def build_graph_tasks(variables: list, y_variable: str, cross_correlation: bool = False, additional_y_variables: list = None) -> list:
+    """
+    List every graph to render as (kind, variable, source) tuples, in serial rendering order.
+    For timeseries and seasonal graphs source 'x' means the graph is drawn from the x data and 'y' from the y data.
+    Correlation graphs are drawn from the x data against the y variable of their source.
+    Additional y variables are sources 'y2', 'y3', ..., the x graphs shared by all of them are listed once
+    and the y variables are not correlated with each other, like in separate runs.
+
+    Args:
+        variables (list): List of x variable header names in lower case.
+        y_variable (str): Name of the y variable header in lower case.
+        cross_correlation (bool): Also list a lagged cross-correlation graph for every x variable.
+        additional_y_variables (list): Names of further y variables in lower case, each with its own correlation graphs.
+
+    Returns:
+        list: Graph tasks.
+    """
+
+    y_sources = {y: get_target_source(i) for i, y in enumerate([y_variable, *(additional_y_variables or [])])}
+    tasks = []
+
+    # Time series and seasonal plots for all x variables (using full x_data)
+    for variable in variables:
+        source = y_sources.get('lakelevel', 'y') if variable == 'lakelevel' else 'x'
+        tasks.append(('timeseries', variable, source))
+        tasks.append(('seasonal', variable, source))
+
+    # Time series and seasonal plots for the y variables (using full y_data), only if not already done above
+    for y, source in y_sources.items():
+        if y not in variables:
+            tasks.append(('timeseries', y, source))
+            tasks.append(('seasonal', y, source))
+
+    # Correlation plots (using merged data)
+    drivers = [variable for variable in variables if variable not in y_sources]
+    for source in y_sources.values():
+        tasks.extend(('correlation', variable, source) for variable in drivers)
+
+    # Lagged cross-correlation plots (using the daily series)
+    if cross_correlation:
+        for source in y_sources.values():
+            tasks.extend(('cross_correlation', variable, source) for variable in drivers)
+
+    return tasks
+
+def run_graph_task(task: tuple, pyramids: dict, settings: dict) -> None:
+    """
+    Render a single graph task from build_graph_tasks().
+
+    Args:
+        task (tuple): (kind, variable, source) of the graph.
+        pyramids (dict): Aggregate pyramids of the x data under 'x' and of the y data under 'y', 'y2', ...
+        settings (dict): Output folders, time scale flags and per y source settings under 'targets', shared by all tasks.
+    """
+
+    kind, variable, source = task
+    pyramid = pyramids[source]
+    target = settings['targets'].get(source)
+
+    if kind == 'timeseries':
+        generate_timeseries_graph(pyramid, variable, settings['timeseries_folder_path'],
+                                  use_months=settings['use_months'], use_years=settings['use_years'],
+                                  max_points=settings['max_points'], downsampling_method=settings['downsampling_method'])
+    elif kind == 'seasonal':
+        generate_seasonal_graph(pyramid, variable, settings['seasonal_folder_path'])
+    elif kind == 'correlation':
+        use_monthly_averages = settings['use_months'] or settings['use_years']
+        generate_correlation_graph(pyramids['x'], pyramid, variable, target['y_variable'],
+                                   target['correlation_folder_path'], use_monthly_averages=use_monthly_averages,
+                                   density_threshold=settings['density_threshold'], density_bins=settings['density_bins'])
+    elif kind == 'cross_correlation':
+        generate_cross_correlation_graph(pyramids['x'], pyramid, variable, target['y_variable'],
+                                         target['cross_correlation_folder_path'], settings['max_lag_days'])
+    else:
+        raise ValueError(f"Unknown graph kind '{kind}'")
+
+def try_graph_task(task: tuple, pyramids: dict, settings: dict) -> str:
+    """
+    Render a graph task and return the error message instead of raising, so one bad variable does not stop the run.
+
+    Returns:
+        str: Error message, or None if the graph was rendered.
+    """
+
+    recorded_before = set(build_manifest.RECORDED_ENTRIES)
+    try:
+        run_graph_task(task, pyramids, settings)
+    except Exception as e:
+        build_manifest.discard_entries(set(build_manifest.RECORDED_ENTRIES) - recorded_before)
+        return f"{type(e).__name__}: {e}"
+    return None
+
+def collect_write_failures(task_outputs: dict) -> list:
+    """
+    Wait for the image writer and map the graphs it could not write back to their tasks.
+    The manifest entries of those tasks are discarded, so the next run renders them again.
+
+    Args:
+        task_outputs (dict): Normalized output path -> task that rendered it.
+
+    Returns:
+        list: (task, error message) for every task with a failed write.
+    """
+    failed_tasks = {}
+    for file_path, error in generate_plots.flush_images().items():
+        task = task_outputs.get(os.path.normpath(file_path))
+        if task is not None and task not in failed_tasks:
+            failed_tasks[task] = error
+    for task in failed_tasks:
+        build_manifest.discard_entries([path for path, output_task in task_outputs.items() if output_task == task])
+    return list(failed_tasks.items())
+
+def init_graph_worker(pyramids: dict, settings: dict, manifest_entries: dict, manifest_enabled: bool) -> None:
+    GRAPH_WORKER_STATE.update(pyramids=pyramids, settings=settings)
+    generate_plots.configure_render_profile(settings['render_profile'])
+    generate_plots.configure_image_writer(settings['writer_threads'])
+
+    build_manifest.configure_manifest(enabled=manifest_enabled)
+    build_manifest.PREVIOUS_ENTRIES.clear()
+    build_manifest.PREVIOUS_ENTRIES.update(manifest_entries)
+    build_manifest.pop_recorded_entries()
+
+def run_graph_task_in_worker(task: tuple) -> tuple:
+    recorded_before = set(build_manifest.RECORDED_ENTRIES)
+    error = try_graph_task(task, GRAPH_WORKER_STATE['pyramids'], GRAPH_WORKER_STATE['settings'])
+
+    # Workers wait for their writes per task, the other workers keep the CPUs busy meanwhile
+    task_outputs = {path: task for path in set(build_manifest.RECORDED_ENTRIES) - recorded_before}
+    for _, write_error in collect_write_failures(task_outputs):
+        error = error or write_error
+    return task, error, build_manifest.pop_recorded_entries()
+
+def get_worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Prefer fork so workers inherit the aggregate pyramids copy-on-write instead of unpickling them.
+    """
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def get_time_scale(dataset: lake_dataset.LakeDataset) -> dict:
+    """
+    Determine the time scale of the graphs based on the date range of the x data.
+
+    Returns:
+        dict: 'use_years' for more than 10 years, 'use_months' for 2 to 10 years, daily otherwise.
+    """
+
+    x_dates = pd.DatetimeIndex(dataset.dates[dataset.source_rows['x']])
+    date_range_years = (x_dates.max() - x_dates.min()).days / 365.25
+    return {'use_years': date_range_years > 10, 'use_months': 2 < date_range_years <= 10}
+
+def build_graph_pyramids(dataset: lake_dataset.LakeDataset, y_variables: list) -> dict:
+    """
+    Aggregate every variable once, all graphs read their resolution from these pyramids.
+    The x graphs see the y variables at the x dates, their own x readings if the x source has them too.
+
+    Args:
+        dataset (lake_dataset.LakeDataset): Dataset with the x variables under source 'x' and the y variables under 'y', 'y2', ...
+        y_variables (list): Names of the y variables in lower case, in source order.
+
+    Returns:
+        dict: Aggregate pyramid per dataset source.
+    """
+
+    x_variables = list(dict.fromkeys(dataset.get_variables('x') + y_variables))
+    pyramids = {'x': aggregates.build_dataset_pyramid(dataset, 'x', x_variables)}
+    for i in range(len(y_variables)):
+        pyramids[get_target_source(i)] = aggregates.build_dataset_pyramid(dataset, get_target_source(i))
+    return pyramids
+
+def render_graph_figure(task: tuple, pyramids: dict, settings: dict, renderer: generate_plots.PlotRenderer):
+    """
+    Draw a timeseries, seasonal or correlation task from build_graph_tasks() into a figure instead of writing it,
+    e.g. to show a single graph in the GUI. Nothing is recorded in the build manifest.
+
+    Args:
+        task (tuple): (kind, variable, source) of the graph.
+        pyramids (dict): Aggregate pyramids from build_graph_pyramids().
+        settings (dict): Time scale flags, drawing parameters and the y variable of every source under 'targets', see generate_graphs().
+        renderer (generate_plots.PlotRenderer): Renderer without template reuse, so every figure can be kept.
+
+    Returns:
+        Figure: The drawn graph, or None if there is not enough data for it.
+    """
+
+    kind, variable, source = task
+    pyramid = pyramids[source]
+
+    if kind == 'timeseries':
+        plot_data = get_timeseries_data(pyramid, variable, use_months=settings['use_months'], use_years=settings['use_years'])
+        if plot_data.empty:
+            return None
+        return renderer.render_timeseries(plot_data, variable, None, use_years=settings['use_years'],
+                                          max_points=settings['max_points'], downsampling_method=settings['downsampling_method'])
+    elif kind == 'seasonal':
+        seasonal_data = get_seasonal_data(pyramid, variable)
+        return None if seasonal_data is None else renderer.render_seasonal(seasonal_data, variable, None)
+    elif kind == 'correlation':
+        y_variable = settings['targets'][source]['y_variable']
+        correlation_data = get_correlation_data(pyramids['x'], pyramid, variable, y_variable,
+                                                use_monthly_averages=settings['use_months'] or settings['use_years'])
+        if correlation_data.empty:
+            return None
+        return renderer.render_correlation(correlation_data, variable, y_variable, None,
+                                           density_threshold=settings['density_threshold'], bins=settings['density_bins'])
+    raise ValueError(f"Graph kind '{kind}' cannot be rendered on demand")
+
+def generate_graphs(dataset: lake_dataset.LakeDataset, 
                     variables: list, 
                     y_variable: str, 
                     timeseries_folder_path: str, 
                     correlation_folder_path: str, 
-                    seasonal_folder_path: str) -> None:
+                    seasonal_folder_path: str,
+                    jobs: int = 1,
+                    cross_correlation_folder_path: str = None,
+                    max_lag_days: int = 0,
+                    max_points: int = 0,
+                    downsampling_method: str = 'lttb',
+                    density_threshold: int = 0,
+                    density_bins: int = 100,
+                    additional_targets: list = None,
+                    progress=None) -> list:
     """
-    Generate all graphs for every independent x variable and an affected y variable.
+    Generate all graphs for every independent x variable and one or more affected y variables.
+    Graphs of the x variables are rendered once, correlation graphs once per y variable.
 
     Args:
-        x_data (pd.DataFrame): Dataframe for the x variable.
-        y_data (pd.DataFrame): Dataframe for the y variable.
+        dataset (lake_dataset.LakeDataset): Dataset with the x variables under source 'x' and the y variable under source 'y',
+                                            additional y variables under 'y2', 'y3', ...
         variables (list): List of x variable header names in lower case.
         y_variable (str): Name of the y variable header in lower case.
         timeseries_folder_path (str): Path to the timeseries graphs output folder
         correlation_folder_path (str): Path to the correlation graphs output folder
         seasonal_folder_path (str): Path to the seasonal graphs output folder
+        jobs (int): Number of worker processes, 1 renders in this process.
+        cross_correlation_folder_path (str): Path to the cross-correlation graphs output folder, None skips them.
+        max_lag_days (int): Largest lag in days on the cross-correlation graphs.
+        max_points (int): Most points drawn per timeseries line, 0 draws every point.
+        downsampling_method (str): 'lttb' or 'minmax', see downsampling.downsample().
+        density_threshold (int): Correlation graphs with more points are drawn as 2D histograms, 0 never does.
+        density_bins (int): Bins per axis of the 2D histogram correlation graphs.
+        additional_targets (list): (y_variable, correlation_folder_path, cross_correlation_folder_path) of further y variables.
+        progress (callable): Called as progress(done, total, task, error) after every graph task, error is None on success.
+
+    Returns:
+        list: (kind, variable, error message) for every graph that failed.
+              Graphs whose inputs are unchanged according to the build manifest are not rendered again.
     """
 
-    # Determine time scale based on date range
-    date_min = x_data['date'].min()
-    date_max = x_data['date'].max()
-    date_range_years = (date_max - date_min).days / 365.25
+    targets = [(y_variable, correlation_folder_path, cross_correlation_folder_path), *(additional_targets or [])]
+    y_variables = [target[0] for target in targets]
+
+    settings = {
+        'targets': {
+            get_target_source(i): {'y_variable': y, 'correlation_folder_path': correlation_path, 'cross_correlation_folder_path': cross_correlation_path}
+            for i, (y, correlation_path, cross_correlation_path) in enumerate(targets)
+        },
+        'timeseries_folder_path': timeseries_folder_path,
+        'seasonal_folder_path': seasonal_folder_path,
+        'max_lag_days': max_lag_days,
+        'max_points': max_points,
+        'downsampling_method': downsampling_method,
+        'density_threshold': density_threshold,
+        'density_bins': density_bins,
+        'render_profile': generate_plots.RENDER_PROFILE,
+        'writer_threads': 0 if generate_plots.IMAGE_WRITER is None else generate_plots.IMAGE_WRITER.threads,
+        **get_time_scale(dataset),
+    }
+
+    pyramids = build_graph_pyramids(dataset, y_variables)
+
+    tasks = build_graph_tasks(variables, y_variable, cross_correlation=cross_correlation_folder_path is not None and max_lag_days > 0,
+                              additional_y_variables=y_variables[1:])
+    failures = []
+
+    if jobs <= 1:
+        # Graphs are encoded in the background while the next one is drawn, so their writes are checked at the end
+        task_outputs = {}
+        try:
+            for done, task in enumerate(tasks, start=1):
+                recorded_before = set(build_manifest.RECORDED_ENTRIES)
+                error = try_graph_task(task, pyramids, settings)
+                if error is not None:
+                    failures.append((task[0], task[1], error))
+                    print(f"Failed to generate {task[0]} graph for '{task[1]}': {error}")
+                else:
+                    task_outputs.update((path, task) for path in set(build_manifest.RECORDED_ENTRIES) - recorded_before)
+                if progress is not None:
+                    progress(done, len(tasks), task, error)
+        finally:
+            write_failures = collect_write_failures(task_outputs)
+
+        for task, error in write_failures:
+            failures.append((task[0], task[1], error))
+            print(f"Failed to write {task[0]} graph for '{task[1]}': {error}")
+        return failures
+
+    initargs = (pyramids, settings, build_manifest.PREVIOUS_ENTRIES, build_manifest.MANIFEST_ENABLED)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=get_worker_context(),
+                             initializer=init_graph_worker, initargs=initargs) as executor:
+        for done, (task, error, manifest_entries) in enumerate(executor.map(run_graph_task_in_worker, tasks), start=1):
+            build_manifest.RECORDED_ENTRIES.update(manifest_entries)
+            if error is not None:
+                failures.append((task[0], task[1], error))
+                print(f"Failed to generate {task[0]} graph for '{task[1]}': {error}")
+            if progress is not None:
+                progress(done, len(tasks), task, error)
+
+    return failures
+
+def load_analysis_data(arguments: argparse.Namespace, targets: list) -> tuple:
+    """
+    Load the parameter source and the y data of every target, see get_targets().
 
-    use_years = date_range_years > 10
-    use_months = 2 < date_range_years <= 10
+    Args:
+        arguments (argparse.Namespace): Arguments from parse_arguments().
+        targets (list): (y_variable, filepath) tuples.
 
-    # Generate time series and seasonal plots for all x variables (using full x_data)
-    for variable in variables:
-        if variable == 'lakelevel':
-            plot_data = y_data.copy()
-        else:
-            plot_data = x_data
-
-        # Time series for x variable (using full x_data)
-        generate_timeseries_graph(plot_data, variable, timeseries_folder_path, use_months=use_months, use_years=use_years)
-        # Seasonal for x variable (using full x_data)
-        generate_seasonal_graph(plot_data, variable, seasonal_folder_path)
-
-    # Generate time series and seasonal plots for y variable (using full y_data)
-    if y_variable not in variables:
-        # Only generate if not already done above
-        generate_timeseries_graph(y_data, y_variable, timeseries_folder_path, use_months=use_months, use_years=use_years)
-        generate_seasonal_graph(y_data, y_variable, seasonal_folder_path)
-
-    # Generate correlation plots (using merged data)
-    for variable in variables:
-        if variable != y_variable:
-            use_monthly_averages = (use_years or use_months) == True
-            generate_correlation_graph(x_data, y_data, variable, y_variable, correlation_folder_path, use_monthly_averages=use_monthly_averages)
+    Returns:
+        tuple: (variables, x_data, y data per y variable, LakeDataset with 'x' and the targets under 'y', 'y2', ...).
+    """
 
-def main() -> None:
+    x_data_filepath = arguments.parameter_source
+    y_variables = [y_variable for y_variable, _ in targets]
+
+    # Check the requested variables against the header, then only parse and interpolate those columns
+    x_headers = read_csv_headers(x_data_filepath)
+    variables = get_variables_from_data(arguments, list(dict.fromkeys(x_headers + y_variables)))
+    x_data = load_and_process_x_data(x_data_filepath, None if arguments.variables is None else variables,
+                                     chunk_rows=arguments.chunk_rows or (100_000 if arguments.daily_means else 0), daily=arguments.daily_means,
+                                     max_gap_days=arguments.max_gap_days)
+
+    # Source CSVs shared by several targets are parsed once
+    y_data = load_y_targets_data(targets)
+
+    # All sources on one date axis, a y variable that is also in the x source is graphed once with its x readings
+    frames = {'x': x_data}
+    frames.update((get_target_source(i), y_data[y_variable]) for i, y_variable in enumerate(y_variables))
+    dataset = lake_dataset.LakeDataset.from_frames(frames)
+    return variables, x_data, y_data, dataset
+
+def write_forecast(lakelevel_data: pd.DataFrame, arguments: argparse.Namespace, jobs: int) -> bool:
     """
-    Main function to execute the Lake Trend Analyzer workflow:
-    1. Parse command-line arguments.
-    2. Load and preprocess data.
-    3. Perform analysis and generate plots.
+    Write the lake level forecast if its data or settings changed since it was last written.
+    Its fingerprint is kept under its own manifest build, so runs of the plot command do not remove it as an orphan.
+
+    Args:
+        lakelevel_data (pd.DataFrame): Lake level data from load_y_variable_data().
+        arguments (argparse.Namespace): Arguments with the forecast options.
+        jobs (int): Worker processes for the bootstrap.
+
+    Returns:
+        bool: True if the forecast was written.
     """
 
-    arguments = parse_arguments()
+    forecast_settings = {'method': arguments.changepoint_method, 'replicates': arguments.bootstrap_replicates}
+    written = build_manifest.needs_render(FORECAST_PATH, lakelevel_data, forecast_settings)
+    if written:
+        analysis.forecast_future_lake_level(lakelevel_data, file_path=FORECAST_PATH, method=arguments.changepoint_method,
+                                            replicates=arguments.bootstrap_replicates, jobs=jobs)
+    build_manifest.save_manifest(FORECAST_BUILD, build_manifest.pop_recorded_entries(), complete=False)
+    return written
+
+def run_forecast(arguments: argparse.Namespace) -> None:
+    """
+    Write the lake level forecast without loading a parameter source or rendering graphs, see write_forecast().
+
+    Args:
+        arguments (argparse.Namespace): Arguments of the forecast command.
+    """
+
+    dataset_cache.configure_cache(enabled=not arguments.no_cache, rebuild=arguments.rebuild_cache)
+    if not arguments.no_cache:
+        dataset_cache.evict_stale_entries()
+    build_manifest.configure_manifest(enabled=not arguments.force_render)
+    build_manifest.load_manifest(FORECAST_BUILD)
+    build_manifest.pop_recorded_entries()
+
+    os.makedirs(os.path.dirname(FORECAST_PATH), exist_ok=True)
+    y_data = load_y_targets_data([('lakelevel', 'data/lakelevel_data.csv')])
+    if not write_forecast(y_data['lakelevel'], arguments, arguments.jobs if arguments.jobs > 0 else os.cpu_count()):
+        print(f"{FORECAST_PATH} is up to date.")
+
+def print_headers(arguments: argparse.Namespace) -> None:
+    """
+    Print the variables of a CSV file, one per line, as accepted by --variables and --targets.
+    """
+
+    for column in read_csv_headers(arguments.source):
+        if column != 'date':
+            print(column)
+
+def run_analysis(arguments: argparse.Namespace, keep_datasets: bool = False, progress=None) -> list:
+    """
+    Execute the Lake Trend Analyzer workflow for parsed arguments:
+    1. Load and preprocess data.
+    2. Perform analysis (with the forecast unless it is the plot command) and generate plots.
+    3. Write the website index.
+
+    Args:
+        arguments (argparse.Namespace): Arguments from parse_arguments().
+        keep_datasets (bool): Keep the loaded datasets in memory for the next call, for long-lived callers like the GUI.
+        progress (callable): Called after every graph task, see generate_graphs().
+
+    Returns:
+        list: (kind, variable, error message) for every graph that failed.
+    """
+
+    dataset_cache.configure_cache(enabled=not arguments.no_cache, rebuild=arguments.rebuild_cache, memory=keep_datasets)
+    if not arguments.no_cache:
+        dataset_cache.evict_stale_entries()
+
     x_data_filepath = arguments.parameter_source
 
-    y_variable = arguments.y_variable if not None else 'lakelevel'
-    y_data_filepath = arguments.y_variable_source if not None else 'data/lakelevel_data.csv'
+    # Every target is a y variable with its own correlation graphs, the x data is shared by all of them
+    targets = get_targets(arguments)
+    y_variables = [y_variable for y_variable, _ in targets]
+
+    # One manifest build per parameter source and set of y variables, so runs for other sources keep their artefacts
+    build = f'{os.path.normpath(x_data_filepath)}:{"+".join(y_variables)}'
+    build_manifest.configure_manifest(enabled=not arguments.force_render)
+    generate_plots.configure_render_profile(arguments.profile)
+    generate_plots.configure_image_writer(arguments.writer_threads)
+    build_manifest.load_manifest(build)
+    build_manifest.pop_recorded_entries()  # Fingerprints an aborted earlier run in this process left behind
 
     timeseries_folder_path = f'output/timeseries_graphs/'
-    correlation_folder_path = f'output/correlation_graphs/{y_variable}/'
     seasonal_folder_path = 'output/seasonal_graphs/'
+    graph_targets = [(y_variable, f'output/correlation_graphs/{y_variable}/',
+                      f'output/cross_correlation_graphs/{y_variable}/' if arguments.max_lag_days > 0 else None)
+                     for y_variable in y_variables]
 
     # Ensure the output directories for every variable exist
     os.makedirs(timeseries_folder_path, exist_ok=True)
-    os.makedirs(correlation_folder_path, exist_ok=True)
     os.makedirs(seasonal_folder_path, exist_ok=True)
+    for _, correlation_folder_path, cross_correlation_folder_path in graph_targets:
+        os.makedirs(correlation_folder_path, exist_ok=True)
+        if cross_correlation_folder_path is not None:
+            os.makedirs(cross_correlation_folder_path, exist_ok=True)
 
-    x_data = load_and_process_x_data(x_data_filepath)
-
-    # Always use lakelevel from data/lakelevel_data.csv
-    if y_variable == 'lakelevel':
-        y_data = load_y_variable_data('data/lakelevel_data.csv', 'lakelevel')
-    else:
-        y_data = load_y_variable_data(y_data_filepath, y_variable)
-    
-    x_data = pd.merge(x_data, y_data, on='date', how='left')
-
-    variables = get_variables_from_data(arguments, x_data)
-    
-    # avoid double graphing when the y variable has the same dataset as the x variables
-    if f"{y_variable}_y" in variables:
-        x_data.drop(f'{y_variable}_y', axis=1, inplace=True)
-        x_data.rename(columns={f"{y_variable}_x": y_variable}, inplace=True)
+    variables, x_data, y_data, dataset = load_analysis_data(arguments, targets)
 
-        variables.remove(f"{y_variable}_y")
-        duplicate_y_variable_index = variables.index(f"{y_variable}_x")
-        variables[duplicate_y_variable_index] = y_variable
+    jobs = arguments.jobs if arguments.jobs > 0 else os.cpu_count()
 
     # Only forecast if lakelevel data is present
-    if y_variable == 'lakelevel':
-        analysis.forecast_future_lake_level(y_data, file_path='output/lake_level_forecast.txt')
+    if arguments.forecast and 'lakelevel' in y_data:
+        write_forecast(y_data['lakelevel'], arguments, jobs)
+
+    for i, y_variable in enumerate(y_variables):
+        # Like the correlation graphs, a report leaves out the other y variables
+        report_variables = [variable for variable in variables if variable == y_variable or variable not in y_variables]
+        report_path = f'output/lagged_correlation_{y_variable}.txt'
+        if arguments.max_lag_days > 0 and build_manifest.needs_render(report_path, x_data, y_data[y_variable], report_variables, {'max_lag_days': arguments.max_lag_days}):
+            write_lagged_correlation_report(dataset, report_variables, y_variable, arguments.max_lag_days,
+                                            report_path, y_source=get_target_source(i))
+
+    (y_variable, correlation_folder_path, cross_correlation_folder_path), *additional_targets = graph_targets
+    failures = generate_graphs(dataset, variables, y_variable, timeseries_folder_path, correlation_folder_path, seasonal_folder_path, jobs=jobs,
+                               cross_correlation_folder_path=cross_correlation_folder_path, max_lag_days=arguments.max_lag_days,
+                               max_points=arguments.max_points, downsampling_method=arguments.downsampling,
+                               density_threshold=arguments.density_threshold, density_bins=arguments.density_bins,
+                               additional_targets=additional_targets, progress=progress)
+
+    # Partial runs (--variables) only update their entries, full runs also remove orphaned graphs
+    removed = build_manifest.save_manifest(build, build_manifest.pop_recorded_entries(), complete=arguments.variables is None)
+    if removed:
+        print(f"Removed {len(removed)} orphaned output file(s).")
+
+    if failures:
+        print(f"Graph generation finished with {len(failures)} failed graph(s).")
+    else:
+        print("All graphs generated successfully.")
 
-    generate_graphs(x_data, y_data, variables, y_variable, timeseries_folder_path, correlation_folder_path, seasonal_folder_path)
+    generate_website_index.generate_json_index()
+    return failures
 
-    print("All graphs generated successfully.")
+def main() -> None:
+    """
+    Main function to execute the Lake Trend Analyzer workflow:
+    1. Parse command-line arguments.
+    2. Run the command, heavy modules are only imported by the commands that use them.
+    """
 
-    generate_website_index.generate_json_index()
+    arguments = parse_arguments()
+    if arguments.command == 'plot':
+        run_analysis(arguments)
+    elif arguments.command == 'forecast':
+        run_forecast(arguments)
+    elif arguments.command == 'index':
+        generate_website_index.generate_json_index()
+    elif arguments.command == 'headers':
+        print_headers(arguments)
 
 if __name__ == '__main__':
     main()
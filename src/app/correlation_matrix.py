@@ -0,0 +1,69 @@
+import argparse
+import os
+from pathlib import Path
+
+import cli
+import build_manifest
+import correlation
+import generate_plots
+
+MATRIX_PATH = 'output/correlation_matrix.npz'
+MATRIX_BUILD = 'correlation_matrix'  # Manifest build of the matrices and their graphs
+GRAPH_FOLDER_PATH = 'output/correlation_matrix_graphs/'
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse command-line arguments for the correlation matrix.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description='Lake Trend Analyzer correlation matrix')
+
+    parser.add_argument('--sources', type=str, nargs='+',
+                        default=['data/physical_data.csv', 'data/chemical_data.csv', 'data/biological_data.csv'],
+                        help='Source CSV files whose variables are correlated.')
+    parser.add_argument('--lakelevel_source', type=str, default='data/lakelevel_data.csv', help='Source CSV file for the lake level.')
+    parser.add_argument('--min_periods', type=int, default=3, help='Minimum shared readings for a correlation.')
+    parser.add_argument('--force-render', action='store_true', help='Compute and draw the matrices even if their data and settings are unchanged.')
+
+    return parser.parse_args()
+
+def load_datasets(sources: list, lakelevel_source: str) -> dict:
+    """
+    Load every source CSV (through the dataset cache), keyed by a short dataset name such as 'chemical'.
+    """
+
+    datasets = {Path(source).stem.replace('_data', ''): cli.load_and_process_x_data(source) for source in sources}
+    if lakelevel_source:
+        datasets['lakelevel'] = cli.load_y_variable_data(lakelevel_source, 'lakelevel')
+    return datasets
+
+def main() -> None:
+    arguments = parse_arguments()
+
+    os.makedirs(GRAPH_FOLDER_PATH, exist_ok=True)
+    build_manifest.configure_manifest(enabled=not arguments.force_render)
+    build_manifest.load_manifest(MATRIX_BUILD)
+    build_manifest.pop_recorded_entries()
+
+    datasets = load_datasets(arguments.sources, arguments.lakelevel_source)
+    if build_manifest.needs_render(MATRIX_PATH, *datasets.values(), {'datasets': list(datasets), 'min_periods': arguments.min_periods}):
+        matrices = correlation.build_correlation_matrices(datasets, min_periods=arguments.min_periods)
+        correlation.save_correlation_matrices(matrices, MATRIX_PATH)
+    else:
+        # Same data and settings as the saved matrices, reuse them instead of correlating every pair again
+        matrices = correlation.load_correlation_matrices(MATRIX_PATH)
+
+    for method in ('pearson', 'spearman'):
+        title = f'{method.capitalize()} Correlation of all Variables'
+        filename = f'{method}_correlation_matrix.png'
+        if build_manifest.needs_render(GRAPH_FOLDER_PATH + filename, matrices[method], cli.get_style_entries(*matrices['variables']), title):
+            generate_plots.plot_correlation_matrix(matrices[method], matrices['variables'], title, GRAPH_FOLDER_PATH, filename)
+
+    build_manifest.save_manifest(MATRIX_BUILD, build_manifest.pop_recorded_entries(), complete=False)
+    print(f"Correlation matrix of {len(matrices['variables'])} variables saved to {MATRIX_PATH}")
+
+if __name__ == '__main__':
+    main()
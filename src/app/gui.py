@@ -1,45 +1,155 @@
 import sys
 import os
-import subprocess
+from collections import OrderedDict
+import matplotlib
 import pandas as pd
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal, QTimer
+from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt, QSize, QThread, QObject, pyqtSignal, pyqtSlot, QTimer
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QFileDialog, QComboBox, QListWidget, QTextEdit, QSplitter, QSizePolicy
+    QFileDialog, QComboBox, QListWidget, QTextEdit, QSplitter, QSizePolicy, QCheckBox
 )
 
+matplotlib.use('Agg')  # Graphs are drawn on the worker thread, the window embeds finished figures
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+import cli
+
 DEFAULT_CSV = "data/chemical_data.csv"
 TIMESERIES_DIR = "output/timeseries_graphs"
 CORRELATION_DIR = "output/correlation_graphs"
 SEASONAL_DIR = "output/seasonal_graphs"
 OUTPUT_DIR = "output"
+RENDER_PROFILES = ["web", "draft", "publication"]  # See generate_plots.RENDER_PROFILES, the first one is the default
+PLOT_KINDS = {"Time Series": "timeseries", "Correlation": "correlation", "Seasonal": "seasonal"}
+FIGURE_CACHE_SIZE = 32  # Rendered figures kept for instant switching
+SESSION_CACHE_SIZE = 4  # Loaded source and y variable combinations kept by the worker
+CANVAS_DPI = 100
+PIXMAP_CACHE_BYTES = 256 * 1024 * 1024  # Budget of the decoded and prescaled graph images
+PREFETCH_NEIGHBOURS = 2  # Variables before and after the selected one whose graphs are decoded in the background
+RESIZE_DEBOUNCE_MS = 120
+
+class PixmapCache:
+    """
+    LRU cache of decoded graph images (QImage, under size None) and their prescaled QPixmaps (under the target size),
+    bounded by a byte budget. Keys include the file's mtime, so rewritten graphs are decoded again.
+    """
+
+    def __init__(self, max_bytes=PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.used_bytes = 0
+
+    @staticmethod
+    def get_key(path, size=None):
+        """
+        Get the key of an image file at a target size, None if the file does not exist.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (path, mtime_ns, None if size is None else (size.width(), size.height()))
+
+    @staticmethod
+    def get_cost(image):
+        return image.width() * image.height() * image.depth() // 8
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        image = self.entries.get(key)
+        if image is not None:
+            self.entries.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        cost = self.get_cost(image)
+        if key is None or cost > self.max_bytes:
+            return
+        if key in self.entries:
+            self.used_bytes -= self.get_cost(self.entries.pop(key))
+        self.entries[key] = image
+        self.used_bytes += cost
+        while self.used_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.used_bytes -= self.get_cost(evicted)
+
+    def get_scaled(self, path, size):
+        """
+        Get the image file scaled to fit the size, from the cache or decoded and scaled now.
+
+        Returns:
+            QPixmap: Scaled image, None if the file cannot be loaded.
+        """
+        scaled_key = self.get_key(path, size)
+        if scaled_key is None:
+            return None
+        pixmap = self.get(scaled_key)
+        if pixmap is not None:
+            return pixmap
+
+        image_key = self.get_key(path)
+        image = self.get(image_key)
+        if image is None:
+            image = QImage(path)
+            if image.isNull():
+                return None
+            self.put(image_key, image)
+        pixmap = QPixmap.fromImage(image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.put(scaled_key, pixmap)
+        return pixmap
+
+class ImageLoader(QObject):
+    """
+    Decodes and prescales graph images on a background thread. QImage can be used off the GUI thread, QPixmap cannot.
+    """
+    loaded_signal = pyqtSignal(object, object, object, object)  # Image key, decoded QImage, scaled key, scaled QImage
+
+    @pyqtSlot(list, QSize)
+    def load(self, paths, size):
+        for path in paths:
+            image_key = PixmapCache.get_key(path)
+            if image_key is None:
+                continue
+            image = QImage(path)
+            if not image.isNull():
+                scaled = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self.loaded_signal.emit(image_key, image, PixmapCache.get_key(path, size), scaled)
 
 class ImageLabel(QLabel):
-    def __init__(self):
+    def __init__(self, cache=None):
         super().__init__()
         self.setAlignment(Qt.AlignCenter)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self._image_path = None  # Store the path for resizing
+        self._smooth_pixmap = None  # Last smooth scaled pixmap, the source of the fast rescales while resizing
+        self.cache = cache if cache is not None else PixmapCache()
+
+        # Rescale once the window stopped changing size, not on every resize event of a drag
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self._update_pixmap)
 
     def set_image(self, path):
         self._image_path = path
         self._update_pixmap()
 
     def resizeEvent(self, event):
-        self._update_pixmap()
+        if self._smooth_pixmap is not None:
+            self.setPixmap(self._smooth_pixmap.scaled(event.size(), Qt.KeepAspectRatio, Qt.FastTransformation))
+        self.resize_timer.start()
         super().resizeEvent(event)
 
     def _update_pixmap(self):
+        self._smooth_pixmap = None
         if self._image_path and os.path.exists(self._image_path):
-            pixmap = QPixmap(self._image_path)
-            if not pixmap.isNull():
-                # Use the full size of the label for scaling
-                target_size = self.size()
-                scaled_pixmap = pixmap.scaled(
-                    target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
+            # Use the full size of the label for scaling
+            scaled_pixmap = self.cache.get_scaled(self._image_path, self.size())
+            if scaled_pixmap is not None:
+                self._smooth_pixmap = scaled_pixmap
                 self.setPixmap(scaled_pixmap)
             else:
                 self.setText(f"Image could not be loaded:\n{self._image_path}")
@@ -48,29 +158,97 @@ class ImageLabel(QLabel):
         else:
             self.clear()
 
-class GenerateGraphsThread(QThread):
-    finished_signal = pyqtSignal()
+class GraphWorker(QObject):
+    """
+    Runs the CLI workflow in-process on a long-lived thread, so the imports, the loaded datasets
+    and the figure templates stay warm between runs.
+    """
+    progress_signal = pyqtSignal(int, int, str, str, str)  # Done, total, graph kind, variable, error ('' if rendered)
+    error_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(list)  # (kind, variable, error) of every failed graph
+    figure_signal = pyqtSignal(object, object, str)  # Request key, rendered figure (None without data), error
 
-    def __init__(self, param_csv_path, y_variable_csv_path, y_variable):
+    def __init__(self):
         super().__init__()
-        self.param_csv_path = param_csv_path
-        self.y_variable_csv_path = y_variable_csv_path
-        self.y_variable = y_variable
+        self.sessions = OrderedDict()
+        self.renderers = {}
+        self.latest_render_key = None  # Set by the window, queued requests for other graphs are skipped
 
-    def run(self):
+    @pyqtSlot(list)
+    def generate(self, argv):
+        failures = []
         try:
-            subprocess.run(
-                [
-                    sys.executable, "src/app/cli.py",
-                    self.param_csv_path, "--y_variable_source", self.y_variable_csv_path, "--y_variable", self.y_variable
-                ],
-                check=True
-            )
-        except Exception:
-            pass
-        self.finished_signal.emit()
+            failures = cli.run_analysis(cli.parse_arguments(argv), keep_datasets=True, progress=self.report_progress)
+        except SystemExit:
+            self.error_signal.emit(f"Invalid arguments: {' '.join(argv)}")
+        except Exception as e:
+            self.error_signal.emit(f"{type(e).__name__}: {e}")
+        self.finished_signal.emit(failures)
+
+    def report_progress(self, done, total, task, error):
+        kind, variable, _ = task
+        self.progress_signal.emit(done, total, kind, variable, error or '')
+
+    @pyqtSlot(object)
+    def render(self, request):
+        if request['key'] != self.latest_render_key:
+            return
+        try:
+            session = self.get_session(request['argv'])
+            task = next((task for task in session['tasks'] if task[:2] == (request['kind'], request['variable'])), None)
+            renderer = self.get_renderer(request['profile'])
+            figure = None if task is None else cli.render_graph_figure(task, session['pyramids'], session['settings'], renderer)
+            if figure is not None and request['save_path']:
+                os.makedirs(os.path.dirname(request['save_path']), exist_ok=True)
+                renderer.write(figure, request['save_path'])
+                cli.generate_plots.flush_images()
+            self.figure_signal.emit(request['key'], figure, '')
+        except Exception as e:
+            self.figure_signal.emit(request['key'], None, f"{type(e).__name__}: {e}")
+
+    def get_session(self, argv):
+        """
+        Load the data of a parameter source and y variable once, with the pyramids and tasks of its graphs.
+        Sessions are dropped when a source file changes, and the least recently used beyond SESSION_CACHE_SIZE.
+        """
+        arguments = cli.parse_arguments(argv)
+        targets = cli.get_targets(arguments)
+        paths = [arguments.parameter_source] + [path for _, path in targets]
+        key = (tuple(argv), tuple(os.stat(path).st_mtime_ns for path in paths))
+        if key in self.sessions:
+            self.sessions.move_to_end(key)
+            return self.sessions[key]
+
+        cli.dataset_cache.configure_cache(enabled=not arguments.no_cache, memory=True)
+        variables, _, _, dataset = cli.load_analysis_data(arguments, targets)
+        y_variable = targets[0][0]
+        session = {
+            'pyramids': cli.build_graph_pyramids(dataset, [y_variable]),
+            'tasks': cli.build_graph_tasks(variables, y_variable),
+            'settings': {
+                'targets': {'y': {'y_variable': y_variable}},
+                'max_points': arguments.max_points,
+                'downsampling_method': arguments.downsampling,
+                'density_threshold': arguments.density_threshold,
+                'density_bins': arguments.density_bins,
+                **cli.get_time_scale(dataset),
+            },
+        }
+        self.sessions[key] = session
+        while len(self.sessions) > SESSION_CACHE_SIZE:
+            self.sessions.popitem(last=False)
+        return session
+
+    def get_renderer(self, profile):
+        if profile not in self.renderers:
+            self.renderers[profile] = cli.generate_plots.PlotRenderer(profile=profile, reuse_templates=False)
+        return self.renderers[profile]
 
 class MainWindow(QWidget):
+    generate_requested = pyqtSignal(list)  # CLI arguments for the graph worker
+    render_requested = pyqtSignal(object)  # Single graph for the graph worker, see GraphWorker.render()
+    prefetch_requested = pyqtSignal(list, QSize)  # Graph images for the image loader, see ImageLoader.load()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Lake Trends Analyzer")
@@ -79,8 +257,14 @@ class MainWindow(QWidget):
         self.param = None
         self.y_variable_csv_path = DEFAULT_CSV
         self.y_variable = None
+        self.generation_failures = []
+        self.figure_cache = OrderedDict()  # get_render_key() -> rendered Figure
+        self.current_render_key = None
+        self.plot_canvas = None
+        self.pixmap_cache = PixmapCache()
 
         self.init_ui()
+        self.init_worker()
         self.load_param_csv_headers()
         self.load_y_variable_csv_headers()
         self.load_output_files()
@@ -165,6 +349,8 @@ class MainWindow(QWidget):
 
         sidebar_layout.addSpacing(10)
         sidebar_layout.addWidget(self.view_plots_btn)
+        self.save_rendered_checkbox = QCheckBox("Save rendered graphs to output/")
+        sidebar_layout.addWidget(self.save_rendered_checkbox)
         sidebar_layout.addSpacing(25)
 
         self.y_variable_csv_text.hide()
@@ -182,22 +368,39 @@ class MainWindow(QWidget):
         sidebar_layout.addWidget(self.view_file_btn)
         sidebar_layout.addStretch()
 
+        # Render profile of the generated graphs
+        sidebar_layout.addWidget(QLabel("Render Profile:"))
+        self.render_profile_dropdown = QComboBox()
+        self.render_profile_dropdown.addItems(RENDER_PROFILES)
+        sidebar_layout.addWidget(self.render_profile_dropdown)
+
         # Add "Generate Graphs" button at the bottom
         self.generate_graphs_btn = QPushButton("Generate Graphs")
         self.generate_graphs_btn.clicked.connect(self.generate_graphs)
         sidebar_layout.addWidget(self.generate_graphs_btn)
 
+        self.generation_status_label = QLabel()
+        self.generation_status_label.setWordWrap(True)
+        self.generation_status_label.setMaximumWidth(260)
+        self.generation_status_label.hide()
+        sidebar_layout.addWidget(self.generation_status_label)
+
         # Right panel (for image or text)
         self.right_panel = QWidget()
         self.right_layout = QVBoxLayout(self.right_panel)
         self.right_layout.setContentsMargins(0, 0, 0, 0)
         self.right_layout.setSpacing(10)
 
-        self.plot_img = ImageLabel()
+        self.plot_img = ImageLabel(self.pixmap_cache)
+        self.canvas_holder = QWidget()
+        self.canvas_layout = QVBoxLayout(self.canvas_holder)
+        self.canvas_layout.setContentsMargins(0, 0, 0, 0)
+        self.canvas_holder.hide()
         self.text_view = QTextEdit()
         self.text_view.setReadOnly(True)
 
         self.right_layout.addWidget(self.plot_img, stretch=1)
+        self.right_layout.addWidget(self.canvas_holder, stretch=1)
         self.right_layout.addWidget(self.text_view)
 
         splitter.addWidget(sidebar)
@@ -205,6 +408,33 @@ class MainWindow(QWidget):
         splitter.setSizes([300, 800])
         main_layout.addWidget(splitter)
 
+    def init_worker(self):
+        # One worker thread for the lifetime of the window, runs are queued to it through generate_requested
+        self.worker_thread = QThread()
+        self.worker = GraphWorker()
+        self.worker.moveToThread(self.worker_thread)
+        self.generate_requested.connect(self.worker.generate)
+        self.worker.progress_signal.connect(self.on_generation_progress)
+        self.worker.error_signal.connect(self.on_generation_error)
+        self.worker.finished_signal.connect(self.on_generation_complete)
+        self.render_requested.connect(self.worker.render)
+        self.worker.figure_signal.connect(self.on_figure_rendered)
+        self.worker_thread.start()
+
+        # Graph images of the neighbouring variables are decoded on their own thread, the graph worker may be rendering
+        self.loader_thread = QThread()
+        self.loader = ImageLoader()
+        self.loader.moveToThread(self.loader_thread)
+        self.prefetch_requested.connect(self.loader.load)
+        self.loader.loaded_signal.connect(self.on_image_loaded)
+        self.loader_thread.start()
+
+    def closeEvent(self, event):
+        for thread in (self.worker_thread, self.loader_thread):
+            thread.quit()
+            thread.wait()
+        super().closeEvent(event)
+
     def param_csv_dropdown_changed(self, idx):
         if idx == 0:
             self.param_csv_path = "data/chemical_data.csv"
@@ -277,7 +507,7 @@ class MainWindow(QWidget):
 
     def load_param_csv_headers(self):
         try:
-            df = pd.read_csv(self.param_csv_path, nrows=1)
+            df = pd.read_csv(self.param_csv_path, nrows=0)  # Header only
             headers = [h for h in df.columns if h.lower() != "date"]
             headers = [h.lower() for h in headers]
             if self.param_csv_path == "data/physical_data.csv":
@@ -294,7 +524,7 @@ class MainWindow(QWidget):
 
     def load_y_variable_csv_headers(self):
         try:
-            df = pd.read_csv(self.y_variable_csv_path, nrows=1)
+            df = pd.read_csv(self.y_variable_csv_path, nrows=0)  # Header only
             headers = [h for h in df.columns if h.lower() != "date"]
             headers = [h.lower() for h in headers]
             if self.param_csv_path == "data/physical_data.csv":
@@ -324,13 +554,8 @@ class MainWindow(QWidget):
         if not x_variable:
             return
         plot_type = self.plot_type_dropdown.currentText()
-        if plot_type == "Time Series":
-            img_path = os.path.join(TIMESERIES_DIR, f"{x_variable}_timeseries.png")
-        elif plot_type == "Correlation":
-            img_path = os.path.join(CORRELATION_DIR, f"{y_variable}/{x_variable}_correlation.png")
-        elif plot_type == "Seasonal":
-            img_path = os.path.join(SEASONAL_DIR, f"{x_variable}_seasonal_correlation.png")
-        else:
+        img_path = self.get_image_path(plot_type, x_variable, y_variable)
+        if img_path is None:
             return
         
         if plot_type == "Correlation":
@@ -346,8 +571,110 @@ class MainWindow(QWidget):
             self.y_variable_dropdown.hide()
 
         self.text_view.hide()
-        self.plot_img.show()
+        self.render_plot(PLOT_KINDS[plot_type], x_variable, y_variable, img_path)
+        self.prefetch_neighbours(plot_type, y_variable)
 
+    @staticmethod
+    def get_image_path(plot_type, x_variable, y_variable):
+        if plot_type == "Time Series":
+            return os.path.join(TIMESERIES_DIR, f"{x_variable}_timeseries.png")
+        elif plot_type == "Correlation":
+            return os.path.join(CORRELATION_DIR, f"{y_variable}/{x_variable}_correlation.png")
+        elif plot_type == "Seasonal":
+            return os.path.join(SEASONAL_DIR, f"{x_variable}_seasonal_correlation.png")
+        return None
+
+    def prefetch_neighbours(self, plot_type, y_variable):
+        """
+        Have the image loader decode and prescale the graphs of the variables next to the selected one,
+        so stepping through the dropdown shows them without loading.
+        """
+        index = self.param_dropdown.currentIndex()
+        size = self.plot_img.size()
+        paths = []
+        for offset in range(1, PREFETCH_NEIGHBOURS + 1):
+            for neighbour in (index + offset, index - offset):
+                if 0 <= neighbour < self.param_dropdown.count():
+                    path = self.get_image_path(plot_type, self.param_dropdown.itemText(neighbour), y_variable)
+                    key = PixmapCache.get_key(path, size)
+                    if key is not None and key not in self.pixmap_cache:
+                        paths.append(path)
+        if paths:
+            self.prefetch_requested.emit(paths, size)
+
+    def on_image_loaded(self, image_key, image, scaled_key, scaled):
+        self.pixmap_cache.put(image_key, image)
+        self.pixmap_cache.put(scaled_key, QPixmap.fromImage(scaled))
+
+    def render_plot(self, kind, x_variable, y_variable, img_path):
+        """
+        Show a graph from the figure cache, or have the worker render it from the loaded data.
+        The PNG from the last batch run is shown meanwhile, if there is one.
+        """
+        y_variable = y_variable or 'lakelevel'
+        profile = self.render_profile_dropdown.currentText()
+        save = self.save_rendered_checkbox.isChecked()
+        key = self.get_render_key(kind, x_variable, y_variable, self.param_csv_path, self.y_variable_csv_path,
+                                  profile if save else None)
+        self.current_render_key = key
+        if key in self.figure_cache:
+            self.figure_cache.move_to_end(key)
+            self.show_figure(self.figure_cache[key])
+            return
+
+        self.show_image(img_path)
+        self.worker.latest_render_key = key
+        self.render_requested.emit({
+            'key': key,
+            'argv': [self.param_csv_path, "--y_variable_source", self.y_variable_csv_path, "--y_variable", y_variable],
+            'kind': kind,
+            'variable': x_variable,
+            'profile': profile,
+            'save_path': img_path if save else None,
+        })
+
+    @staticmethod
+    def get_render_key(kind, x_variable, y_variable, param_csv_path, y_variable_csv_path, save_profile=None):
+        """
+        Get the figure cache key of a graph. It includes the mtimes of the source files, so edited data is rendered again,
+        and the profile the graph was written with, so a figure only viewed so far is still rendered and saved.
+        """
+        paths = [param_csv_path] + ([y_variable_csv_path] if kind == 'correlation' else [])
+        sources = []
+        for path in paths:
+            try:
+                sources.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                sources.append((path, None))
+        return (kind, x_variable, y_variable if kind == 'correlation' else None, tuple(sources), save_profile)
+
+    def on_figure_rendered(self, key, figure, error):
+        if figure is not None:
+            self.figure_cache[key] = figure
+            while len(self.figure_cache) > FIGURE_CACHE_SIZE:
+                self.figure_cache.popitem(last=False)
+        if key != self.current_render_key:
+            return
+        if figure is not None:
+            self.show_figure(figure)
+        elif error:
+            self.text_view.setPlainText(f"Could not render the graph:\n{error}")
+            self.text_view.show()
+
+    def show_figure(self, figure):
+        figure.set_dpi(CANVAS_DPI)
+        canvas = FigureCanvasQTAgg(figure)
+        if self.plot_canvas is not None:
+            self.canvas_layout.removeWidget(self.plot_canvas)
+            self.plot_canvas.deleteLater()
+        self.plot_canvas = canvas
+        self.canvas_layout.addWidget(canvas)
+        self.plot_img.hide()
+        self.canvas_holder.show()
+
+    def show_image(self, img_path):
+        self.canvas_holder.hide()
+        self.plot_img.show()
         self.plot_img.set_image(img_path)
 
     def view_file(self):
@@ -361,10 +688,12 @@ class MainWindow(QWidget):
             self.text_view.setPlainText(content)
             self.text_view.show()
             self.plot_img.hide()
+            self.canvas_holder.hide()
         except Exception as e:
             self.text_view.setPlainText(f"Could not open file: {filepath}\n{e}")
             self.text_view.show()
             self.plot_img.hide()
+            self.canvas_holder.hide()
 
     def load_output_files(self):
         files = [
@@ -378,13 +707,40 @@ class MainWindow(QWidget):
     def generate_graphs(self):
         self.generate_graphs_btn.setEnabled(False)
         self.generate_graphs_btn.setText("Generating...")
-        self.thread = GenerateGraphsThread(self.param_csv_path, self.y_variable_csv_path, self.y_variable)
-        self.thread.finished_signal.connect(self.on_generation_complete)
-        self.thread.start()
-
-    def on_generation_complete(self):
+        self.generation_status_label.setText("Loading data...")
+        self.generation_status_label.show()
+        self.generation_failures = []
+
+        argv = [self.param_csv_path, "--profile", self.render_profile_dropdown.currentText()]
+        if self.y_variable:
+            argv += ["--y_variable_source", self.y_variable_csv_path, "--y_variable", self.y_variable]
+        self.generate_requested.emit(argv)
+
+    def on_generation_progress(self, done, total, kind, variable, error):
+        self.generate_graphs_btn.setText(f"Generating... {done}/{total}")
+        if error:
+            self.generation_failures.append(f"{kind} graph for '{variable}': {error}")
+        self.generation_status_label.setText(f"{kind.replace('_', ' ').capitalize()} graph for '{variable}'"
+                                              + (f", {len(self.generation_failures)} failed" if self.generation_failures else ""))
+
+    def on_generation_error(self, message):
+        self.generation_failures.append(message)
+
+    def on_generation_complete(self, failures):
+        # The run rewrote the graph files, figures rendered or saved before it no longer match them
+        self.figure_cache.clear()
         self.load_output_files()
-        self.generate_graphs_btn.setText("Generation Complete")
+        self.update_plot()
+        # Failed writes are only known at the end of a run, they are part of failures but were not reported as progress
+        reported = set(self.generation_failures)
+        self.generation_failures += [f"{kind} graph for '{variable}': {error}" for kind, variable, error in failures
+                                     if f"{kind} graph for '{variable}': {error}" not in reported]
+        if self.generation_failures:
+            self.generate_graphs_btn.setText(f"Generation Finished ({len(self.generation_failures)} failed)")
+            self.generation_status_label.setText("Failed:\n" + "\n".join(self.generation_failures))
+        else:
+            self.generate_graphs_btn.setText("Generation Complete")
+            self.generation_status_label.hide()
         QTimer.singleShot(3000, self.reset_generate_button)
 
     def reset_generate_button(self):
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from lake_dataset import LakeDataset
+
+AGGREGATE_STATISTICS = ['mean', 'min', 'max', 'count']
+
+def aggregate_groups(daily: pd.DataFrame, keys) -> pd.DataFrame:
+    """
+    Combine daily sums, minima, maxima and counts into coarser groups.
+    Means are the group sum over the group count, i.e. weighted by the number of raw readings.
+    """
+    sums = daily['sum'].groupby(keys).sum()
+    counts = daily['count'].groupby(keys).sum()
+    return pd.concat({
+        'mean': sums / counts.where(counts > 0),
+        'min': daily['min'].groupby(keys).min(),
+        'max': daily['max'].groupby(keys).max(),
+        'count': counts,
+    }, axis=1)
+
+def build_aggregate_pyramid(data: pd.DataFrame, variables: list = None) -> dict:
+    """
+    Aggregate every variable once to daily, monthly, yearly and month-of-year resolution.
+    The raw readings are reduced to daily sums, minima, maxima and counts in one vectorized pass,
+    every coarser level is then grouped from those daily rows instead of from the raw data again.
+
+    Args:
+        data (pd.DataFrame): DataFrame with a 'date' column and numeric variable columns.
+        variables (list): Variables to aggregate, defaults to every column except 'date'.
+
+    Returns:
+        dict: 'daily', 'monthly', 'yearly' and 'month_of_year' DataFrames with (statistic, variable) columns.
+              Daily rows are the days with readings, monthly and yearly rows cover the whole date range
+              at month and year ends like resample('ME') and resample('YE'), month-of-year rows are indexed 1 to 12.
+    """
+    if variables is None:
+        variables = [col for col in data.columns if col != 'date']
+
+    data = data.dropna(subset=['date'])
+    grouped = data[variables].groupby(data['date'].dt.normalize().rename('date'))
+    daily = pd.concat({
+        'sum': grouped.sum(min_count=1),
+        'min': grouped.min(),
+        'max': grouped.max(),
+        'count': grouped.count(),
+    }, axis=1)
+
+    return aggregate_levels(daily)
+
+def build_dataset_pyramid(dataset: LakeDataset, source: str, variables: list = None) -> dict:
+    """
+    Aggregate variables of a LakeDataset at the dates of one of its sources, like build_aggregate_pyramid() of dataset.frame().
+    When the source has at most one reading per day, its readings already are the daily rows and are taken straight
+    from the column arrays without building a DataFrame of the raw data first.
+
+    Args:
+        dataset (LakeDataset): Dataset holding the variables.
+        source (str): Source whose dates are aggregated.
+        variables (list): Variables to aggregate, defaults to the variables of the source.
+                          Variables of other sources are read at the dates of this source.
+
+    Returns:
+        dict: Same levels as build_aggregate_pyramid().
+    """
+    if variables is None:
+        variables = dataset.get_variables(source)
+
+    rows = dataset.source_rows[source]
+    dates = dataset.dates[rows]
+    days = dates.astype('datetime64[D]')
+    if len(days) and (np.any(dates != days) or np.any(days[1:] == days[:-1])):
+        return build_aggregate_pyramid(dataset.frame(source, variables), variables)
+
+    index = pd.DatetimeIndex(days.astype('datetime64[ns]'), name='date')
+    values = {}
+    counts = {}
+    for variable in variables:
+        values_source = source if variable in dataset.columns[source] else dataset.source_of(variable)
+        values[variable] = dataset.columns[values_source][variable][rows].astype(float)
+        counts[variable] = dataset.masks[values_source][variable][rows].astype(np.int64)
+
+    readings = pd.DataFrame(values, index=index, columns=variables)
+    daily = pd.concat({
+        'sum': readings,
+        'min': readings,
+        'max': readings,
+        'count': pd.DataFrame(counts, index=index, columns=variables),
+    }, axis=1)
+
+    return aggregate_levels(daily)
+
+def aggregate_levels(daily: pd.DataFrame) -> dict:
+    """
+    Build every level of an aggregate pyramid from daily sums, minima, maxima and counts indexed by day.
+    """
+    pyramid = {'daily': aggregate_groups(daily, daily.index)}
+
+    for level, frequency in (('monthly', 'ME'), ('yearly', 'YE')):
+        periods = daily.index.to_period(frequency[0])
+        aggregated = aggregate_groups(daily, periods)
+        if len(aggregated):
+            aggregated = aggregated.reindex(pd.period_range(aggregated.index.min(), aggregated.index.max(), freq=frequency[0]))
+            aggregated['count'] = aggregated['count'].fillna(0).astype(int)
+        aggregated.index = aggregated.index.to_timestamp(how='end').normalize().rename('date')
+        pyramid[level] = aggregated
+
+    pyramid['month_of_year'] = aggregate_groups(daily, daily.index.month.rename('month'))
+
+    return pyramid
+
+def get_aggregate(pyramid: dict, level: str, variable: str, statistic: str = 'mean') -> pd.DataFrame:
+    """
+    Get one statistic of one variable from an aggregate pyramid.
+
+    Args:
+        pyramid (dict): Pyramid from build_aggregate_pyramid().
+        level (str): 'daily', 'monthly', 'yearly' or 'month_of_year'.
+        variable (str): Name of the variable.
+        statistic (str): 'mean', 'min', 'max' or 'count'.
+
+    Returns:
+        pd.DataFrame: Two columns, the index ('date' or 'month') and the variable.
+    """
+    if statistic not in AGGREGATE_STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}', expected one of {AGGREGATE_STATISTICS}")
+
+    frame = pyramid[level]
+    if variable not in frame[statistic].columns:
+        raise KeyError(f"No variable '{variable}' in the aggregated data.")
+    return frame[statistic][[variable]].reset_index()
@@ -1,16 +1,169 @@
 import pandas as pd
 import numpy as np
 import matplotlib.dates as mdates
+from concurrent.futures import ProcessPoolExecutor
 
-def forecast_future_lake_level(data: pd.DataFrame, file_path: str) -> None:
+import changepoint
+
+def rolling_linear_regression(x: np.ndarray, y: np.ndarray, window: int) -> tuple:
+    """
+    Fit an ordinary least squares line to every sliding window of length `window` at once.
+    Uses cumulative sums of x, y, xy and x² so the cost is O(n) regardless of the window size.
+
+    Args:
+        x (np.ndarray): Sorted x values, e.g. matplotlib date numbers.
+        y (np.ndarray): y values of the same length.
+        window (int): Number of points per window.
+
+    Returns:
+        tuple: (slopes, intercepts), one entry per window start i covering x[i:i+window].
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if window < 2 or window > len(x):
+        raise ValueError(f"Window must be between 2 and {len(x)} points, got {window}")
+
+    # Center the data to keep the cumulative sums small and the differences well conditioned
+    x_offset = x.mean()
+    y_offset = y.mean()
+    x_centered = x - x_offset
+    y_centered = y - y_offset
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        return cumulative[window:] - cumulative[:-window]
+
+    sum_x = window_sums(x_centered)
+    sum_y = window_sums(y_centered)
+    sum_xy = window_sums(x_centered * y_centered)
+    sum_xx = window_sums(x_centered * x_centered)
+
+    mean_x = sum_x / window
+    mean_y = sum_y / window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = (sum_xy - sum_x * mean_y) / (sum_xx - sum_x * mean_x)
+    intercepts = (mean_y + y_offset) - slopes * (mean_x + x_offset)
+
+    return slopes, intercepts
+
+BOOTSTRAP_CHUNK_SIZE = 500  # Replicates solved per batched least squares call
+
+def block_bootstrap_indices(rng: np.random.Generator, n: int, block_length: int, count: int) -> np.ndarray:
+    """
+    Draw `count` moving block bootstrap resamples of the positions 0..n-1.
+
+    Args:
+        rng (np.random.Generator): Random number generator.
+        n (int): Length of the series.
+        block_length (int): Number of consecutive positions per block.
+        count (int): Number of resamples.
+
+    Returns:
+        np.ndarray: Index matrix of shape (count, n).
+    """
+    block_length = min(max(1, block_length), n)
+    blocks_per_sample = -(-n // block_length)
+    starts = rng.integers(0, n - block_length + 1, size=(count, blocks_per_sample))
+    indices = starts[:, :, None] + np.arange(block_length)
+    return indices.reshape(count, -1)[:, :n]
+
+def bootstrap_trend_chunk(projection: np.ndarray,
+                          residuals: np.ndarray,
+                          block_length: int,
+                          count: int,
+                          seed: np.random.SeedSequence,
+                          horizons: int) -> tuple:
+    """
+    Refit the trend line on `count` block bootstrap series in one batched least squares solve.
+    Least squares is linear in y, so refitting fitted + resampled residuals equals the original
+    coefficients plus the coefficients of the resampled residuals alone.
+
+    Returns:
+        tuple: (coefficient offsets of shape (count, 2), noise of shape (count, horizons)).
+    """
+    rng = np.random.default_rng(seed)
+    resampled = residuals[block_bootstrap_indices(rng, len(residuals), block_length, count)]
+    coefficient_offsets = resampled @ projection.T
+    noise = residuals[rng.integers(0, len(residuals), size=(count, horizons))]
+    return coefficient_offsets, noise
+
+def bootstrap_trend_lines(x: np.ndarray,
+                          y: np.ndarray,
+                          replicates: int = 10000,
+                          block_length: int = None,
+                          horizons: int = 1,
+                          seed: int = 0,
+                          jobs: int = 1) -> tuple:
+    """
+    Moving block residual bootstrap of a linear trend.
+    Residuals are resampled in blocks to keep their autocorrelation, added back to the fitted line,
+    and every replicate is refitted. Replicates are split into fixed chunks with their own seeds,
+    so the result only depends on `seed`, not on `jobs`.
+
+    Args:
+        x (np.ndarray): x values, e.g. matplotlib date numbers.
+        y (np.ndarray): y values of the same length.
+        replicates (int): Number of bootstrap replicates.
+        block_length (int): Residuals per block, defaults to √n.
+        horizons (int): Number of future residual draws per replicate (one per forecast horizon).
+        seed (int): Seed of the random number generator.
+        jobs (int): Number of worker processes, 1 runs in this process.
+
+    Returns:
+        tuple: (slopes, intercepts, noise) with shapes (replicates,), (replicates,) and (replicates, horizons).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if block_length is None:
+        block_length = max(1, int(np.sqrt(len(x))))
+
+    # Least squares projection (pseudo-inverse) of the centered design matrix, shared by every replicate
+    x_mean = x.mean()
+    design = np.column_stack((x - x_mean, np.ones_like(x)))
+    projection = np.linalg.pinv(design)
+    coefficients = projection @ y
+    residuals = y - design @ coefficients
+
+    counts = [min(BOOTSTRAP_CHUNK_SIZE, replicates - start) for start in range(0, replicates, BOOTSTRAP_CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    chunk_arguments = [(projection, residuals, block_length, count, chunk_seed, horizons)
+                       for count, chunk_seed in zip(counts, seeds)]
+
+    if jobs <= 1:
+        chunks = [bootstrap_trend_chunk(*arguments) for arguments in chunk_arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunks = list(executor.map(bootstrap_trend_chunk, *zip(*chunk_arguments)))
+
+    replicate_coefficients = coefficients + np.concatenate([chunk[0] for chunk in chunks])
+    slopes = replicate_coefficients[:, 0]
+    intercepts = replicate_coefficients[:, 1] - slopes * x_mean
+    noise = np.concatenate([chunk[1] for chunk in chunks])
+    return slopes, intercepts, noise
+
+def forecast_future_lake_level(data: pd.DataFrame,
+                               file_path: str,
+                               method: str = 'pelt',
+                               replicates: int = 10000,
+                               confidence: float = 0.95,
+                               jobs: int = 1,
+                               seed: int = 0) -> list:
     """
     Forecast future lake levels based on recent trend after detecting major trajectory changes.
+    Prediction intervals and the "days until dry" distribution come from a block bootstrap of the recent trend.
 
     Args:
         data (pd.DataFrame): DataFrame containing at least 'date' and 'lakelevel' columns.
+        file_path (str): Path of the forecast text file.
+        method (str): Change point method, 'pelt' or 'binseg'.
+        replicates (int): Number of bootstrap replicates, 0 disables the intervals.
+        confidence (float): Coverage of the reported intervals.
+        jobs (int): Number of worker processes for the bootstrap.
+        seed (int): Seed of the bootstrap.
 
     Returns:
-        None
+        list: Detected trend segments, see changepoint.detect_segments().
     """
     file = open(file_path, 'w')
 
@@ -22,26 +175,12 @@ def forecast_future_lake_level(data: pd.DataFrame, file_path: str) -> None:
     x = mdates.date2num(data['date'])
     y = data['lakelevel'].values
 
-    # Calculate rolling slope to detect change points
-    window = max(10, len(data) // 10)  # Use a window of at least 10 or 10% of data
-    slopes = pd.Series(np.polyfit(x[i:i+window], y[i:i+window], 1)[0]
-                       for i in range(len(x) - window + 1))
-    # Find where the slope changes significantly (e.g., by more than 2x std deviation)
-    slope_diff = slopes.diff().abs()
-    threshold = 2 * slope_diff.std()
-    change_points = slope_diff[slope_diff > threshold].index.tolist()
-
-    # Use the most recent segment after the last major change point
-    if change_points:
-        last_change_idx = change_points[-1]
-        start_idx = last_change_idx
-        x_recent = x[start_idx:]
-        y_recent = y[start_idx:]
-        data_recent = data.iloc[start_idx:]
-    else:
-        x_recent = x
-        y_recent = y
-        data_recent = data
+    # Split the history into linear trend segments and use the most recent stable regime
+    segments = changepoint.detect_segments(x, y, method=method)
+    start_idx = segments[-1]['start']
+    x_recent = x[start_idx:]
+    y_recent = y[start_idx:]
+    data_recent = data.iloc[start_idx:]
 
     # Fit trend line to recent segment
     trend_line_function = np.poly1d(np.polyfit(x_recent, y_recent, 1))
@@ -49,13 +188,32 @@ def forecast_future_lake_level(data: pd.DataFrame, file_path: str) -> None:
 
     years = [1, 10, 50, 100]
     days_in_year = 365.25
+    lower_quantile = (1 - confidence) / 2
+    upper_quantile = 1 - lower_quantile
+
+    if replicates > 0:
+        bootstrap_slopes, bootstrap_intercepts, bootstrap_noise = bootstrap_trend_lines(
+            x_recent, y_recent, replicates=replicates, horizons=len(years), seed=seed, jobs=jobs)
 
     file.write("Forecast based on recent trend after major trajectory change detection:\n\n")
-    for year in years:
+    file.write(f"Detected trend segments ({method}):\n")
+    for segment in segments:
+        first_date = data['date'].iloc[segment['start']].date()
+        last_date_in_segment = data['date'].iloc[segment['end'] - 1].date()
+        file.write(f"  {first_date} to {last_date_in_segment}: {segment['slope'] * days_in_year:+.4f} m/year "
+                   f"({segment['end'] - segment['start']} readings)\n")
+    file.write("\n")
+    for position, year in enumerate(years):
         future_date = last_date + pd.Timedelta(days=year * days_in_year)
         future_numeric = mdates.date2num(future_date)
         forecast = trend_line_function(future_numeric)
-        file.write(f"Forecast for {year} years ({future_date.date()}): {forecast:.2f} m\n")
+        file.write(f"Forecast for {year} years ({future_date.date()}): {forecast:.2f} m")
+
+        if replicates > 0:
+            bootstrap_forecasts = bootstrap_slopes * future_numeric + bootstrap_intercepts + bootstrap_noise[:, position]
+            lower, upper = np.quantile(bootstrap_forecasts, [lower_quantile, upper_quantile])
+            file.write(f" ({confidence:.0%} prediction interval {lower:.2f} to {upper:.2f} m)")
+        file.write("\n")
 
     slope = trend_line_function.c[0]
     if slope < 0:
@@ -72,7 +230,131 @@ def forecast_future_lake_level(data: pd.DataFrame, file_path: str) -> None:
         else:
             file.write("\nWarning: Trend suggests lake would already be dry based on current data.\n")
 
+    if replicates > 0:
+        last_numeric = mdates.date2num(last_date)
+        drying = bootstrap_slopes < 0
+        days_until_dry = -bootstrap_intercepts[drying] / bootstrap_slopes[drying] - last_numeric
+        days_until_dry = days_until_dry[days_until_dry > 0]
+
+        file.write(f"\nBootstrap ({replicates} replicates): {drying.mean():.1%} of the recent trends point towards drying out.\n")
+        if len(days_until_dry) > 0:
+            lower, median, upper = np.quantile(days_until_dry, [lower_quantile, 0.5, upper_quantile])
+            file.write(f"Days until dry among those: median {int(median)} days, "
+                       f"{confidence:.0%} interval {int(lower)} to {int(upper)} days.\n")
+
     file.write("\nThis forecast is based on the most recent trend segment after detecting major changes.\nThe forecast is subject to uncertainty and may not reflect actual future conditions.")
 
     file.close()
-    print(f"Forecast saved to {file_path}")
\ No newline at end of file
+    print(f"Forecast saved to {file_path}")
+
+    return segments
+
+def backtest_lake_level_forecast(data: pd.DataFrame,
+                                 horizons: tuple = (1, 10),
+                                 step_days: int = 30,
+                                 min_history_years: float = 10,
+                                 method: str = 'pelt',
+                                 tolerance_days: float = 7) -> pd.DataFrame:
+    """
+    Replay the lake level forecast from many historical cut-off dates (rolling origins) and score it
+    against the readings that followed.
+
+    Change point settings (minimum segment length, penalty, grid spacing) are derived from the history
+    before the first origin and then kept fixed, so no origin sees future data. Prefix sums are built once
+    for the whole series: with PELT a single online run gives the recent regime of every origin, and each
+    origin's trend line is read from the prefix sums in O(1).
+
+    Args:
+        data (pd.DataFrame): DataFrame containing at least 'date' and 'lakelevel' columns.
+        horizons (tuple): Forecast horizons in years.
+        step_days (int): Days between successive origins.
+        min_history_years (float): History required before the first origin.
+        method (str): Change point method, 'pelt' or 'binseg'.
+        tolerance_days (float): Maximum distance between a target date and the nearest reading to score it.
+
+    Returns:
+        pd.DataFrame: One row per origin and horizon with the forecast, actual level, error and
+                      the error of a persistence (last reading) forecast.
+    """
+    data = data.copy()
+    data['date'] = pd.to_datetime(data['date'])
+    data = data.sort_values('date').dropna(subset=['lakelevel'])
+
+    x = mdates.date2num(data['date'])
+    y = data['lakelevel'].values
+    days_in_year = 365.25
+
+    first_origin = int(np.searchsorted(x, x[0] + min_history_years * days_in_year))
+    if first_origin >= len(x):
+        raise ValueError(f"Backtest needs more than {min_history_years} years of lake level data")
+
+    # Settings of the forecast on the first origin's history, fixed for all origins
+    min_size = max(10, first_origin // 10)
+    jump = max(1, first_origin // 2000)
+    penalty = changepoint.estimate_penalty(changepoint.LinearSegmentCost(x[:first_origin], y[:first_origin]), min_size)
+    cost = changepoint.LinearSegmentCost(x, y)
+
+    # Origins every step_days, snapped onto the change point grid
+    origin_dates = np.arange(x[first_origin - 1], x[-1], step_days)
+    origins = np.unique(np.searchsorted(x, origin_dates, side='right'))
+    origins = np.unique(np.maximum(jump, (origins // jump) * jump))
+    origins = origins[(origins >= first_origin) & (origins < len(x))]
+
+    if method == 'pelt':
+        segment_starts = changepoint.pelt_previous_changes(cost, penalty, min_size, jump)[origins]
+    elif method == 'binseg':
+        segment_starts = np.array([
+            (changepoint.binary_segmentation(cost, penalty, min_size, jump, end=origin) or [0])[-1]
+            for origin in origins
+        ])
+    else:
+        raise ValueError(f"Unknown change point method '{method}'")
+
+    # Origins the segmentation could not cover fall back to the full history
+    segment_starts = np.where(segment_starts < 0, 0, segment_starts)
+    slopes, intercepts = cost.line(segment_starts, origins)
+    last_numeric = x[origins - 1]
+
+    rows = []
+    for horizon in horizons:
+        target = last_numeric + horizon * days_in_year
+        position = np.clip(np.searchsorted(x, target), 1, len(x) - 1)
+        nearest_distance = np.minimum(np.abs(x[position] - target), np.abs(target - x[position - 1]))
+        scored = (target <= x[-1]) & (nearest_distance <= tolerance_days)
+
+        forecast = slopes * target + intercepts
+        actual = np.interp(target, x, y)
+        rows.append(pd.DataFrame({
+            'origin_date': mdates.num2date(last_numeric[scored]),
+            'trend_start_date': mdates.num2date(x[segment_starts[scored]]),
+            'horizon_years': horizon,
+            'forecast': forecast[scored],
+            'actual': actual[scored],
+            'error': forecast[scored] - actual[scored],
+            'persistence_error': y[origins - 1][scored] - actual[scored],
+        }))
+
+    table = pd.concat(rows, ignore_index=True)
+    for col in ('origin_date', 'trend_start_date'):
+        table[col] = pd.to_datetime(table[col]).dt.tz_localize(None).dt.normalize()
+    return table
+
+def summarize_backtest(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize backtest errors per horizon.
+
+    Args:
+        table (pd.DataFrame): Output of backtest_lake_level_forecast().
+
+    Returns:
+        pd.DataFrame: Origins, mean absolute error, root mean squared error and bias per horizon,
+                      plus the mean absolute error of the persistence forecast.
+    """
+    grouped = table.groupby('horizon_years')
+    return pd.DataFrame({
+        'origins': grouped.size(),
+        'mae': grouped['error'].apply(lambda errors: errors.abs().mean()),
+        'rmse': grouped['error'].apply(lambda errors: np.sqrt((errors ** 2).mean())),
+        'bias': grouped['error'].mean(),
+        'persistence_mae': grouped['persistence_error'].apply(lambda errors: errors.abs().mean()),
+    }).reset_index()
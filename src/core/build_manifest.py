@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+MANIFEST_PATH = 'output/.manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+# Source files whose content is part of every fingerprint, any code change re-renders everything
+CODE_DIRECTORIES = [Path(__file__).resolve().parent, Path(__file__).resolve().parent.parent / 'app']
+
+# Set once by the CLI through configure_manifest() and load_manifest()
+MANIFEST_ENABLED = True
+PREVIOUS_ENTRIES = {}
+
+# Artefact -> fingerprint of everything checked with needs_render() in this process
+RECORDED_ENTRIES = {}
+
+# Prefix of the fingerprint of an artefact that was skipped for lack of data, see record_skip()
+SKIPPED_PREFIX = 'skipped:'
+
+CODE_VERSION = None
+
+def configure_manifest(enabled: bool = True) -> None:
+    """
+    Switch skipping of unchanged artefacts on or off for this process.
+    Fingerprints are recorded either way, so a forced run still leaves a complete manifest behind.
+    """
+    global MANIFEST_ENABLED
+    MANIFEST_ENABLED = enabled
+
+def get_code_version() -> str:
+    """
+    Hash the Python sources of the app, computed once per process.
+    """
+    global CODE_VERSION
+    if CODE_VERSION is None:
+        digest = hashlib.sha256()
+        for directory in CODE_DIRECTORIES:
+            for source in sorted(directory.glob('*.py')):
+                digest.update(source.name.encode('utf-8'))
+                digest.update(source.read_bytes())
+        CODE_VERSION = digest.hexdigest()
+    return CODE_VERSION
+
+def update_digest(digest, value) -> None:
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(col) for col in value.columns]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+
+def fingerprint(*inputs) -> str:
+    """
+    Hash the inputs that produce an artefact (data slices, style entries, plot parameters) and the code version.
+
+    Args:
+        *inputs: DataFrames, Series, arrays or JSON serializable values.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256(get_code_version().encode('utf-8'))
+    for value in inputs:
+        digest.update(type(value).__name__.encode('utf-8'))
+        update_digest(digest, value)
+    return digest.hexdigest()
+
+def needs_render(artefacts, *inputs) -> bool:
+    """
+    Record the fingerprint of an artefact and check whether it has to be produced again.
+
+    Args:
+        artefacts (str | list): Path of the output file, or of every file produced together (e.g. a graph and its thumbnail).
+        *inputs: Everything the artefacts are produced from, see fingerprint().
+
+    Returns:
+        bool: False if all files exist and were produced from the same inputs by the same code,
+              or if they were skipped for lack of data last time from the same inputs.
+    """
+    if isinstance(artefacts, str):
+        artefacts = [artefacts]
+    artefacts = [os.path.normpath(artefact) for artefact in artefacts]
+    digest = fingerprint(*inputs)
+
+    if MANIFEST_ENABLED and all(PREVIOUS_ENTRIES.get(artefact) == SKIPPED_PREFIX + digest for artefact in artefacts):
+        for artefact in artefacts:
+            RECORDED_ENTRIES[artefact] = SKIPPED_PREFIX + digest
+        return False
+
+    for artefact in artefacts:
+        RECORDED_ENTRIES[artefact] = digest
+
+    if not MANIFEST_ENABLED:
+        return True
+    return any(PREVIOUS_ENTRIES.get(artefact) != digest or not os.path.exists(artefact) for artefact in artefacts)
+
+def record_skip(artefacts) -> None:
+    """
+    Mark artefacts checked with needs_render() as skipped for lack of data. No file is written for them,
+    so without the mark every run with the same inputs would try, and skip, them again.
+    """
+    if isinstance(artefacts, str):
+        artefacts = [artefacts]
+    for artefact in artefacts:
+        artefact = os.path.normpath(artefact)
+        if artefact in RECORDED_ENTRIES and not RECORDED_ENTRIES[artefact].startswith(SKIPPED_PREFIX):
+            RECORDED_ENTRIES[artefact] = SKIPPED_PREFIX + RECORDED_ENTRIES[artefact]
+
+def discard_entries(artefacts) -> None:
+    """
+    Forget recorded fingerprints, e.g. of artefacts whose rendering failed, so the next run tries them again.
+    """
+    for artefact in artefacts:
+        RECORDED_ENTRIES.pop(artefact, None)
+
+def pop_recorded_entries() -> dict:
+    """
+    Return and clear the fingerprints recorded in this process, e.g. to send them from a worker to the parent.
+    """
+    entries = dict(RECORDED_ENTRIES)
+    RECORDED_ENTRIES.clear()
+    return entries
+
+def read_manifest(path: str = MANIFEST_PATH) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'format_version': MANIFEST_FORMAT_VERSION, 'builds': {}}
+    if manifest.get('format_version') != MANIFEST_FORMAT_VERSION:
+        return {'format_version': MANIFEST_FORMAT_VERSION, 'builds': {}}
+    return manifest
+
+def load_manifest(build: str, path: str = MANIFEST_PATH) -> None:
+    """
+    Load the fingerprints of the previous run of a build into this process.
+    Artefacts last written by another build, like the timeseries graphs shared by runs for different y variables,
+    are checked against that write, so they are not rendered again while their inputs are unchanged.
+
+    Args:
+        build (str): Build key, e.g. the parameter source and y variable of a CLI run.
+        path (str): Path of the manifest.
+    """
+    manifest = read_manifest(path)
+    PREVIOUS_ENTRIES.clear()
+    PREVIOUS_ENTRIES.update(manifest['builds'].get(build, {}))
+    PREVIOUS_ENTRIES.update(manifest.get('artefacts', {}))
+
+def save_manifest(build: str, entries: dict, complete: bool, path: str = MANIFEST_PATH) -> list:
+    """
+    Store the fingerprints of a build and remove its orphaned artefacts.
+
+    Args:
+        build (str): Build key the entries belong to.
+        entries (dict): Artefact -> fingerprint of this run.
+        complete (bool): The run covered the whole build. Only then are artefacts of the previous run
+                         that were not produced again orphans, partial runs just update their entries.
+        path (str): Path of the manifest.
+
+    Returns:
+        list: Removed orphaned artefacts.
+    """
+    manifest = read_manifest(path)
+    previous = manifest['builds'].get(build, {})
+    latest = manifest.setdefault('artefacts', {})  # Artefact -> fingerprint of its last write by any build
+
+    removed = []
+    if complete:
+        # Artefacts can be shared between builds (e.g. the lake level graphs), keep what another build still lists
+        listed_elsewhere = {artefact for key, artefacts in manifest['builds'].items() if key != build for artefact in artefacts}
+        for artefact in sorted(set(previous) - set(entries) - listed_elsewhere):
+            if os.path.exists(artefact):
+                os.remove(artefact)
+                removed.append(artefact)
+            latest.pop(artefact, None)
+        manifest['builds'][build] = dict(entries)
+    else:
+        manifest['builds'][build] = {**previous, **entries}
+    latest.update(entries)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temporary_path, path)
+    return removed
@@ -0,0 +1,220 @@
+import numpy as np
+
+class LinearSegmentCost:
+    """
+    Sum of squared residuals of a least squares line fitted to x[start:end], in O(1) per segment.
+    Prefix sums of x, y, xy, x² and y² are built once, so any number of segments can be scored
+    with a handful of array lookups, vectorized over many start or end points at once.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.x_offset = x.mean()
+        self.y_offset = y.mean()
+        x = x - self.x_offset
+        y = y - self.y_offset
+
+        def prefix(values: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(values)))
+
+        self.sum_x = prefix(x)
+        self.sum_y = prefix(y)
+        self.sum_xy = prefix(x * y)
+        self.sum_xx = prefix(x * x)
+        self.sum_yy = prefix(y * y)
+        self.n = len(x)
+
+    def centered_sums(self, start, end) -> tuple:
+        count = np.asarray(end - start, dtype=float)
+        sum_x = self.sum_x[end] - self.sum_x[start]
+        sum_y = self.sum_y[end] - self.sum_y[start]
+        sxx = (self.sum_xx[end] - self.sum_xx[start]) - sum_x * sum_x / count
+        sxy = (self.sum_xy[end] - self.sum_xy[start]) - sum_x * sum_y / count
+        syy = (self.sum_yy[end] - self.sum_yy[start]) - sum_y * sum_y / count
+        return count, sum_x, sum_y, sxx, sxy, syy
+
+    def error(self, start, end):
+        """
+        Residual sum of squares of the line fitted to every segment [start, end).
+        `start` and `end` can be integers or integer arrays of the same shape.
+        """
+        _, _, _, sxx, sxy, syy = self.centered_sums(start, end)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            residual = np.where(sxx > 0, syy - sxy * sxy / sxx, syy)
+        return np.maximum(residual, 0.0)
+
+    def line(self, start, end) -> tuple:
+        """
+        Slope and intercept (in original units) of the line fitted to every segment [start, end).
+        `start` and `end` can be integers or integer arrays of the same shape.
+        """
+        count, sum_x, sum_y, sxx, sxy, _ = self.centered_sums(start, end)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(sxx > 0, sxy / sxx, 0.0)
+        intercept = sum_y / count + self.y_offset - slope * (sum_x / count + self.x_offset)
+        return slope, intercept
+
+def get_candidate_grid(n: int, jump: int) -> np.ndarray:
+    """
+    Indices where a segment may start or end: every `jump`-th point plus both ends.
+    """
+    return np.unique(np.concatenate((np.arange(0, n, max(1, jump)), [n])))
+
+def estimate_penalty(cost: LinearSegmentCost, min_size: int) -> float:
+    """
+    BIC-style penalty 3·σ²·log(n) for a new linear segment (slope, intercept and break point).
+    σ² is the median residual variance of lines fitted to consecutive blocks of `min_size` points,
+    i.e. the scatter still expected inside a stable regime.
+    """
+    starts = np.arange(0, cost.n - min_size + 1, min_size)
+    if len(starts) == 0:
+        return 0.0
+    variance = np.median(cost.error(starts, starts + min_size) / min_size)
+    return 3.0 * variance * np.log(cost.n)
+
+def pelt_previous_changes(cost: LinearSegmentCost, penalty: float, min_size: int, jump: int = 1) -> np.ndarray:
+    """
+    Run PELT over the whole series and return, for every end index, where the last segment of the
+    optimal segmentation of x[:end] starts. PELT is online, so one run answers every prefix.
+
+    Args:
+        cost (LinearSegmentCost): Segment cost over the series.
+        penalty (float): Cost added per segment.
+        min_size (int): Minimum number of points per segment.
+        jump (int): Only consider change points on every `jump`-th index.
+
+    Returns:
+        np.ndarray: Last segment start per end index 0..n, -1 where no segmentation ends.
+    """
+    grid = get_candidate_grid(cost.n, jump)
+    best_cost = np.full(cost.n + 1, np.inf)
+    best_cost[0] = -penalty
+    previous_change = np.full(cost.n + 1, -1)
+    candidates = np.array([0])
+
+    for end in grid[1:]:
+        admissible = candidates[end - candidates >= min_size]
+        if len(admissible) == 0:
+            continue
+
+        total = best_cost[admissible] + cost.error(admissible, end) + penalty
+        best = int(np.argmin(total))
+        best_cost[end] = total[best]
+        previous_change[end] = admissible[best]
+
+        # Prune starts that can never beat the best split again
+        keep = total - penalty <= best_cost[end]
+        waiting = candidates[end - candidates < min_size]
+        candidates = np.concatenate((waiting, admissible[keep], [end]))
+
+    return previous_change
+
+def pelt(cost: LinearSegmentCost, penalty: float, min_size: int, jump: int = 1) -> list:
+    """
+    Pruned Exact Linear Time search for the penalized optimal segmentation.
+    Candidates that can no longer start the optimal last segment are pruned, which keeps the
+    candidate set small and the run time close to linear when the number of changes grows with n.
+
+    Args:
+        cost (LinearSegmentCost): Segment cost over the series.
+        penalty (float): Cost added per segment.
+        min_size (int): Minimum number of points per segment.
+        jump (int): Only consider change points on every `jump`-th index.
+
+    Returns:
+        list: Sorted change point indices (segment starts, excluding 0).
+    """
+    previous_change = pelt_previous_changes(cost, penalty, min_size, jump)
+    if previous_change[cost.n] < 0:
+        return []
+
+    change_points = []
+    end = int(previous_change[cost.n])
+    while end > 0:
+        change_points.append(end)
+        end = int(previous_change[end])
+    return sorted(change_points)
+
+def binary_segmentation(cost: LinearSegmentCost, penalty: float, min_size: int, jump: int = 1, end: int = None) -> list:
+    """
+    Greedy binary segmentation: split a segment at the point with the largest cost reduction
+    while that reduction exceeds the penalty. Every level scans each point once, vectorized,
+    so balanced splits cost O(n log n).
+
+    Args:
+        cost (LinearSegmentCost): Segment cost over the series.
+        penalty (float): Minimum cost reduction for a split.
+        min_size (int): Minimum number of points per segment.
+        jump (int): Only consider change points on every `jump`-th index.
+        end (int): Only segment x[:end], defaults to the whole series.
+
+    Returns:
+        list: Sorted change point indices (segment starts, excluding 0).
+    """
+    end = cost.n if end is None else end
+    grid = get_candidate_grid(end, jump)
+    change_points = []
+    stack = [(0, end)]
+
+    while stack:
+        start, stop = stack.pop()
+        splits = grid[(grid - start >= min_size) & (stop - grid >= min_size)]
+        if len(splits) == 0:
+            continue
+
+        gains = cost.error(start, stop) - cost.error(start, splits) - cost.error(splits, stop)
+        best = int(np.argmax(gains))
+        if gains[best] <= penalty:
+            continue
+
+        split = int(splits[best])
+        change_points.append(split)
+        stack.extend([(start, split), (split, stop)])
+
+    return sorted(change_points)
+
+CHANGE_POINT_METHODS = {
+    'pelt': pelt,
+    'binseg': binary_segmentation,
+}
+
+def detect_segments(x: np.ndarray,
+                    y: np.ndarray,
+                    method: str = 'pelt',
+                    min_size: int = None,
+                    penalty: float = None,
+                    jump: int = None) -> list:
+    """
+    Split a series into piecewise linear segments.
+
+    Args:
+        x (np.ndarray): Sorted x values, e.g. matplotlib date numbers.
+        y (np.ndarray): y values of the same length.
+        method (str): 'pelt' or 'binseg'.
+        min_size (int): Minimum points per segment, defaults to 10% of the data (at least 10).
+        penalty (float): Cost per extra segment, defaults to estimate_penalty().
+        jump (int): Change point grid spacing, defaults to keeping about 2000 candidates.
+
+    Returns:
+        list: One dict per segment with 'start' and 'end' indices ([start, end)), 'slope' and 'intercept'.
+    """
+    if method not in CHANGE_POINT_METHODS:
+        raise ValueError(f"Unknown change point method '{method}', expected one of {sorted(CHANGE_POINT_METHODS)}")
+
+    cost = LinearSegmentCost(x, y)
+    if min_size is None:
+        min_size = max(10, cost.n // 10)
+    if jump is None:
+        jump = max(1, cost.n // 2000)
+    if penalty is None:
+        penalty = estimate_penalty(cost, min_size)
+
+    change_points = CHANGE_POINT_METHODS[method](cost, penalty, min_size, jump) if cost.n >= 2 * min_size else []
+
+    segments = []
+    bounds = [0] + change_points + [cost.n]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        slope, intercept = cost.line(start, end)
+        segments.append({'start': start, 'end': end, 'slope': float(slope), 'intercept': float(intercept)})
+    return segments
@@ -0,0 +1,349 @@
+import numpy as np
+import pandas as pd
+from scipy import fft
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+from lake_dataset import LakeDataset
+
+def align_datasets(datasets: dict) -> pd.DataFrame:
+    """
+    Put several datasets onto one shared, sorted date axis.
+    Readings on the same date are averaged, dates missing from a dataset are left as NaN.
+
+    Args:
+        datasets (dict): Dataset name -> DataFrame with a 'date' column and numeric variable columns.
+
+    Returns:
+        pd.DataFrame: Date indexed frame with one column per variable. Variables found in several
+                      datasets are suffixed with the dataset name.
+    """
+    dataset = LakeDataset.from_frames(datasets)
+    columns = dataset.qualified_names()
+    return pd.DataFrame({name: dataset.columns[source][variable] for source, variable, name in columns},
+                        index=pd.DatetimeIndex(dataset.dates, name='date'), columns=[name for _, _, name in columns])
+
+def rank_columns(values: np.ndarray) -> np.ndarray:
+    """
+    Average ranks of every column, ignoring NaN (which stays NaN).
+    """
+    return pd.DataFrame(values).rank(method='average').to_numpy()
+
+def pairwise_correlation(values: np.ndarray, min_periods: int = 3) -> tuple:
+    """
+    Pearson correlation of all column pairs over their pairwise complete rows, with masked matrix products
+    instead of one loop per pair.
+
+    Args:
+        values (np.ndarray): Matrix of shape (dates, variables) with NaN for missing readings.
+        min_periods (int): Minimum shared readings for a correlation, fewer give NaN.
+
+    Returns:
+        tuple: (correlation matrix, pairwise observation counts), both of shape (variables, variables).
+    """
+    valid = ~np.isnan(values)
+    mask = valid.astype(float)
+    filled = np.where(valid, values, 0.0)
+
+    # Center each column first to keep the sums well conditioned
+    column_means = np.divide(filled.sum(axis=0), mask.sum(axis=0), out=np.zeros(values.shape[1]), where=mask.sum(axis=0) > 0)
+    filled = np.where(valid, filled - column_means, 0.0)
+
+    counts = mask.T @ mask
+    sum_x = filled.T @ mask           # [i, j]: sum of variable i where i and j are both present
+    sum_xx = (filled ** 2).T @ mask
+    sum_xy = filled.T @ filled
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = counts * sum_xy - sum_x * sum_x.T
+        variance_x = counts * sum_xx - sum_x ** 2
+        correlation = covariance / np.sqrt(variance_x * variance_x.T)
+
+    # Variables that are constant over the shared readings only leave rounding noise in the variance
+    constant = variance_x <= 1e-10 * counts * sum_xx
+    correlation[(counts < min_periods) | constant | constant.T | ~np.isfinite(correlation)] = np.nan
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    return correlation, counts.astype(int)
+
+def ranks_within_partners(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Rank one variable separately over the rows shared with each partner variable.
+    Cumulative counts of the partners' valid rows along the sorted variable give every partner's
+    ranks at once, ties get their average rank.
+
+    Args:
+        values (np.ndarray): The variable, without NaN, shape (rows,).
+        valid (np.ndarray): Boolean validity of each partner on the same rows, shape (rows, partners).
+
+    Returns:
+        np.ndarray: Ranks of shape (rows, partners), only meaningful where `valid` is True.
+    """
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    new_group = np.concatenate(([True], sorted_values[1:] != sorted_values[:-1]))
+    group = np.cumsum(new_group) - 1
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(values))
+
+    cumulative = np.vstack((np.zeros((1, valid.shape[1])), np.cumsum(valid[order], axis=0)))
+    less = cumulative[starts]
+    equal = cumulative[ends] - less
+
+    ranks = np.empty(valid.shape)
+    ranks[order] = less[group] + (equal[group] + 1) / 2
+    return ranks
+
+def spearman_correlation(values: np.ndarray, min_periods: int = 3) -> np.ndarray:
+    """
+    Spearman rank correlation of all column pairs, ranked over each pair's shared readings like pandas.
+    One pass per variable ranks all partners at once, so sparse variables (few shared rows) cost next to nothing.
+
+    Args:
+        values (np.ndarray): Matrix of shape (dates, variables) with NaN for missing readings.
+        min_periods (int): Minimum shared readings for a correlation, fewer give NaN.
+
+    Returns:
+        np.ndarray: Correlation matrix of shape (variables, variables).
+    """
+    variables = values.shape[1]
+    correlation = np.full((variables, variables), np.nan)
+    readings = (~np.isnan(values)).sum(axis=0)
+    positions = np.arange(variables)
+
+    for j in range(variables):
+        if readings[j] < min_periods:
+            continue
+
+        # Each pair is computed once, from the side of the variable with fewer readings
+        partners = np.flatnonzero((readings > readings[j]) | ((readings == readings[j]) & (positions >= j)))
+        rows = values[~np.isnan(values[:, j])][:, partners]
+        own = np.flatnonzero(partners == j)[0]
+
+        valid = ~np.isnan(rows)
+        partner_ranks = rank_columns(rows)
+        own_ranks = ranks_within_partners(rows[:, own], valid)
+
+        counts = valid.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            partner_centered = np.where(valid, partner_ranks - np.nansum(np.where(valid, partner_ranks, 0), axis=0) / counts, 0.0)
+            own_centered = np.where(valid, own_ranks - np.sum(np.where(valid, own_ranks, 0), axis=0) / counts, 0.0)
+            covariance = np.sum(partner_centered * own_centered, axis=0)
+            column = covariance / np.sqrt(np.sum(partner_centered ** 2, axis=0) * np.sum(own_centered ** 2, axis=0))
+
+        column[counts < min_periods] = np.nan
+        correlation[partners, j] = column
+        correlation[j, partners] = column
+
+    correlation[~np.isfinite(correlation)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+def cluster_order(correlation: np.ndarray) -> np.ndarray:
+    """
+    Order variables by average linkage clustering on 1 - |r| so related variables sit next to each other.
+    Pairs without a correlation are treated as unrelated.
+    """
+    if len(correlation) < 3:
+        return np.arange(len(correlation))
+
+    distance = 1.0 - np.abs(np.nan_to_num(correlation, nan=0.0))
+    np.fill_diagonal(distance, 0.0)
+    distance = (distance + distance.T) / 2
+    return leaves_list(linkage(squareform(distance, checks=False), method='average'))
+
+def build_correlation_matrices(datasets, min_periods: int = 3) -> dict:
+    """
+    Correlate every variable of every dataset with every other one on a shared date axis.
+
+    Args:
+        datasets: LakeDataset, or dataset name -> DataFrame with a 'date' column and numeric variable columns.
+        min_periods (int): Minimum shared readings for a correlation.
+
+    Returns:
+        dict: 'variables' (cluster ordered names), 'pearson', 'spearman' and 'counts' matrices in that order.
+    """
+    if not isinstance(datasets, LakeDataset):
+        datasets = LakeDataset.from_frames(datasets)
+    columns = datasets.qualified_names()
+    values = np.column_stack([datasets.columns[source][variable] for source, variable, _ in columns]).astype(float)
+
+    pearson, counts = pairwise_correlation(values, min_periods)
+    spearman = spearman_correlation(values, min_periods)
+    order = cluster_order(pearson)
+
+    return {
+        'variables': [columns[i][2] for i in order],
+        'pearson': pearson[np.ix_(order, order)],
+        'spearman': spearman[np.ix_(order, order)],
+        'counts': counts[np.ix_(order, order)],
+    }
+
+def regularize_daily(data: pd.DataFrame, variables: list, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
+    """
+    Put variables on a regular daily grid from `start` to `end`.
+    Readings on the same day are averaged, days without a reading are NaN.
+
+    Args:
+        data (pd.DataFrame): DataFrame with a 'date' column and the variables.
+        variables (list): Columns to regularize.
+        start (pd.Timestamp): First day of the grid.
+        end (pd.Timestamp): Last day of the grid.
+
+    Returns:
+        np.ndarray: Matrix of shape (days, variables).
+    """
+    daily = data.dropna(subset=['date']).groupby(data['date'].dt.normalize())[variables].mean()
+    return daily.reindex(pd.date_range(start.normalize(), end.normalize(), freq='D')).to_numpy(dtype=float)
+
+def lagged_cross_correlation(x: np.ndarray, y: np.ndarray, max_lag: int, min_periods: int = 30) -> tuple:
+    """
+    Pearson correlation of x[t] with y[t + lag] for every lag in [-max_lag, max_lag], over the days both are present.
+    The six masked sums the correlation needs (count, sums, sums of squares and cross products) are
+    cross-correlations of the gap-masked series, so each is one FFT product instead of a loop per lag.
+
+    Args:
+        x (np.ndarray): Daily driver series of shape (days,) or (days, drivers), NaN on gaps.
+        y (np.ndarray): Daily series of shape (days,), NaN on gaps.
+        max_lag (int): Largest lag in days, positive lags mean x leads y.
+        min_periods (int): Minimum shared days for a correlation, fewer give NaN.
+
+    Returns:
+        tuple: (lags, correlations, counts), correlations and counts have shape (lags,) or (lags, drivers).
+    """
+    single_driver = np.ndim(x) == 1
+    x = np.asarray(x, dtype=float).reshape(len(x), -1)
+    y = np.asarray(y, dtype=float)
+    max_lag = min(max_lag, len(y) - 1)
+
+    def masked(values: np.ndarray) -> tuple:
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        readings = valid.sum(axis=0)
+        # Center on the series mean to keep the FFT sums well conditioned
+        mean = np.divide(filled.sum(axis=0), readings, out=np.zeros(np.shape(readings)), where=readings > 0)
+        centered = np.where(valid, filled - mean, 0.0)
+        return valid.astype(float), centered, centered ** 2
+
+    length = fft.next_fast_len(len(y) + max_lag, real=True)
+    x_spectra = [fft.rfft(values, length, axis=0) for values in masked(x)]
+    y_spectra = [fft.rfft(values, length)[:, np.newaxis] for values in masked(y)]
+
+    def cross(x_spectrum: np.ndarray, y_spectrum: np.ndarray) -> np.ndarray:
+        # sum_t a[t] * b[t + lag], negative lags wrap around to the end of the zero padded result
+        full = fft.irfft(np.conj(x_spectrum) * y_spectrum, length, axis=0)
+        return np.concatenate((full[length - max_lag:], full[:max_lag + 1]))
+
+    x_mask, x_values, x_squares = x_spectra
+    y_mask, y_values, y_squares = y_spectra
+
+    counts = np.rint(cross(x_mask, y_mask))
+    sum_x = cross(x_values, y_mask)
+    sum_y = cross(x_mask, y_values)
+    sum_xx = cross(x_squares, y_mask)
+    sum_yy = cross(x_mask, y_squares)
+    sum_xy = cross(x_values, y_values)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = counts * sum_xy - sum_x * sum_y
+        variance_x = counts * sum_xx - sum_x ** 2
+        variance_y = counts * sum_yy - sum_y ** 2
+        correlations = covariance / np.sqrt(variance_x * variance_y)
+
+    # Constant stretches only leave FFT rounding noise in the variance
+    constant = (variance_x <= 1e-10 * counts * sum_xx) | (variance_y <= 1e-10 * counts * sum_yy)
+    correlations[(counts < min_periods) | constant | ~np.isfinite(correlations)] = np.nan
+    np.clip(correlations, -1.0, 1.0, out=correlations)
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    counts = counts.astype(int)
+    if single_driver:
+        return lags, correlations[:, 0], counts[:, 0]
+    return lags, correlations, counts
+
+def find_best_lags(x_data: pd.DataFrame,
+                   y_data: pd.DataFrame,
+                   variables: list,
+                   y_variable: str,
+                   max_lag: int,
+                   min_periods: int = 30) -> pd.DataFrame:
+    """
+    Find the lag with the strongest (absolute) correlation between every driver and the y variable.
+
+    Args:
+        x_data (pd.DataFrame): DataFrame with 'date' and the driver variables.
+        y_data (pd.DataFrame): DataFrame with 'date' and the y variable.
+        variables (list): Driver variables.
+        y_variable (str): Name of the y variable.
+        max_lag (int): Largest lag in days in either direction.
+        min_periods (int): Minimum shared days for a correlation.
+
+    Returns:
+        pd.DataFrame: One row per driver with 'variable', 'best_lag_days', 'correlation', 'shared_days'
+                      and 'same_day_correlation'. Drivers without any correlation are left out.
+    """
+    dataset = LakeDataset.from_frames({'x': x_data, 'y': y_data})
+    return find_dataset_best_lags(dataset, variables, y_variable, max_lag, min_periods)
+
+def find_dataset_best_lags(dataset: LakeDataset,
+                           variables: list,
+                           y_variable: str,
+                           max_lag: int,
+                           min_periods: int = 30,
+                           x_source: str = 'x',
+                           y_source: str = 'y') -> pd.DataFrame:
+    """
+    find_best_lags() of drivers and a y variable held in one LakeDataset, on the daily grid of its whole date axis.
+
+    Args:
+        dataset (LakeDataset): Dataset holding the drivers and the y variable.
+        variables (list): Driver variables, read from x_source.
+        y_variable (str): Name of the y variable, read from y_source.
+        max_lag (int): Largest lag in days in either direction.
+        min_periods (int): Minimum shared days for a correlation.
+        x_source (str): Source of the drivers.
+        y_source (str): Source of the y variable.
+
+    Returns:
+        pd.DataFrame: Same columns as find_best_lags().
+    """
+    _, grid = dataset.daily_grid(variables + [y_variable], [x_source] * len(variables) + [y_source])
+    x = grid[:, :-1]
+    y = grid[:, -1]
+
+    lags, correlations, counts = lagged_cross_correlation(x, y, max_lag, min_periods)
+    same_day = np.flatnonzero(lags == 0)[0]
+
+    rows = []
+    for i, variable in enumerate(variables):
+        if np.all(np.isnan(correlations[:, i])):
+            continue
+        best = int(np.nanargmax(np.abs(correlations[:, i])))
+        rows.append({
+            'variable': variable,
+            'best_lag_days': int(lags[best]),
+            'correlation': correlations[best, i],
+            'shared_days': counts[best, i],
+            'same_day_correlation': correlations[same_day, i],
+        })
+    return pd.DataFrame(rows, columns=['variable', 'best_lag_days', 'correlation', 'shared_days', 'same_day_correlation'])
+
+def save_correlation_matrices(matrices: dict, file_path: str) -> None:
+    """
+    Store the matrices of build_correlation_matrices() in an .npz file.
+    """
+    np.savez(file_path,
+             variables=np.array(matrices['variables'], dtype=str),
+             pearson=matrices['pearson'],
+             spearman=matrices['spearman'],
+             counts=matrices['counts'])
+
+def load_correlation_matrices(file_path: str) -> dict:
+    """
+    Load matrices stored by save_correlation_matrices().
+    """
+    with np.load(file_path, allow_pickle=False) as archive:
+        return {
+            'variables': archive['variables'].tolist(),
+            'pearson': archive['pearson'],
+            'spearman': archive['spearman'],
+            'counts': archive['counts'],
+        }
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = '.cache/datasets'
+CACHE_FORMAT_VERSION = 1  # Bump when the loaders change what they return
+
+# Set once by the CLI through configure_cache()
+CACHE_ENABLED = True
+REBUILD_CACHE = False
+MEMORY_CACHE_ENABLED = False
+
+# Loaded frames of long-lived processes like the GUI worker, (path, loader, args) -> (size, mtime_ns, frame)
+MEMORY_ENTRIES = {}
+
+def configure_cache(enabled: bool = True, rebuild: bool = False, memory: bool = False) -> None:
+    """
+    Switch the dataset cache on or off for this process.
+
+    Args:
+        enabled (bool): Read and write cache entries.
+        rebuild (bool): Ignore existing entries and overwrite them with freshly loaded data.
+        memory (bool): Also keep every loaded frame in memory and serve it again while the source file is unchanged.
+    """
+    global CACHE_ENABLED, REBUILD_CACHE, MEMORY_CACHE_ENABLED
+    CACHE_ENABLED = enabled
+    REBUILD_CACHE = rebuild
+    MEMORY_CACHE_ENABLED = memory
+    if not memory:
+        MEMORY_ENTRIES.clear()
+
+def hash_file(filepath: str) -> str:
+    """
+    Hash the content of a file in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def describe_source(filepath: str) -> dict:
+    """
+    Describe a source file by path, size, mtime and content hash.
+    """
+    stat = os.stat(filepath)
+    return {
+        'path': os.path.abspath(filepath),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hash_file(filepath),
+    }
+
+def get_entry_path(filepath: str, loader_name: str, loader_args: tuple) -> str:
+    """
+    Get the cache entry path (without extension) for a loader call on a source file.
+    """
+    key = json.dumps([os.path.abspath(filepath), loader_name, list(loader_args)])
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+def write_metadata(entry_path: str, metadata: dict) -> None:
+    """
+    Write the metadata of a cache entry through a temporary file, so readers never see a partial entry.
+    """
+    temporary_path = entry_path + '.json.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(temporary_path, entry_path + '.json')
+
+def is_entry_fresh(metadata: dict, entry_path: str) -> bool:
+    """
+    Check a cache entry's recorded source against the file on disk.
+    Size and mtime are checked first, the content hash decides when only the mtime moved.
+    An entry confirmed by its hash gets the new mtime recorded, so later checks skip hashing again.
+    """
+    if metadata.get('format_version') != CACHE_FORMAT_VERSION:
+        return False
+
+    source = metadata['source']
+    if not os.path.exists(source['path']):
+        return False
+
+    stat = os.stat(source['path'])
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns == source['mtime_ns']:
+        return True
+
+    if hash_file(source['path']) != source['sha256']:
+        return False
+    source['mtime_ns'] = stat.st_mtime_ns
+    write_metadata(entry_path, metadata)
+    return True
+
+def remove_entry(entry_path: str) -> None:
+    for extension in ('.json', '.npz'):
+        if os.path.exists(entry_path + extension):
+            os.remove(entry_path + extension)
+
+def evict_stale_entries() -> int:
+    """
+    Remove every cache entry whose source file changed or no longer exists.
+
+    Returns:
+        int: Number of evicted entries.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    evicted = 0
+    for filename in os.listdir(CACHE_DIR):
+        if not filename.endswith('.json'):
+            continue
+        entry_path = os.path.join(CACHE_DIR, filename[:-len('.json')])
+        try:
+            with open(entry_path + '.json', 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            fresh = is_entry_fresh(metadata, entry_path)
+        except (OSError, ValueError, KeyError):
+            fresh = False
+        if not fresh:
+            remove_entry(entry_path)
+            evicted += 1
+    return evicted
+
+def save_dataframe(dataframe: pd.DataFrame, entry_path: str) -> list:
+    """
+    Store a DataFrame in an uncompressed .npz archive, one 2D column block per dtype.
+
+    Returns:
+        list: Block layout as [column, block name, row in block] per column,
+              or None if the frame holds object columns, which are not cached.
+    """
+    if any(dtype == object for dtype in dataframe.dtypes):
+        return None
+
+    blocks = {}
+    layout = []
+    for col in dataframe.columns:
+        block_name = f'block_{dataframe[col].dtype.str.lstrip("<>|=")}'
+        blocks.setdefault(block_name, []).append(dataframe[col].to_numpy())
+        layout.append([col, block_name, len(blocks[block_name]) - 1])
+
+    arrays = {name: np.vstack(columns) for name, columns in blocks.items()}
+    arrays['__index__'] = dataframe.index.to_numpy()
+
+    temporary_path = entry_path + '.npz.tmp'
+    with open(temporary_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temporary_path, entry_path + '.npz')
+    return layout
+
+def load_dataframe(entry_path: str, layout: list) -> pd.DataFrame:
+    """
+    Load a DataFrame stored by save_dataframe().
+    """
+    with np.load(entry_path + '.npz', allow_pickle=False) as archive:
+        blocks = {name: archive[name] for name in archive.files if name != '__index__'}
+        index = archive['__index__']
+    data = {col: blocks[block_name][row] for col, block_name, row in layout}
+    return pd.DataFrame(data, index=index, columns=[col for col, _, _ in layout], copy=False)
+
+def cached_load(filepath: str, loader, *loader_args) -> pd.DataFrame:
+    """
+    Return loader(filepath, *loader_args), served from the cache when the source file is unchanged.
+
+    Args:
+        filepath (str): Path to the source CSV file.
+        loader (callable): Function that parses and preprocesses the file.
+        *loader_args: Extra arguments to the loader, part of the cache key.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
+    if MEMORY_CACHE_ENABLED:
+        key = (os.path.abspath(filepath), loader.__name__, json.dumps(list(loader_args)))
+        stat = os.stat(filepath)
+        entry = MEMORY_ENTRIES.get(key)
+        if entry is not None and not REBUILD_CACHE and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            return entry[2].copy()
+
+        dataframe = load_from_disk_cache(filepath, loader, *loader_args)
+        MEMORY_ENTRIES[key] = (stat.st_size, stat.st_mtime_ns, dataframe)
+        return dataframe.copy()
+
+    return load_from_disk_cache(filepath, loader, *loader_args)
+
+def load_from_disk_cache(filepath: str, loader, *loader_args) -> pd.DataFrame:
+    """
+    The on-disk part of cached_load(), loading without the cache if it is disabled.
+    """
+    if not CACHE_ENABLED:
+        return loader(filepath, *loader_args)
+
+    entry_path = get_entry_path(filepath, loader.__name__, loader_args)
+
+    if not REBUILD_CACHE and os.path.exists(entry_path + '.json'):
+        try:
+            with open(entry_path + '.json', 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if is_entry_fresh(metadata, entry_path):
+                return load_dataframe(entry_path, metadata['layout'])
+        except (OSError, ValueError, KeyError):
+            pass
+        remove_entry(entry_path)
+
+    source = describe_source(filepath)
+    dataframe = loader(filepath, *loader_args)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    layout = save_dataframe(dataframe, entry_path)
+    if layout is not None:
+        metadata = {
+            'format_version': CACHE_FORMAT_VERSION,
+            'loader': loader.__name__,
+            'loader_args': list(loader_args),
+            'source': source,
+            'layout': layout,
+        }
+        write_metadata(entry_path, metadata)
+
+    return dataframe
@@ -0,0 +1,97 @@
+import numpy as np
+
+DOWNSAMPLING_METHODS = ['lttb', 'minmax']
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets.
+    The first and last point are kept, the points in between are split into max_points - 2 buckets and
+    every bucket keeps the point spanning the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves the visual shape of the line including its peaks.
+
+    Args:
+        x (np.ndarray): Sorted x values.
+        y (np.ndarray): y values, without NaN.
+        max_points (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points, all indices if there are at most max_points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    length = len(x)
+    if max_points >= length or max_points < 3:
+        return np.arange(length)
+
+    buckets = max_points - 2
+    # Bucket i covers edges[i]:edges[i + 1] of the points between the first and the last one
+    edges = (np.arange(buckets + 1) * ((length - 2) / buckets)).astype(int) + 1
+    edges[-1] = length - 1
+
+    # Mean of every bucket at once, the last point stands in as the bucket after the last one
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1:-1], edges[:-1] - 1) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1:-1], edges[:-1] - 1) / sizes, y[-1])
+
+    indices = np.empty(max_points, dtype=int)
+    indices[0] = 0
+    indices[-1] = length - 1
+    previous = 0
+    for bucket in range(buckets):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle area, the constant factor does not change the argmax
+        areas = np.abs((x[previous] - mean_x[bucket + 1]) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (mean_y[bucket + 1] - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
+
+def min_max_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of every bucket, an envelope that keeps every extreme of the line.
+
+    Args:
+        y (np.ndarray): y values, without NaN.
+        max_points (int): Number of points to keep, two per bucket.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points, all indices if there are at most max_points.
+    """
+    y = np.asarray(y, dtype=float)
+    length = len(y)
+    buckets = max_points // 2
+    if max_points >= length or buckets < 1:
+        return np.arange(length)
+
+    edges = (np.arange(buckets + 1) * (length / buckets)).astype(int)
+    edges[-1] = length
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+
+    # Sorted by bucket, then value, the first entry of a bucket is its minimum and the last its maximum
+    order = np.lexsort((y, bucket_ids))
+    return np.unique(np.concatenate((order[edges[:-1]], order[edges[1:] - 1])))
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb') -> tuple:
+    """
+    Reduce a line to at most max_points points for plotting.
+
+    Args:
+        x (np.ndarray): Sorted x values.
+        y (np.ndarray): y values, without NaN.
+        max_points (int): Point budget, None or 0 keeps every point.
+        method (str): 'lttb' or 'minmax'.
+
+    Returns:
+        tuple: The kept x and y values.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}', expected one of {DOWNSAMPLING_METHODS}")
+    if not max_points:
+        return x, y
+
+    if method == 'lttb':
+        indices = lttb_indices(x, y, max_points)
+    else:
+        indices = min_max_indices(y, max_points)
+    return x[indices], y[indices]
@@ -1,8 +1,17 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.colors import LinearSegmentedColormap, LogNorm
 import calendar
+import os
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+import downsampling
+from thumbnails import THUMBNAIL_FORMAT, get_thumbnail_path
 
 def load_variable_dict_from_file(file_path: str) -> dict:
     """
@@ -75,13 +84,473 @@ def calculate_trend(
 
     return trend_line_function
 
+# Named output settings for the rendered graphs:
+# dpi and PNG compression level (0-9) of the full image, extra vector copies and the width of the thumbnails (None skips them)
+RENDER_PROFILES = {
+    'draft': {'dpi': 100, 'compress_level': 1, 'vector_formats': [], 'thumbnail_width': None},
+    'web': {'dpi': 300, 'compress_level': 6, 'vector_formats': [], 'thumbnail_width': 480},
+    'publication': {'dpi': 300, 'compress_level': 9, 'vector_formats': ['pdf', 'svg'], 'thumbnail_width': None},
+}
+DEFAULT_RENDER_PROFILE = 'web'
+
+def save_image(image: Image.Image, file_path: str, file_format: str, **params) -> None:
+    """
+    Save an image through a temporary file, so an interrupted write never leaves a truncated graph behind.
+    """
+    temporary_path = file_path + '.tmp'
+    try:
+        image.save(temporary_path, format=file_format, **params)
+        os.replace(temporary_path, file_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def encode_graph(image: Image.Image, file_path: str, dpi: int, compress_level: int, thumbnail_width: int = None) -> None:
+    """
+    Encode a rendered graph as PNG and, if a width is given, as a thumbnail downscaled from the same pixels.
+    """
+    save_image(image, file_path, 'png', dpi=(dpi, dpi), compress_level=compress_level)
+
+    if thumbnail_width:
+        thumbnail_path = get_thumbnail_path(file_path)
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        image.thumbnail((thumbnail_width, thumbnail_width * image.height // image.width), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        save_image(image, thumbnail_path, THUMBNAIL_FORMAT, quality=80)
+
+class ImageWriter:
+    """
+    Encode and write rendered graphs on background threads, so the next graph is prepared and drawn while the
+    previous ones are compressed and written (zlib and the Pillow encoders release the GIL).
+    At most max_pending graphs wait for their encoding, submit() blocks until a slot frees up beyond that.
+    """
+
+    def __init__(self, threads: int = 2, max_pending: int = 4):
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='image-writer')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.pending = {}  # Future -> path of the graph it writes
+
+    def submit(self, file_path: str, write, *args) -> None:
+        """
+        Queue write(*args), waiting for a free slot first.
+        """
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(write, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        self.pending[future] = file_path
+
+    def flush(self) -> dict:
+        """
+        Wait for every queued graph.
+
+        Returns:
+            dict: Path -> error message of every graph that could not be written.
+        """
+        errors = {}
+        for future, file_path in list(self.pending.items()):
+            try:
+                future.result()
+            except Exception as e:
+                errors[file_path] = f"{type(e).__name__}: {e}"
+        self.pending.clear()
+        return errors
+
+    def close(self) -> dict:
+        errors = self.flush()
+        self.executor.shutdown()
+        return errors
+
+class PlotRenderer:
+    """
+    Render the per-variable plots on reusable figure templates.
+    The style assets are loaded once, and every plot kind keeps one laid out Figure/Axes on an Agg canvas
+    (no pyplot state), so rendering a variable only swaps the line, scatter and tick data before saving.
+    Every graph is laid out from the same initial margins, so its bytes do not depend on the graphs drawn before it.
+    Without template reuse every plot gets a new figure, which the caller may keep, e.g. to show it in the GUI.
+    """
+
+    def __init__(self,
+                 labels_path: str = 'assets/variable_labels.txt',
+                 colors_path: str = 'assets/variable_graph_colors.txt',
+                 dpi: int = None,
+                 profile: str = DEFAULT_RENDER_PROFILE,
+                 reuse_templates: bool = True):
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{profile}', expected one of {list(RENDER_PROFILES)}")
+        self.labels = load_variable_labels(labels_path)
+        self.colors = load_variable_graph_colors(colors_path)
+        self.profile_name = profile
+        self.profile = RENDER_PROFILES[profile]
+        self.dpi = dpi if dpi is not None else self.profile['dpi']
+        self.reuse_templates = reuse_templates
+        self.templates = {}
+
+    def get_label(self, variable: str) -> str:
+        return self.labels.get(variable, variable.capitalize())
+
+    def get_color(self, variable: str) -> str:
+        return self.colors.get(variable, 'black')
+
+    def get_output_paths(self, file_path: str) -> list:
+        """
+        Get every file written for a graph with this renderer's profile: the PNG, its vector copies and its thumbnail.
+        """
+        base_path = os.path.splitext(file_path)[0]
+        paths = [file_path] + [f'{base_path}.{file_format}' for file_format in self.profile['vector_formats']]
+        if self.profile['thumbnail_width']:
+            paths.append(get_thumbnail_path(file_path))
+        return paths
+
+    def get_template(self, kind: str) -> dict:
+        """
+        Get the figure template of a plot kind ('timeseries', 'correlation', 'density', 'density_marginals' or 'seasonal'),
+        created on first use.
+        """
+        if kind in self.templates:
+            return self.templates[kind]
+
+        # Figures that are not reused are laid out whenever they are drawn, e.g. at the size of a GUI canvas
+        figure = Figure(figsize=(10, 6), dpi=self.dpi, layout=None if self.reuse_templates else 'tight')
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.grid(True)
+        template = {'figure': figure, 'axes': axes}
+
+        if kind == 'timeseries':
+            template['data_line'], = axes.plot([], [])
+            template['trend_line'], = axes.plot([], [], linestyle='--', color='gray')
+            axes.set_xlabel('Date')
+            axes.tick_params(axis='x', labelrotation=45)
+        elif kind == 'correlation':
+            template['points'] = axes.scatter([], [], marker='.')
+            template['trend_line'], = axes.plot([], [], linestyle='--', color='gray')
+        elif kind in ('density', 'density_marginals'):
+            # Binned counts drawn as one image, optionally with the marginal histograms above and to the right
+            if kind == 'density_marginals':
+                figure.delaxes(axes)
+                grid = figure.add_gridspec(2, 2, width_ratios=(4, 1), height_ratios=(1, 4))
+                axes = figure.add_subplot(grid[1, 0])
+                axes.grid(True)
+                template['axes'] = axes
+                template['top_axes'] = figure.add_subplot(grid[0, 0], sharex=axes)
+                template['right_axes'] = figure.add_subplot(grid[1, 1], sharey=axes)
+                template['top_axes'].tick_params(axis='x', labelbottom=False)
+                template['right_axes'].tick_params(axis='y', labelleft=False)
+                template['top_histogram'] = template['top_axes'].stairs([0], [0, 1], fill=True)
+                template['right_histogram'] = template['right_axes'].stairs([0], [0, 1], fill=True, orientation='horizontal')
+            template['image'] = axes.imshow(np.zeros((1, 1)), origin='lower', aspect='auto', interpolation='nearest', norm=LogNorm())
+            template['trend_line'], = axes.plot([], [], linestyle='--', color='gray')
+        elif kind == 'seasonal':
+            template['data_line'], = axes.plot([], [], marker='o')
+            axes.set_xlabel('Month')
+            axes.tick_params(axis='x', labelrotation=45)
+        else:
+            raise ValueError(f"Unknown plot kind '{kind}'")
+
+        # View of the empty axes, restored for graphs without finite data, see rescale()
+        template['empty_view'] = (template['axes'].get_xlim(), template['axes'].get_ylim())
+        template['margins'] = {name: getattr(figure.subplotpars, name) for name in ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')}
+        if self.reuse_templates:
+            self.templates[kind] = template
+        return template
+
+    def rescale(self, template: dict, points: np.ndarray = None) -> None:
+        """
+        Fit the view to the current line data, plus scatter points which relim() does not see.
+        Without finite data the view of the empty template is restored, autoscale_view() would keep the previous graph's.
+        """
+        axes = template['axes']
+        axes.relim()
+        if points is not None:
+            axes.update_datalim(points[np.isfinite(points).all(axis=1)])
+        if np.isfinite(axes.dataLim.get_points()).all():
+            axes.autoscale_view()
+        else:
+            x_limits, y_limits = template['empty_view']
+            axes.set_xlim(x_limits, auto=None)  # Keep autoscaling on for the next graph
+            axes.set_ylim(y_limits, auto=None)
+
+    def save(self, template: dict, file_path: str) -> Figure:
+        """
+        Lay out, draw and write a template as PNG.
+        With file_path None the figure is only finished, not drawn or written.
+
+        Returns:
+            Figure: The figure of the template.
+        """
+        figure = template['figure']
+        axes = template['axes']
+        if axes.get_legend_handles_labels()[0]:
+            axes.legend()
+        elif axes.get_legend() is not None:
+            axes.get_legend().remove()
+
+        if file_path is None:
+            return figure
+
+        # The layout of the previous graph would shift the tick locations and thereby this graph's layout,
+        # start from the margins of a new figure like a serial run, a --jobs worker or a partial re-render does
+        figure.subplots_adjust(**template['margins'])
+        figure.tight_layout()
+        figure.canvas.draw()
+
+        self.write(figure, file_path, drawn=True)
+        return figure
+
+    def write(self, figure: Figure, file_path: str, drawn: bool = False) -> None:
+        """
+        Write a figure as PNG, plus the vector copies and the thumbnail of the render profile.
+
+        Args:
+            figure (Figure): Figure on an Agg canvas, e.g. a template.
+            file_path (str): Path of the PNG.
+            drawn (bool): The canvas was already drawn at this renderer's dpi.
+        """
+        if not drawn:
+            figure.set_dpi(self.dpi)
+            figure.canvas.draw()
+
+        # The figure background is opaque, RGB encodes faster and smaller than RGBA.
+        # The conversion also copies the pixels out of the canvas, which the next graph draws into.
+        image = Image.frombuffer('RGBA', figure.canvas.get_width_height(), figure.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).convert('RGB')
+        encode_arguments = (image, file_path, self.dpi, self.profile['compress_level'], self.profile['thumbnail_width'])
+        if IMAGE_WRITER is None:
+            encode_graph(*encode_arguments)
+        else:
+            IMAGE_WRITER.submit(file_path, encode_graph, *encode_arguments)
+
+        # Vector copies are written from the figure itself, before it is reused
+        base_path = os.path.splitext(file_path)[0]
+        for file_format in self.profile['vector_formats']:
+            figure.savefig(f'{base_path}.{file_format}', format=file_format)
+
+    def render_timeseries(self, data: pd.DataFrame, variable: str, file_path: str,
+                          marker_threshold: int = 50, max_labels: int = 15, use_years: bool = False,
+                          max_points: int = None, downsampling_method: str = 'lttb') -> Figure:
+        template = self.get_template('timeseries')
+        axes = template['axes']
+
+        label = self.get_label(variable)
+        numeric_dates = mdates.date2num(data['date'])
+        trend_line_function = calculate_trend(data, 'date', variable)  # Fitted on every point, only the drawn line is downsampled
+
+        data_line = template['data_line']
+        data_line.set_data(*downsampling.downsample(numeric_dates, data[variable].to_numpy(dtype=float), max_points, downsampling_method))
+        data_line.set_color(self.get_color(variable))
+        data_line.set_marker('.' if len(data) <= marker_threshold else 'None')  # Use markers for small datasets
+        data_line.set_label(label)
+
+        template['trend_line'].set_data(numeric_dates, trend_line_function(numeric_dates))
+        template['trend_line'].set_label(f'{label} Trend')
+
+        axes.set_ylabel(label)
+        axes.set_title(f"{label} over time")
+        self.rescale(template)
+
+        if use_years:
+            # Use years only for x labels, but limit to max_labels
+            years = pd.to_datetime(data['date']).dt.year
+            unique_years = np.sort(years.unique())
+            step = max(1, len(unique_years) // max_labels)
+            selected_years = unique_years[::step]
+            xticks = [data['date'][years[years == y].index[0]] for y in selected_years]
+            axes.set_xticks(mdates.date2num(xticks), [str(y) for y in selected_years])
+        else:
+            # Use normal dates with max label rule
+            step = max(1, len(data) // max_labels)
+            axes.set_xticks(numeric_dates[::step])
+            axes.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+
+        return self.save(template, file_path)
+
+    def render_correlation(self, data: pd.DataFrame, x_variable: str, y_variable: str, file_path: str,
+                           max_labels: int = 15, density_threshold: int = None, bins: int = 100,
+                           show_trend: bool = True, show_marginals: bool = True) -> Figure:
+        x_variable_label = self.get_label(x_variable)
+        y_variable_label = self.get_label(y_variable)
+        if x_variable not in data.columns:
+            raise ValueError(f"Variable '{x_variable}' not found in the data.")
+        alpha = 0.25 if len(data) > 1000 else 1.0  # Adjust alpha for large datasets
+        data = data[data[x_variable] != 0]  # Remove zero values for better correlation
+
+        # Add check for empty data after filtering
+        if data.empty or data[y_variable].dropna().empty or data[x_variable].dropna().empty:
+            print(f"Skipping correlation plot for '{x_variable}' due to insufficient data after filtering.")
+            return
+
+        if density_threshold and len(data) > density_threshold:
+            return self.render_density(data, x_variable, y_variable, file_path, max_labels=max_labels, bins=bins,
+                                       show_trend=show_trend, show_marginals=show_marginals)
+
+        template = self.get_template('correlation')
+        axes = template['axes']
+
+        points = np.column_stack((data[x_variable].to_numpy(dtype=float), data[y_variable].to_numpy(dtype=float)))
+        template['points'].set_offsets(points)
+        template['points'].set_color(self.get_color(x_variable))
+        template['points'].set_alpha(alpha)
+        template['points'].set_label(y_variable_label)
+
+        min_value = data[x_variable].min()
+        max_value = data[x_variable].max()
+        xticks = np.linspace(min_value, max_value, num=max_labels)
+
+        trend_line_function = calculate_trend(data, x_variable, y_variable)
+        template['trend_line'].set_data(xticks, trend_line_function(xticks))
+        template['trend_line'].set_label(f'{y_variable_label} Trend')
+
+        axes.set_xlabel(x_variable_label)
+        axes.set_ylabel(y_variable_label)
+        axes.set_title(f"{y_variable_label} vs {x_variable_label}")
+        self.rescale(template, points)
+        axes.set_xticks(xticks, [f"{x:.2f}" for x in xticks])
+
+        return self.save(template, file_path)
+
+    def render_density(self, data: pd.DataFrame, x_variable: str, y_variable: str, file_path: str,
+                       max_labels: int = 15, bins: int = 100, show_trend: bool = True, show_marginals: bool = True) -> Figure:
+        """
+        Render a correlation as a 2D histogram instead of one marker per point.
+        The points are binned with NumPy first, so drawing costs the same for any number of points.
+        """
+        x_variable_label = self.get_label(x_variable)
+        y_variable_label = self.get_label(y_variable)
+        data = data.dropna(subset=[x_variable, y_variable])
+        x_values = data[x_variable].to_numpy(dtype=float)
+        y_values = data[y_variable].to_numpy(dtype=float)
+
+        template = self.get_template('density_marginals' if show_marginals else 'density')
+        axes = template['axes']
+        color = self.get_color(x_variable)
+
+        counts, x_edges, y_edges = np.histogram2d(x_values, y_values, bins=bins)
+        image = template['image']
+        image.set_data(np.ma.masked_equal(counts.T, 0))  # Empty bins stay transparent
+        image.set_extent((x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+        colormap = LinearSegmentedColormap.from_list(f'{x_variable}_density', ['#f2f2f2', color])
+        colormap.set_bad(alpha=0)
+        image.set_cmap(colormap)
+        image.set_clim(1, max(counts.max(), 2))
+
+        min_value = x_edges[0]
+        max_value = x_edges[-1]
+        xticks = np.linspace(min_value, max_value, num=max_labels)
+
+        trend_line = template['trend_line']
+        trend_line.set_visible(show_trend)
+        trend_line.set_label(f'{y_variable_label} Trend' if show_trend else '_nolegend_')
+        if show_trend:
+            trend_line_function = calculate_trend(data, x_variable, y_variable)
+            trend_line.set_data(xticks, trend_line_function(xticks))
+
+        if show_marginals:
+            # The marginal histograms are the row and column sums of the 2D histogram
+            x_counts = counts.sum(axis=1)
+            y_counts = counts.sum(axis=0)
+            template['top_histogram'].set_data(x_counts, x_edges)
+            template['right_histogram'].set_data(y_counts, y_edges)
+            template['top_histogram'].set_color(color)
+            template['right_histogram'].set_color(color)
+            template['top_axes'].set_ylim(0, x_counts.max() * 1.05)
+            template['right_axes'].set_xlim(0, y_counts.max() * 1.05)
+
+        axes.set_xlabel(x_variable_label)
+        axes.set_ylabel(y_variable_label)
+        title = f"{y_variable_label} vs {x_variable_label} ({len(data)} points)"
+        (template['top_axes'] if show_marginals else axes).set_title(title)
+        axes.set_xlim(x_edges[0], x_edges[-1])
+        axes.set_ylim(y_edges[0], y_edges[-1])
+        axes.set_xticks(xticks, [f"{x:.2f}" for x in xticks])
+
+        return self.save(template, file_path)
+
+    def render_seasonal(self, data: pd.DataFrame, variable: str, file_path: str) -> Figure:
+        template = self.get_template('seasonal')
+        axes = template['axes']
+
+        label = self.get_label(variable)
+        monthly_means = data.sort_values('month')
+
+        data_line = template['data_line']
+        data_line.set_data(monthly_means['month'].to_numpy(), monthly_means[variable].to_numpy())
+        data_line.set_color(self.get_color(variable))
+        data_line.set_label(label)
+
+        axes.set_ylabel(label)
+        axes.set_title(f"Seasonal Correlation of {label}")
+        self.rescale(template)
+
+        # Use month names for x-tick labels
+        axes.set_xticks(monthly_means['month'].to_numpy(), [calendar.month_name[month] for month in monthly_means['month']])
+
+        return self.save(template, file_path)
+
+# Set through configure_image_writer(), None encodes every graph before returning
+IMAGE_WRITER = None
+
+def configure_image_writer(threads: int = 2, max_pending: int = 4) -> dict:
+    """
+    Encode graphs on background threads from now on, or synchronously again with threads=0.
+    Graphs still queued on a previous writer are written first.
+
+    Args:
+        threads (int): Encoder threads.
+        max_pending (int): Most rendered graphs waiting for an encoder before rendering blocks.
+
+    Returns:
+        dict: Path -> error message of graphs of the previous writer that could not be written.
+    """
+    global IMAGE_WRITER
+    errors = IMAGE_WRITER.close() if IMAGE_WRITER is not None else {}
+    IMAGE_WRITER = ImageWriter(threads, max_pending) if threads > 0 else None
+    return errors
+
+def flush_images() -> dict:
+    """
+    Wait until every rendered graph is written.
+
+    Returns:
+        dict: Path -> error message of every graph that could not be written.
+    """
+    return IMAGE_WRITER.flush() if IMAGE_WRITER is not None else {}
+
+# Created on first use in every process, see get_plot_renderer()
+PLOT_RENDERER = None
+RENDER_PROFILE = DEFAULT_RENDER_PROFILE
+
+def configure_render_profile(profile: str = DEFAULT_RENDER_PROFILE) -> None:
+    """
+    Select the render profile of this process's PlotRenderer, see RENDER_PROFILES.
+    """
+    global RENDER_PROFILE, PLOT_RENDERER
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{profile}', expected one of {list(RENDER_PROFILES)}")
+    if profile != RENDER_PROFILE:
+        RENDER_PROFILE = profile
+        PLOT_RENDERER = None
+
+def get_plot_renderer() -> PlotRenderer:
+    """
+    Get this process's PlotRenderer, so the assets are loaded and the templates built only once.
+    """
+    global PLOT_RENDERER
+    if PLOT_RENDERER is None:
+        PLOT_RENDERER = PlotRenderer(profile=RENDER_PROFILE)
+    return PLOT_RENDERER
+
 def plot_timeseries(
     data: pd.DataFrame,
     variable: str,
     path: str,
     marker_threshold: int = 50,
     max_labels: int = 15,
-    use_years: bool = False
+    use_years: bool = False,
+    max_points: int = None,
+    downsampling_method: str = 'lttb'
 ) -> None:
     """
     Plot the time series and trend line for a given variable.
@@ -93,57 +562,28 @@ def plot_timeseries(
         path (str): Output directory for the plot.
         marker_threshold (int): Max number of points to use markers for.
         max_labels (int): Max number of x-axis labels.
+        use_years (bool): Label the x-axis with years only.
+        max_points (int): Most points drawn for the line, longer series are downsampled (None or 0 draws every point).
+                          The trend line is always fitted on every point.
+        downsampling_method (str): 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (min/max envelope per bucket).
 
     Returns:
         None
     """
-    plt.figure(figsize=(10, 6))
-
-    label = get_variable_label(variable)
-    marker_style = '.' if len(data) <= marker_threshold else None  # Use markers for small datasets
-    color = get_variable_color(variable)
-
-    plt.plot(data['date'], data[variable], marker=marker_style, label=label, color=color)
-
-    numeric_dates = mdates.date2num(data['date'])
-    trend_line_function = calculate_trend(data, 'date', variable)
-    plt.plot(data['date'], trend_line_function(numeric_dates), linestyle='--', color='gray', label=f'{label} Trend')
-
-    plt.xlabel('Date')
-    plt.ylabel(label)
-    plt.title(f"{label} over time")
-
-    if use_years:
-        # Use years only for x labels, but limit to max_labels
-        years = pd.to_datetime(data['date']).dt.year
-        unique_years = np.sort(years.unique())
-        step = max(1, len(unique_years) // max_labels)
-        selected_years = unique_years[::step]
-        xticks = [data['date'][years[years == y].index[0]] for y in selected_years]
-        plt.xticks(
-            xticks,
-            [str(y) for y in selected_years],
-            rotation=45
-        )
-    else:
-        # Use normal dates with max label rule
-        step = max(1, len(data) // max_labels)
-        xticks = data['date'][::step]
-        plt.xticks(xticks, rotation=45)
-
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-
-    plt.savefig(path + f'{variable}_timeseries.png', dpi=300)
-    plt.close()
+    get_plot_renderer().render_timeseries(data, variable, path + f'{variable}_timeseries.png',
+                                          marker_threshold=marker_threshold, max_labels=max_labels, use_years=use_years,
+                                          max_points=max_points, downsampling_method=downsampling_method)
 
 def plot_correlation(
     data: pd.DataFrame,
     x_variable: str,
     y_variable: str,
     path: str,
-    max_labels: int = 15
+    max_labels: int = 15,
+    density_threshold: int = None,
+    density_bins: int = 100,
+    show_trend: bool = True,
+    show_marginals: bool = True
 ) -> None:
     """
     Plot the correlation between a variable and lake level.
@@ -151,49 +591,69 @@ def plot_correlation(
 
     Args:
         data (pd.DataFrame): DataFrame containing the data.
-        variable (str): Variable to correlate with lake level.
+        x_variable (str): Variable to correlate with the y variable.
+        y_variable (str): Variable on the y-axis.
         path (str): Output directory for the plot.
         max_labels (int): Max number of x-axis labels.
+        density_threshold (int): Above this many points the plot is drawn as a 2D histogram instead of a scatter plot
+                                 (None or 0 always draws a scatter plot).
+        density_bins (int): Number of bins per axis of the 2D histogram.
+        show_trend (bool): Draw the trend line over the 2D histogram.
+        show_marginals (bool): Draw histograms of both variables next to the 2D histogram.
 
     Returns:
         None
     """
-    plt.figure(figsize=(10, 6))
+    get_plot_renderer().render_correlation(data, x_variable, y_variable, path + f'{x_variable}_correlation.png', max_labels=max_labels,
+                                           density_threshold=density_threshold, bins=density_bins,
+                                           show_trend=show_trend, show_marginals=show_marginals)
 
-    x_variable_label = get_variable_label(x_variable)
-    y_variable_label = get_variable_label(y_variable)
-    color = get_variable_color(x_variable)
-    if x_variable not in data.columns:
-        raise ValueError(f"Variable '{x_variable}' not found in the data.")
-    alpha = 0.25 if len(data) > 1000 else 1.0  # Adjust alpha for large datasets
-    data = data[data[x_variable] != 0]  # Remove zero values for better correlation
-    variable_values = data[x_variable]
+def plot_cross_correlation(
+    lags: np.ndarray,
+    correlations: np.ndarray,
+    x_variable: str,
+    y_variable: str,
+    path: str
+) -> None:
+    """
+    Plot a cross-correlogram: the correlation of a variable with a lagged y variable at every lag.
+
+    Args:
+        lags (np.ndarray): Lags in days, positive lags mean the x variable leads.
+        correlations (np.ndarray): Correlation at every lag, NaN where it could not be computed.
+        x_variable (str): Name of the x variable.
+        y_variable (str): Name of the y variable.
+        path (str): Output directory for the plot.
 
-    # Add check for empty data after filtering
-    if data.empty or data[y_variable].dropna().empty or variable_values.dropna().empty:
-        print(f"Skipping correlation plot for '{x_variable}' due to insufficient data after filtering.")
-        return
+    Returns:
+        None
+    """
+    figure = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
 
-    plt.scatter(variable_values, data[y_variable], marker='.', color=color, label=y_variable_label, alpha=alpha)
+    renderer = get_plot_renderer()
+    x_variable_label = renderer.get_label(x_variable)
+    y_variable_label = renderer.get_label(y_variable)
 
-    min_value = data[x_variable].min()
-    max_value = data[x_variable].max()
-    xticks = np.linspace(min_value, max_value, num=max_labels)
-    plt.xticks(xticks, [f"{x:.2f}" for x in xticks])
+    axes.plot(lags, correlations, color=renderer.get_color(x_variable), label=x_variable_label)
+    axes.axhline(0, linestyle='--', color='gray')
+    axes.axvline(0, linestyle=':', color='gray')
 
-    trend_line_function = calculate_trend(data, x_variable, y_variable)
-    plt.plot(xticks, trend_line_function(xticks), linestyle='--', color='gray', label=f'{y_variable_label} Trend')
+    if not np.all(np.isnan(correlations)):
+        best = int(np.nanargmax(np.abs(correlations)))
+        axes.scatter([lags[best]], [correlations[best]], color='black', zorder=3,
+                     label=f'Best lag: {lags[best]} days (r = {correlations[best]:.2f})')
 
-    plt.xlabel(x_variable_label)
-    plt.ylabel(y_variable_label)
-    plt.title(f"{y_variable_label} vs {x_variable_label}")
+    axes.set_xlabel(f'Lag (days, positive: {x_variable_label} leads)')
+    axes.set_ylabel('Correlation')
+    axes.set_title(f"Lagged Correlation of {y_variable_label} and {x_variable_label}")
 
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
+    axes.grid(True)
+    axes.legend()
+    figure.tight_layout()
 
-    plt.savefig(path + f'{x_variable}_correlation.png', dpi=300)
-    plt.close()
+    renderer.write(figure, path + f'{x_variable}_cross_correlation.png')
 
 def plot_seasonal_correlation(
     data: pd.DataFrame,
@@ -201,39 +661,89 @@ def plot_seasonal_correlation(
     path: str
 ) -> None:
     """
-    Plot the seasonal (monthly) average of lake level.
+    Plot the seasonal (monthly) average of a variable.
     Note: The 'lakelevel' column is always sourced from data/lakelevel_data.csv.
 
     Args:
-        data (pd.DataFrame): DataFrame containing the data.
+        data (pd.DataFrame): Month-of-year means with a 'month' (1 to 12) and a variable column,
+                             e.g. the 'month_of_year' level of aggregates.build_aggregate_pyramid().
+        variable (str): Variable to plot.
         path (str): Output directory for the plot.
 
     Returns:
         None
     """
-    label = get_variable_label(variable)
+    get_plot_renderer().render_seasonal(data, variable, path + f'{variable}_seasonal_correlation.png')
 
-    plt.figure(figsize=(10, 6))
+def plot_backtest(
+    data: pd.DataFrame,
+    path: str
+) -> None:
+    """
+    Plot the forecast error of every backtest origin, one line per forecast horizon.
 
-    # Ensure 'date' column is datetime
-    if not np.issubdtype(data['date'].dtype, np.datetime64):
-        data['date'] = pd.to_datetime(data['date'], errors='coerce')
+    Args:
+        data (pd.DataFrame): Backtest table with 'origin_date', 'horizon_years' and 'error' columns.
+        path (str): Output directory for the plot.
 
-    data['month'] = data['date'].dt.month  # Extract month from date
-    monthly_means = data.groupby('month')[variable].mean().reset_index()  # Mean lake level per month
+    Returns:
+        None
+    """
+    figure = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+
+    for horizon, horizon_data in data.groupby('horizon_years'):
+        mean_absolute_error = horizon_data['error'].abs().mean()
+        axes.plot(horizon_data['origin_date'], horizon_data['error'], marker='.', linestyle='-',
+                  label=f'{horizon} year forecast (MAE {mean_absolute_error:.2f} m)')
 
-    plt.plot(monthly_means['month'], monthly_means[variable], marker='o', color=get_variable_color(variable), label=label)
+    axes.axhline(0, linestyle='--', color='gray')
 
-    # Use month names for x-tick labels
-    plt.xticks(monthly_means['month'], monthly_means['month'].apply(lambda x: calendar.month_name[x]), rotation=45)
+    axes.set_xlabel('Forecast Origin')
+    axes.set_ylabel('Forecast Error (m)')
+    axes.set_title("Lake Level Forecast Backtest")
 
-    plt.xlabel('Month')
-    plt.ylabel(label)
-    plt.title(f"Seasonal Correlation of {label}")
+    axes.grid(True)
+    axes.legend()
+    figure.tight_layout()
 
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
+    figure.savefig(path + 'lake_level_backtest.png', dpi=300)
 
-    plt.savefig(path + f'{variable}_seasonal_correlation.png', dpi=300)
-    plt.close()
\ No newline at end of file
+def plot_correlation_matrix(
+    matrix: np.ndarray,
+    variables: list,
+    title: str,
+    path: str,
+    filename: str
+) -> None:
+    """
+    Plot a correlation matrix as a heatmap, in the given (e.g. cluster) order of the variables.
+
+    Args:
+        matrix (np.ndarray): Square correlation matrix, NaN where no correlation could be computed.
+        variables (list): Variable names in matrix order.
+        title (str): Title of the plot.
+        path (str): Output directory for the plot.
+        filename (str): File name of the plot.
+
+    Returns:
+        None
+    """
+    size = min(30, max(8, len(variables) * 0.15))
+    font_size = min(10, max(3, 400 / max(1, len(variables))))
+    figure = Figure(figsize=(size + 2, size))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+
+    image = axes.imshow(np.ma.masked_invalid(matrix), cmap='coolwarm', vmin=-1, vmax=1, interpolation='nearest')
+    figure.colorbar(image, ax=axes, fraction=0.046, pad=0.04, label='Correlation')
+
+    renderer = get_plot_renderer()
+    labels = [renderer.get_label(variable) for variable in variables]
+    axes.set_xticks(range(len(labels)), labels, rotation=90, fontsize=font_size)
+    axes.set_yticks(range(len(labels)), labels, fontsize=font_size)
+    axes.set_title(title)
+    figure.tight_layout()
+
+    figure.savefig(path + filename, dpi=300)
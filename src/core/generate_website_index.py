@@ -2,6 +2,8 @@ import os
 import json
 import csv
 
+from thumbnails import get_thumbnail_path
+
 BASE_DIR = 'output'
 TIMESERIES_DIR = os.path.join(BASE_DIR, 'timeseries_graphs')
 SEASONAL_DIR = os.path.join(BASE_DIR, 'seasonal_graphs')
@@ -46,12 +48,20 @@ def get_csv_source(filename):
     # Lookup in mapping, default to 'unknown'
     return CSV_SOURCE_MAP.get(var.lower(), 'unknown')
 
+def describe_png(directory, f):
+    entry = {
+        'path': os.path.join(directory, f).replace('\\', '/'),
+        'csv_source': get_csv_source(f)
+    }
+    # Thumbnails only exist for graphs rendered with the web profile
+    thumbnail_path = get_thumbnail_path(os.path.join(directory, f))
+    if os.path.exists(thumbnail_path):
+        entry['thumbnail'] = thumbnail_path.replace('\\', '/')
+    return entry
+
 def list_pngs_with_source(directory):
     return [
-        {
-            'path': os.path.join(directory, f).replace('\\', '/'),
-            'csv_source': get_csv_source(f)
-        }
+        describe_png(directory, f)
         for f in os.listdir(directory)
         if f.lower().endswith('.png')
     ]
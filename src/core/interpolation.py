@@ -0,0 +1,96 @@
+import numpy as np
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+def get_gap_lengths(times: np.ndarray, reading_times: np.ndarray) -> np.ndarray:
+    """
+    Length of the gap every timestamp lies in: the time between the readings before and after it,
+    or the distance to the nearest reading when there is one on one side only.
+
+    Args:
+        times (np.ndarray): int64 timestamps of the missing rows.
+        reading_times (np.ndarray): Sorted int64 timestamps of the readings.
+
+    Returns:
+        np.ndarray: Gap lengths in nanoseconds as floats.
+    """
+    after = np.searchsorted(reading_times, times, side='right')
+    previous = reading_times[np.maximum(after - 1, 0)].astype(np.float64)
+    following = reading_times[np.minimum(after, len(reading_times) - 1)].astype(np.float64)
+    times = times.astype(np.float64)
+    previous = np.where(after > 0, previous, times)
+    following = np.where(after < len(reading_times), following, times)
+    return following - previous
+
+def interpolate_time(times: np.ndarray, values: np.ndarray, max_gap: float = np.inf) -> np.ndarray:
+    """
+    Interpolate the missing values of one column linearly in time, like Series.interpolate(method='time').
+    Rows before the first reading (in row order) stay missing, rows past the last reading in time take that reading.
+    Only the rows from the first reading on are touched, and gaps longer than max_gap are left missing.
+
+    Args:
+        times (np.ndarray): int64 timestamps of the rows, NaT as its int64 value like pandas.
+        values (np.ndarray): Float values, NaN where missing.
+        max_gap (float): Longest gap in nanoseconds to fill, np.inf fills every gap.
+
+    Returns:
+        np.ndarray: Interpolated copy of the values.
+    """
+    values = np.array(values, dtype=np.float64)
+    readings = np.flatnonzero(~np.isnan(values))
+    if len(readings) == 0 or len(readings) == len(values):
+        return values
+
+    span = slice(readings[0], len(values))
+    missing = np.flatnonzero(np.isnan(values[span])) + readings[0]
+    if len(missing) == 0:
+        return values
+
+    order = np.argsort(times[readings], kind='stable')
+    reading_times = times[readings][order]
+    filled = np.interp(times[missing], reading_times, values[readings][order])
+
+    if max_gap != np.inf:
+        filled[get_gap_lengths(times[missing], reading_times) > max_gap] = np.nan
+    values[missing] = filled
+    return values
+
+def interpolate_columns(times: np.ndarray, values: np.ndarray, max_gaps: list = None) -> np.ndarray:
+    """
+    interpolate_time() of every column of a 2D array, columns without missing values are left alone.
+
+    Args:
+        times (np.ndarray): int64 timestamps of the rows.
+        values (np.ndarray): Float values of shape (rows, columns).
+        max_gaps (list): Max gap in nanoseconds per column, None fills every gap.
+
+    Returns:
+        np.ndarray: Interpolated copy of the values.
+    """
+    values = np.array(values, dtype=np.float64)
+    for j in np.flatnonzero(np.isnan(values).any(axis=0)):
+        values[:, j] = interpolate_time(times, values[:, j], np.inf if max_gaps is None else max_gaps[j])
+    return values
+
+def parse_max_gap_days(specs: list) -> dict:
+    """
+    Parse max gap settings like ['30', 'chlorophyll a=400'], a number for every variable and variable=number overrides.
+
+    Returns:
+        dict: Variable -> max gap in days, None holds the default for all other variables. Empty if specs is None.
+    """
+    max_gap_days = {}
+    for spec in specs or []:
+        variable, separator, days = spec.rpartition('=')
+        try:
+            max_gap_days[variable.strip().lower() if separator else None] = float(days)
+        except ValueError:
+            raise ValueError(f"Invalid max gap '{spec}', expected days or variable=days.") from None
+    return max_gap_days
+
+def get_max_gap(max_gap_days: dict, variable: str) -> float:
+    """
+    Max gap of a variable in nanoseconds from parse_max_gap_days(), np.inf if none applies.
+    """
+    days = max_gap_days.get(variable, max_gap_days.get(None))
+    return np.inf if days is None or days <= 0 else days * NANOSECONDS_PER_DAY
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+class LakeDataset:
+    """
+    Several measurement sources (e.g. physical, chemical, biological and lake level data) on one shared, sorted date axis.
+    Every variable of every source is stored as one contiguous array over the whole axis, NaN where the source has no
+    reading, together with its validity mask and the rows each source has. Values, masks and date windows are handed out
+    as views of these arrays, so graphs and analyses read the sources without merging or copying DataFrames.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: dict, source_rows: dict):
+        """
+        Args:
+            dates (np.ndarray): Sorted, unique datetime64[ns] axis.
+            columns (dict): Source -> {variable -> values over the axis}, in source priority order.
+            source_rows (dict): Source -> boolean mask of the rows the source has a reading for.
+        """
+        self.dates = dates
+        self.columns = columns
+        self.source_rows = source_rows
+        self.masks = {source: {variable: ~np.isnan(values) for variable, values in variables.items()}
+                      for source, variables in columns.items()}
+
+    @classmethod
+    def from_frames(cls, frames: dict, dtype=np.float64) -> 'LakeDataset':
+        """
+        Put several sources onto one date axis, the union of their dates.
+        Readings of a source on the same date are averaged, like correlation.align_datasets() did.
+
+        Args:
+            frames (dict): Source name -> DataFrame with a 'date' column and numeric variable columns.
+                           Earlier sources take priority when several have the same variable, see source_of().
+            dtype: Storage type of the values, np.float32 halves the memory of wide sources.
+
+        Returns:
+            LakeDataset: The aligned sources.
+        """
+        grouped = {}
+        for source, frame in frames.items():
+            frame = frame.dropna(subset=['date'])
+            variables = [col for col in frame.columns if col != 'date']
+            if frame['date'].duplicated().any():
+                frame = frame.groupby('date', as_index=False)[variables].mean(numeric_only=True)
+            grouped[source] = frame
+
+        all_dates = [frame['date'].to_numpy(dtype='datetime64[ns]') for frame in grouped.values()]
+        dates = np.unique(np.concatenate(all_dates)) if all_dates else np.array([], dtype='datetime64[ns]')
+
+        columns = {}
+        source_rows = {}
+        for (source, frame), frame_dates in zip(grouped.items(), all_dates):
+            positions = np.searchsorted(dates, frame_dates)
+            rows = np.zeros(len(dates), dtype=bool)
+            rows[positions] = True
+            source_rows[source] = rows
+
+            columns[source] = {}
+            for variable in frame.columns:
+                if variable == 'date':
+                    continue
+                values = np.full(len(dates), np.nan, dtype=dtype)
+                values[positions] = pd.to_numeric(frame[variable], errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
+                columns[source][variable] = values
+
+        return cls(dates, columns, source_rows)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def sources(self) -> list:
+        return list(self.columns)
+
+    def get_variables(self, source: str = None) -> list:
+        """
+        Variables of one source, or of every source (each name once) in priority order.
+        """
+        if source is not None:
+            return list(self.columns[source])
+        return list(dict.fromkeys(variable for variables in self.columns.values() for variable in variables))
+
+    def source_of(self, variable: str) -> str:
+        """
+        First source, in the order the dataset was built from, that has the variable.
+        """
+        for source, variables in self.columns.items():
+            if variable in variables:
+                return source
+        raise KeyError(f"No variable '{variable}' in the dataset.")
+
+    def date_slice(self, start=None, end=None) -> slice:
+        """
+        Rows from start to end (both inclusive, None leaves the side open) as a slice of the axis.
+        """
+        first = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left'))
+        last = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right'))
+        return slice(first, last)
+
+    def get_values(self, variable: str, source: str = None, start=None, end=None) -> np.ndarray:
+        """
+        Values of a variable over the axis (or a date window of it), a view of the stored array.
+        """
+        source = source or self.source_of(variable)
+        return self.columns[source][variable][self.date_slice(start, end)]
+
+    def get_mask(self, variable: str, source: str = None, start=None, end=None) -> np.ndarray:
+        """
+        Validity mask of a variable over the axis (or a date window of it), a view of the stored mask.
+        """
+        source = source or self.source_of(variable)
+        return self.masks[source][variable][self.date_slice(start, end)]
+
+    def window(self, start=None, end=None) -> 'LakeDataset':
+        """
+        The dataset between two dates, sharing the arrays of this one.
+        """
+        rows = self.date_slice(start, end)
+        window = LakeDataset.__new__(LakeDataset)
+        window.dates = self.dates[rows]
+        window.columns = {source: {variable: values[rows] for variable, values in variables.items()} for source, variables in self.columns.items()}
+        window.masks = {source: {variable: mask[rows] for variable, mask in masks.items()} for source, masks in self.masks.items()}
+        window.source_rows = {source: mask[rows] for source, mask in self.source_rows.items()}
+        return window
+
+    def frame(self, source: str, variables: list = None) -> pd.DataFrame:
+        """
+        A DataFrame of the rows of one source, for code that needs pandas.
+        Variables the source does not have are taken from the first other source that has them, at the rows of this
+        source, like a left merge onto it.
+
+        Args:
+            source (str): Source whose rows (dates) make up the frame.
+            variables (list): Variables to include, defaults to the variables of the source.
+
+        Returns:
+            pd.DataFrame: 'date' and one column per variable.
+        """
+        rows = self.source_rows[source]
+        if variables is None:
+            variables = self.get_variables(source)
+        data = {'date': self.dates[rows]}
+        for variable in variables:
+            values_source = source if variable in self.columns[source] else self.source_of(variable)
+            data[variable] = self.columns[values_source][variable][rows].astype(float)
+        return pd.DataFrame(data)
+
+    def daily_grid(self, variables: list, sources: list = None) -> tuple:
+        """
+        Variables on a regular daily grid over the whole axis, days without a reading are NaN.
+
+        Args:
+            variables (list): Variables to put on the grid.
+            sources (list): Source of every variable, defaults to source_of() of each.
+
+        Returns:
+            tuple: (first day, matrix of shape (days, variables)).
+        """
+        if sources is None:
+            sources = [self.source_of(variable) for variable in variables]
+        days = self.dates.astype('datetime64[D]')
+        if len(days) == 0:
+            return None, np.empty((0, len(variables)))
+
+        positions = (days - days[0]).astype(np.int64)
+        grid = np.full((int(positions[-1]) + 1, len(variables)), np.nan)
+        if len(np.unique(positions)) == len(positions):
+            for i, (variable, source) in enumerate(zip(variables, sources)):
+                grid[positions, i] = self.columns[source][variable]
+        else:
+            # Several readings on some days (sub-daily timestamps), average them per day
+            for i, (variable, source) in enumerate(zip(variables, sources)):
+                values = self.columns[source][variable]
+                valid = ~np.isnan(values)
+                sums = np.bincount(positions[valid], weights=values[valid], minlength=len(grid))
+                counts = np.bincount(positions[valid], minlength=len(grid))
+                grid[counts > 0, i] = sums[counts > 0] / counts[counts > 0]
+        return pd.Timestamp(days[0]), grid
+
+    def qualified_names(self) -> list:
+        """
+        (source, variable, name) of every stored column. Variables found in several sources are named
+        'variable (source)', all others keep their name.
+        """
+        counts = {}
+        for variables in self.columns.values():
+            for variable in variables:
+                counts[variable] = counts.get(variable, 0) + 1
+        return [(source, variable, f"{variable} ({source})" if counts[variable] > 1 else variable)
+                for source, variables in self.columns.items() for variable in variables]
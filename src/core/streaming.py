@@ -0,0 +1,189 @@
+import numpy as np
+
+import interpolation
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+class GrowableArray:
+    """
+    Rows appended to a preallocated array whose capacity doubles when full, so appending chunks does not
+    keep every chunk alive until a final concatenate.
+    """
+
+    def __init__(self, columns: int, dtype, fill_value=0, capacity: int = 1024):
+        self.dtype = np.dtype(dtype)
+        self.fill_value = fill_value
+        self.length = 0
+        self.array = np.full((max(capacity, 1), columns), fill_value, dtype=self.dtype)
+
+    def reserve(self, length: int) -> None:
+        if length > len(self.array):
+            array = np.full((max(length, 2 * len(self.array)), self.array.shape[1]), self.fill_value, dtype=self.dtype)
+            array[:self.length] = self.array[:self.length]
+            self.array = array
+        self.length = max(self.length, length)
+
+    def append(self, rows: np.ndarray) -> None:
+        start = self.length
+        self.reserve(start + len(rows))
+        self.array[start:self.length] = rows
+
+    def view(self) -> np.ndarray:
+        return self.array[:self.length]
+
+class StreamingInterpolator:
+    """
+    Time interpolation of measurement columns fed in chunks in date order, matching
+    DataFrame.interpolate(method='time') of the whole file: gaps between two readings are interpolated linearly in time,
+    rows after the last reading of a column take that reading, rows before its first reading stay NaN.
+    Gaps longer than the max gap of their column stay NaN, see interpolation.interpolate_time().
+
+    Every column remembers its last reading and where its open gap started, so a gap spanning chunk boundaries is filled
+    once the next reading arrives. Rows are either kept as compact arrays or only summed per day, in which case just the
+    timestamps of rows in still open gaps are held on to.
+    """
+
+    def __init__(self, columns: int, daily: bool = False, dtype=np.float64, expected_rows: int = 1024, max_gaps: list = None):
+        """
+        Args:
+            columns (int): Number of value columns.
+            daily (bool): Only keep daily sums and counts instead of every row.
+            dtype: Storage type of the kept rows, np.float32 halves their memory.
+            expected_rows (int): Rows to allocate for up front, an upper bound avoids growing (and copying) the arrays.
+            max_gaps (list): Longest gap in nanoseconds to fill per column, None fills every gap.
+        """
+        self.columns = columns
+        self.max_gaps = np.full(columns, np.inf) if max_gaps is None else np.asarray(max_gaps, dtype=np.float64)
+        self.daily = daily
+        self.rows = 0
+        self.last_time = None
+        self.last_values = np.full(columns, np.nan)
+        self.last_reading_times = np.zeros(columns, dtype=np.int64)
+        self.gap_starts = [None] * columns
+
+        # Timestamps of the rows from row self.times_offset on, every row unless only daily sums are kept
+        self.times = GrowableArray(1, np.int64, capacity=1024 if daily else expected_rows)
+        self.times_offset = 0
+        if daily:
+            self.first_day = None
+            self.day_sums = GrowableArray(columns, np.float64)
+            self.day_counts = GrowableArray(columns, np.int64)
+            self.day_rows = GrowableArray(1, bool, fill_value=False)
+        else:
+            self.values = GrowableArray(columns, dtype, fill_value=np.nan, capacity=expected_rows)
+
+    def get_times(self, start: int, end: int) -> np.ndarray:
+        return self.times.view()[start - self.times_offset:end - self.times_offset, 0]
+
+    def store(self, start: int, values: np.ndarray, column: int = None) -> None:
+        """
+        Store interpolated rows from global row `start` on, of every column or of a single one.
+        NaN rows are not stored, they are either before the first reading or filled later.
+        """
+        if not self.daily:
+            if column is None:
+                self.values.append(values)
+            else:
+                self.values.array[start:start + len(values), column] = values
+            return
+
+        days = self.get_times(start, start + len(values)) // NANOSECONDS_PER_DAY - self.first_day
+        first_day, end_day = int(days[0]), int(days[-1]) + 1
+        offsets = days - first_day
+        for array in (self.day_sums, self.day_counts, self.day_rows):
+            array.reserve(end_day)
+
+        if column is None:
+            self.day_rows.array[days, 0] = True
+            columns = range(self.columns)
+            values = values.T
+        else:
+            columns = [column]
+            values = values[None, :]
+        for j, column_values in zip(columns, values):
+            valid = ~np.isnan(column_values)
+            self.day_sums.array[first_day:end_day, j] += np.bincount(offsets[valid], weights=column_values[valid], minlength=end_day - first_day)
+            self.day_counts.array[first_day:end_day, j] += np.bincount(offsets[valid], minlength=end_day - first_day)
+
+    def add_chunk(self, times: np.ndarray, values: np.ndarray) -> None:
+        """
+        Interpolate a chunk of rows.
+
+        Args:
+            times (np.ndarray): int64 nanosecond timestamps, in date order and not before the previous chunk.
+            values (np.ndarray): float values of shape (rows, columns), NaN where a column has no reading.
+        """
+        if len(times) == 0:
+            return
+        if np.any(np.diff(times) < 0) or (self.last_time is not None and times[0] < self.last_time):
+            raise ValueError("Streamed rows must be in date order.")
+
+        base = self.rows
+        self.rows += len(times)
+        self.last_time = times[-1]
+        self.times.append(times[:, None])
+        if self.daily and self.first_day is None:
+            self.first_day = times[0] // NANOSECONDS_PER_DAY
+
+        filled = np.array(values, dtype=np.float64)
+        gap_fills = []
+        for j in range(self.columns):
+            readings = np.flatnonzero(~np.isnan(filled[:, j]))
+            if len(readings) == 0:
+                if self.gap_starts[j] is None and not np.isnan(self.last_values[j]):
+                    self.gap_starts[j] = base
+                continue
+
+            first, last = readings[0], readings[-1]
+            if not np.isnan(self.last_values[j]) and times[first] - self.last_reading_times[j] <= self.max_gaps[j]:
+                # Close the gap since the previous reading, which may start in an earlier chunk
+                gap_start = base if self.gap_starts[j] is None else self.gap_starts[j]
+                gap_times = self.get_times(gap_start, base + first)
+                gap = np.interp(gap_times, [self.last_reading_times[j], times[first]], [self.last_values[j], filled[first, j]])
+                filled[max(gap_start - base, 0):first, j] = gap[max(base - gap_start, 0):]
+                if gap_start < base:
+                    gap_fills.append((gap_start, gap[:base - gap_start], j))
+
+            if last > first:
+                inside = slice(first, last + 1)
+                filled[inside, j] = interpolation.interpolate_time(times[inside], filled[inside, j], self.max_gaps[j])
+
+            self.last_values[j] = filled[last, j]
+            self.last_reading_times[j] = times[last]
+            self.gap_starts[j] = base + last + 1 if last + 1 < len(times) else None
+
+        for start, gap, j in gap_fills:
+            self.store(start, gap, j)
+        self.store(base, filled)
+
+        if self.daily:
+            # Only timestamps of rows in open gaps are needed again
+            keep_from = min([start for start in self.gap_starts if start is not None], default=self.rows)
+            kept = self.get_times(keep_from, self.rows).copy()
+            self.times = GrowableArray(1, np.int64)
+            self.times.append(kept[:, None])
+            self.times_offset = keep_from
+
+    def finish(self) -> tuple:
+        """
+        Fill the rows after the last reading of every column (up to its max gap) with that reading.
+
+        Returns:
+            tuple: (int64 timestamps, values) of every row, or (days as datetime64[D], daily means) of every day with rows.
+        """
+        for j, start in enumerate(self.gap_starts):
+            if start is not None:
+                within_gap = self.get_times(start, self.rows) - self.last_reading_times[j] <= self.max_gaps[j]
+                self.store(start, np.where(within_gap, self.last_values[j], np.nan), j)
+                self.gap_starts[j] = None
+
+        if not self.daily:
+            return self.times.view()[:, 0], self.values.view()
+
+        if self.first_day is None:
+            return np.array([], dtype='datetime64[D]'), np.empty((0, self.columns))
+        days = np.flatnonzero(self.day_rows.view()[:, 0])
+        counts = self.day_counts.view()[days]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, self.day_sums.view()[days] / counts, np.nan)
+        return (days + self.first_day).astype('datetime64[D]'), means
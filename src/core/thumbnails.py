@@ -0,0 +1,10 @@
+import os
+from PIL import features
+
+# Thumbnails are written to this subfolder of the graph folder, as WebP if Pillow supports it
+THUMBNAIL_FOLDER = 'thumbnails'
+THUMBNAIL_FORMAT = 'webp' if features.check('webp') else 'png'
+
+def get_thumbnail_path(file_path: str) -> str:
+    folder, filename = os.path.split(file_path)
+    return os.path.join(folder, THUMBNAIL_FOLDER, os.path.splitext(filename)[0] + '.' + THUMBNAIL_FORMAT)
@@ -66,10 +66,18 @@ function addCategory(parent, files) {
         .sort((a, b) => formatFilename(a.path).localeCompare(formatFilename(b.path)))
         .forEach(item => {
             const sub = document.createElement('li');
-            sub.textContent = formatFilename(item.path);
+            if (item.thumbnail) {
+                const preview = document.createElement('img');
+                preview.src = item.thumbnail;
+                preview.loading = 'lazy';
+                preview.alt = '';
+                preview.classList.add('nav-thumbnail');
+                sub.appendChild(preview);
+            }
+            sub.appendChild(document.createTextNode(formatFilename(item.path)));
             sub.onclick = (e) => {
                 e.stopPropagation();
-                showGraph(item.path);
+                showGraph(item.path, item.thumbnail);
             };
             parent.appendChild(sub);
         });
@@ -8,7 +8,7 @@ async function loadIndex() {
     buildNav();
     // Show first available graph
     const first = getFirstGraph(indexData.timeseries_graphs);
-    if (first) showGraph(first.path);
+    if (first) showGraph(first.path, first.thumbnail);
 }
 
 function getFirstGraph(arr) {
@@ -16,12 +16,22 @@ function getFirstGraph(arr) {
     return arr.find(item => filterMatch(item) && searchMatch(item));
 }
 
-function showGraph(path) {
-    document.getElementById('loader').style.display = 'block';
+function showGraph(path, thumbnail) {
     const img = document.getElementById('graph');
-    img.style.opacity = 0;
-    img.src = path;
     document.getElementById('title').textContent = formatFilename(path);
+    if (!thumbnail) {
+        document.getElementById('loader').style.display = 'block';
+        img.style.opacity = 0;
+        img.src = path;
+        return;
+    }
+    // Show the small thumbnail right away and swap in the full image once it has loaded
+    img.src = thumbnail;
+    const full = new Image();
+    full.onload = () => {
+        if (img.src.endsWith(encodeURI(thumbnail))) img.src = path;
+    };
+    full.src = path;
 }
 
 function hideLoader() {
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app imports the core modules by bare name (see src/app/cli.py), mirror that for the tests
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "core"))
@@ -0,0 +1,63 @@
+import unittest
+import pandas as pd
+import numpy as np
+
+from src.core import aggregates
+from lake_dataset import LakeDataset
+
+def create_sample_data():
+    rng = np.random.default_rng(4)
+    dates = pd.date_range(start="2019-03-10", periods=900, freq="D")
+    data = pd.DataFrame({
+        "date": dates,
+        "temperature": rng.normal(10, 5, 900),
+        "groundwater": rng.normal(400, 2, 900),
+    })
+    data.loc[rng.random(900) < 0.2, "temperature"] = np.nan
+    data.loc[100:200, "groundwater"] = np.nan  # Months without any reading
+    return pd.concat([data, data.iloc[::7]]).sort_values("date")  # Several readings on some days
+
+class TestAggregatePyramid(unittest.TestCase):
+    def setUp(self):
+        self.data = create_sample_data()
+        self.pyramid = aggregates.build_aggregate_pyramid(self.data)
+
+    def test_levels_match_resample(self):
+        for level, frequency in (('monthly', 'ME'), ('yearly', 'YE')):
+            resampled = self.data.set_index('date').resample(frequency)
+            for statistic in aggregates.AGGREGATE_STATISTICS:
+                expected = getattr(resampled[['temperature', 'groundwater']], statistic)()
+                actual = self.pyramid[level][statistic]
+                pd.testing.assert_frame_equal(actual[expected.columns], expected, check_names=False, check_freq=False, check_dtype=False)
+
+    def test_daily_and_month_of_year(self):
+        daily = self.data.groupby('date')[['temperature']].mean()
+        pd.testing.assert_frame_equal(self.pyramid['daily']['mean'][['temperature']], daily, check_names=False)
+
+        expected = self.data.groupby(self.data['date'].dt.month)['groundwater'].max()
+        np.testing.assert_array_equal(self.pyramid['month_of_year']['max']['groundwater'].to_numpy(), expected.to_numpy())
+
+    def test_get_aggregate(self):
+        monthly = aggregates.get_aggregate(self.pyramid, 'monthly', 'temperature', 'count')
+        self.assertEqual(list(monthly.columns), ['date', 'temperature'])
+        self.assertEqual(monthly['temperature'].sum(), self.data['temperature'].count())
+        with self.assertRaises(KeyError):
+            aggregates.get_aggregate(self.pyramid, 'monthly', 'missing')
+
+    def test_dataset_pyramid_matches_frame_pyramid(self):
+        daily_data = self.data.drop_duplicates('date')
+        lakelevel = pd.DataFrame({"date": daily_data['date'].iloc[::3], "lakelevel": np.arange(300.0)})
+        dataset = LakeDataset.from_frames({'x': daily_data, 'y': lakelevel})
+        merged = pd.merge(daily_data, lakelevel, on='date', how='left')
+
+        sub_daily = self.data.assign(date=self.data['date'] + pd.to_timedelta(np.arange(len(self.data)) % 2 * 12, unit='h'))
+
+        # The readings are the daily rows when there is one per day, sub-daily readings go through pandas
+        for data, pyramid in ((merged, aggregates.build_dataset_pyramid(dataset, 'x', ['temperature', 'groundwater', 'lakelevel'])),
+                              (sub_daily, aggregates.build_dataset_pyramid(LakeDataset.from_frames({'x': sub_daily.iloc[::-1]}), 'x'))):
+            expected = aggregates.build_aggregate_pyramid(data.groupby('date', as_index=False).mean())
+            for level in ('daily', 'monthly', 'yearly', 'month_of_year'):
+                pd.testing.assert_frame_equal(pyramid[level], expected[level], check_freq=False)
+
+if __name__ == '__main__':
+    unittest.main()
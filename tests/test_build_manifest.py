@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import numpy as np
+
+from src.app import cli
+
+build_manifest = cli.build_manifest  # Use the module instance the CLI records into
+
+def create_sample_data():
+    dates = pd.date_range(start="2024-01-01", periods=60, freq="D")
+    x_data = pd.DataFrame({
+        "date": dates,
+        "temperature": np.linspace(10, 20, 60),
+        "humidity": np.linspace(60, 80, 60)
+    })
+    y_data = pd.DataFrame({
+        "date": dates,
+        "lakelevel": np.linspace(50, 55, 60)
+    })
+    return x_data, y_data
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmpdir.name, '.manifest.json')
+        self.folders = [os.path.join(self.tmpdir.name, name) + "/" for name in ('timeseries', 'correlation', 'seasonal')]
+        for folder in self.folders:
+            os.makedirs(folder)
+        self.x_data, self.y_data = create_sample_data()
+        build_manifest.configure_manifest(enabled=True)
+        build_manifest.pop_recorded_entries()
+
+    def tearDown(self):
+        build_manifest.PREVIOUS_ENTRIES.clear()
+        build_manifest.pop_recorded_entries()
+        self.tmpdir.cleanup()
+
+    def run_build(self, x_data, variables, complete=True, build='sample', y_data=None):
+        build_manifest.load_manifest(build, self.manifest_path)
+        y_data = self.y_data if y_data is None else y_data
+        dataset = cli.lake_dataset.LakeDataset.from_frames({'x': x_data, 'y': y_data})
+        cli.generate_graphs(dataset, variables, y_data.columns[1], *self.folders)
+        return build_manifest.save_manifest(build, build_manifest.pop_recorded_entries(), complete, self.manifest_path)
+
+    def get_modification_times(self):
+        return {os.path.join(folder, f): os.stat(os.path.join(folder, f)).st_mtime_ns for folder in self.folders for f in os.listdir(folder) if f.endswith('.png')}
+
+    def test_fingerprint_depends_on_data_and_parameters(self):
+        frame = self.x_data[['date', 'temperature']]
+        self.assertEqual(build_manifest.fingerprint(frame, {'use_years': False}), build_manifest.fingerprint(frame.copy(), {'use_years': False}))
+        self.assertNotEqual(build_manifest.fingerprint(frame, {'use_years': False}), build_manifest.fingerprint(frame, {'use_years': True}))
+
+        changed = frame.copy()
+        changed.loc[59, 'temperature'] += 0.1
+        self.assertNotEqual(build_manifest.fingerprint(frame), build_manifest.fingerprint(changed))
+
+    def test_rerun_only_renders_changed_graphs(self):
+        self.run_build(self.x_data, ['temperature', 'humidity'])
+        first = self.get_modification_times()
+
+        changed = self.x_data.copy()
+        changed.loc[30, 'humidity'] += 5
+        self.run_build(changed, ['temperature', 'humidity'])
+        second = self.get_modification_times()
+
+        rerendered = {os.path.basename(path) for path in first if first[path] != second[path]}
+        self.assertEqual(rerendered, {'humidity_timeseries.png', 'humidity_seasonal_correlation.png', 'humidity_correlation.png'})
+
+    def test_shared_graphs_are_reused_by_other_builds(self):
+        self.run_build(self.x_data, ['temperature'])
+        first = self.get_modification_times()
+
+        chlorophyll = pd.DataFrame({'date': self.y_data['date'], 'chlorophyll a': np.linspace(1, 3, 60)})
+        self.run_build(self.x_data, ['temperature'], build='chlorophyll', y_data=chlorophyll)
+        second = self.get_modification_times()
+
+        rerendered = {os.path.basename(path) for path in second if first.get(path) != second[path]}
+        self.assertEqual(rerendered, {'chlorophyll a_timeseries.png', 'chlorophyll a_seasonal_correlation.png', 'temperature_correlation.png'})
+
+        # The other build overwrote the temperature correlation graph, so the first build renders it again
+        self.run_build(self.x_data, ['temperature'])
+        third = self.get_modification_times()
+        self.assertEqual({os.path.basename(path) for path in third if second.get(path) != third[path]}, {'temperature_correlation.png'})
+
+    def test_orphans_are_removed_by_complete_runs_only(self):
+        self.run_build(self.x_data, ['temperature', 'humidity'])
+        humidity_graph = os.path.join(self.folders[0], 'humidity_timeseries.png')
+
+        removed = self.run_build(self.x_data, ['temperature'], complete=False)
+        self.assertEqual(removed, [])
+        self.assertTrue(os.path.exists(humidity_graph))
+
+        removed = self.run_build(self.x_data.drop(columns=['humidity']), ['temperature'])
+        self.assertIn(os.path.normpath(humidity_graph), removed)
+        self.assertFalse(os.path.exists(humidity_graph))
+        self.assertTrue(os.path.exists(os.path.join(self.folders[0], 'temperature_timeseries.png')))
+
+    def test_skipped_graphs_are_not_tried_again(self):
+        # A year between the x and the y readings leaves no overlap at lags of up to 30 days
+        y_data = self.y_data.assign(date=self.y_data['date'] + pd.Timedelta(days=365))
+        dataset = cli.lake_dataset.LakeDataset.from_frames({'x': self.x_data, 'y': y_data})
+        cross_correlation_folder = os.path.join(self.tmpdir.name, 'cross_correlation') + "/"
+        os.makedirs(cross_correlation_folder)
+
+        def run(complete=True):
+            build_manifest.load_manifest('sample', self.manifest_path)
+            with mock.patch.object(cli.correlation, 'lagged_cross_correlation', wraps=cli.correlation.lagged_cross_correlation) as correlogram:
+                cli.generate_graphs(dataset, ['temperature'], 'lakelevel', *self.folders,
+                                    cross_correlation_folder_path=cross_correlation_folder, max_lag_days=30)
+            build_manifest.save_manifest('sample', build_manifest.pop_recorded_entries(), complete, self.manifest_path)
+            return correlogram.call_count
+
+        self.assertEqual(run(), 1)
+        self.assertEqual(os.listdir(cross_correlation_folder), [])
+        self.assertEqual(run(), 0)
+        self.assertEqual(run(), 0)  # The skip is kept by the run that did not try again
+
+        build_manifest.configure_manifest(enabled=False)  # --force-render tries again
+        self.assertEqual(run(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+
+from src.core import changepoint
+
+def create_piecewise_series():
+    rng = np.random.default_rng(1)
+    x = np.arange(300, dtype=float)
+    y = np.concatenate([
+        np.linspace(20.0, 21.0, 100),
+        np.linspace(21.0, 19.0, 120),
+        np.linspace(19.0, 19.5, 80),
+    ]) + rng.normal(0, 0.02, 300)
+    return x, y
+
+def optimal_partition(cost, penalty, min_size):
+    """
+    Exhaustive O(n²) reference for PELT.
+    """
+    best_cost = np.full(cost.n + 1, np.inf)
+    best_cost[0] = -penalty
+    previous_change = np.zeros(cost.n + 1, dtype=int)
+    for end in range(min_size, cost.n + 1):
+        for start in [0] + list(range(min_size, end - min_size + 1)):
+            total = best_cost[start] + cost.error(start, end) + penalty
+            if total < best_cost[end]:
+                best_cost[end] = total
+                previous_change[end] = start
+    change_points = []
+    end = previous_change[cost.n]
+    while end > 0:
+        change_points.append(int(end))
+        end = previous_change[end]
+    return sorted(change_points)
+
+class TestChangePointDetection(unittest.TestCase):
+    def setUp(self):
+        self.x, self.y = create_piecewise_series()
+
+    def test_segment_cost_matches_polyfit_residuals(self):
+        cost = changepoint.LinearSegmentCost(self.x, self.y)
+        coefficients = np.polyfit(self.x[40:170], self.y[40:170], 1)
+        residuals = self.y[40:170] - np.polyval(coefficients, self.x[40:170])
+        self.assertAlmostEqual(float(cost.error(40, 170)), float(np.sum(residuals ** 2)), places=8)
+        np.testing.assert_allclose(cost.line(40, 170), coefficients, rtol=1e-8)
+
+    def test_pelt_matches_optimal_partition(self):
+        x, y = self.x[::5], self.y[::5]
+        cost = changepoint.LinearSegmentCost(x, y)
+        self.assertEqual(changepoint.pelt(cost, 0.05, 5), optimal_partition(cost, 0.05, 5))
+
+    def test_pelt_finds_known_change_points(self):
+        segments = changepoint.detect_segments(self.x, self.y, method='pelt', min_size=30)
+        starts = [segment['start'] for segment in segments[1:]]
+        self.assertEqual(len(starts), 2)
+        self.assertTrue(abs(starts[0] - 100) <= 3 and abs(starts[1] - 220) <= 3, starts)
+        self.assertLess(segments[1]['slope'], 0)
+        self.assertGreater(segments[2]['slope'], 0)
+
+    def test_binary_segmentation_finds_recent_regime(self):
+        segments = changepoint.detect_segments(self.x, self.y, method='binseg', min_size=30, penalty=1.0)
+        self.assertTrue(abs(segments[-1]['start'] - 220) <= 3, segments[-1])
+        self.assertGreater(segments[-1]['slope'], 0)
+        self.assertEqual(segments[0]['start'], 0)
+        self.assertEqual(segments[-1]['end'], len(self.x))
+
+    def test_pelt_previous_changes_match_prefix_runs(self):
+        cost = changepoint.LinearSegmentCost(self.x, self.y)
+        previous_change = changepoint.pelt_previous_changes(cost, 0.05, 30)
+        for end in (120, 200, 260, 300):
+            prefix_cost = changepoint.LinearSegmentCost(self.x[:end], self.y[:end])
+            last_start = (changepoint.pelt(prefix_cost, 0.05, 30) or [0])[-1]
+            self.assertEqual(previous_change[end], last_start, end)
+
+    def test_unknown_method_raises(self):
+        with self.assertRaises(ValueError):
+            changepoint.detect_segments(self.x, self.y, method='unknown')
+
+if __name__ == '__main__':
+    unittest.main()
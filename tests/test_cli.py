@@ -0,0 +1,171 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+import pandas as pd
+import numpy as np
+
+from src.app import cli
+import thumbnails
+
+def create_sample_data():
+    dates = pd.date_range(start="2024-01-01", periods=60, freq="D")
+    x_data = pd.DataFrame({
+        "date": dates,
+        "temperature": np.linspace(10, 20, 60),
+        "humidity": np.linspace(60, 80, 60)
+    })
+    y_data = pd.DataFrame({
+        "date": dates,
+        "lakelevel": np.linspace(50, 55, 60)
+    })
+    return x_data, y_data
+
+class TestGenerateGraphs(unittest.TestCase):
+    def setUp(self):
+        self.x_data, self.y_data = create_sample_data()
+        self.dataset = cli.lake_dataset.LakeDataset.from_frames({'x': self.x_data, 'y': self.y_data})
+
+    def test_build_graph_tasks_matches_serial_order(self):
+        tasks = cli.build_graph_tasks(['temperature', 'humidity'], 'lakelevel')
+        self.assertEqual(tasks, [
+            ('timeseries', 'temperature', 'x'), ('seasonal', 'temperature', 'x'),
+            ('timeseries', 'humidity', 'x'), ('seasonal', 'humidity', 'x'),
+            ('timeseries', 'lakelevel', 'y'), ('seasonal', 'lakelevel', 'y'),
+            ('correlation', 'temperature', 'y'), ('correlation', 'humidity', 'y'),
+        ])
+
+    def test_build_graph_tasks_appends_cross_correlation(self):
+        tasks = cli.build_graph_tasks(['temperature', 'lakelevel'], 'lakelevel', cross_correlation=True)
+        self.assertEqual(tasks[-1], ('cross_correlation', 'temperature', 'y'))
+        self.assertNotIn(('cross_correlation', 'lakelevel', 'y'), tasks)
+
+    def test_build_graph_tasks_shares_x_graphs_between_targets(self):
+        tasks = cli.build_graph_tasks(['temperature', 'chlorophyll a'], 'lakelevel', additional_y_variables=['chlorophyll a'])
+        self.assertEqual(tasks, [
+            ('timeseries', 'temperature', 'x'), ('seasonal', 'temperature', 'x'),
+            ('timeseries', 'chlorophyll a', 'x'), ('seasonal', 'chlorophyll a', 'x'),
+            ('timeseries', 'lakelevel', 'y'), ('seasonal', 'lakelevel', 'y'),
+            ('correlation', 'temperature', 'y'), ('correlation', 'temperature', 'y2'),
+        ])
+
+    def test_get_targets(self):
+        arguments = argparse.Namespace(targets=['data/lakelevel_data.csv:lakelevel', r'C:\data\chemical_data.csv:Chlorophyll A'],
+                                       targets_file=None, y_variable=None, y_variable_source=None)
+        self.assertEqual(cli.get_targets(arguments), [('lakelevel', 'data/lakelevel_data.csv'),
+                                                      ('chlorophyll a', r'C:\data\chemical_data.csv')])
+
+        arguments.targets.append('data/chemical_data.csv:chlorophyll a')
+        with self.assertRaises(ValueError):
+            cli.get_targets(arguments)
+
+        single = argparse.Namespace(targets=None, targets_file=None, y_variable='secchi depth', y_variable_source='data/chemical_data.csv')
+        self.assertEqual(cli.get_targets(single), [('secchi depth', 'data/chemical_data.csv')])
+
+    def test_additional_targets_get_their_own_correlation_graphs(self):
+        chlorophyll = pd.DataFrame({"date": self.y_data["date"], "chlorophyll a": np.linspace(1, 3, 60)})
+        dataset = cli.lake_dataset.LakeDataset.from_frames({'x': self.x_data, 'y': self.y_data, 'y2': chlorophyll})
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folders = [os.path.join(tmpdir, name) + "/" for name in ('timeseries', 'correlation', 'seasonal', 'chlorophyll')]
+            for folder in folders:
+                os.makedirs(folder)
+
+            failures = cli.generate_graphs(dataset, ['temperature'], 'lakelevel', *folders[:3],
+                                           additional_targets=[('chlorophyll a', folders[3], None)])
+
+            self.assertEqual(failures, [])
+            self.assertTrue(os.path.exists(os.path.join(folders[1], "temperature_correlation.png")))
+            self.assertTrue(os.path.exists(os.path.join(folders[3], "temperature_correlation.png")))
+            self.assertTrue(os.path.exists(os.path.join(folders[0], "chlorophyll a_timeseries.png")))
+
+    def test_render_graph_figure_draws_without_writing(self):
+        renderer = cli.generate_plots.PlotRenderer(profile='draft', reuse_templates=False)
+        pyramids = cli.build_graph_pyramids(self.dataset, ['lakelevel'])
+        settings = {'targets': {'y': {'y_variable': 'lakelevel'}}, 'max_points': 0, 'downsampling_method': 'lttb',
+                    'density_threshold': 0, 'density_bins': 100, **cli.get_time_scale(self.dataset)}
+        cli.build_manifest.pop_recorded_entries()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cwd = os.getcwd()
+            os.chdir(tmpdir)
+            self.addCleanup(os.chdir, cwd)
+            figures = [cli.render_graph_figure(task, pyramids, settings, renderer)
+                       for task in [('timeseries', 'temperature', 'x'), ('timeseries', 'humidity', 'x'),
+                                    ('seasonal', 'lakelevel', 'y'), ('correlation', 'humidity', 'y')]]
+            self.assertEqual(os.listdir(tmpdir), [])
+
+        # Every graph keeps its own figure
+        self.assertEqual(len({id(figure) for figure in figures}), 4)
+        self.assertEqual(figures[1].axes[0].get_title(), "Humidity (%) over time")
+        self.assertEqual(cli.build_manifest.pop_recorded_entries(), {})
+
+    def test_failures_are_reported_per_variable(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folders = [os.path.join(tmpdir, name) + "/" for name in ('timeseries', 'correlation', 'seasonal')]
+            for folder in folders:
+                os.makedirs(folder)
+
+            progress = []
+            failures = cli.generate_graphs(self.dataset, ['temperature', 'missing'], 'lakelevel', *folders, jobs=2,
+                                           progress=lambda *report: progress.append(report))
+
+            self.assertEqual([report[:2] for report in progress], [(done, 8) for done in range(1, 9)])
+            self.assertEqual({task[1] for _, _, task, error in progress if error is not None}, {'missing'})
+            self.assertTrue(failures)
+            self.assertTrue(all(variable == 'missing' for _, variable, _ in failures))
+            self.assertTrue(os.path.exists(os.path.join(folders[0], "temperature_timeseries.png")))
+            self.assertTrue(os.path.exists(os.path.join(folders[1], "temperature_correlation.png")))
+
+    def test_background_write_failures_are_reported_per_graph(self):
+        cli.generate_plots.configure_image_writer(threads=2, max_pending=2)
+        self.addCleanup(cli.generate_plots.configure_image_writer, 0)
+        self.addCleanup(cli.build_manifest.pop_recorded_entries)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            folders = [os.path.join(tmpdir, name) + "/" for name in ('timeseries', 'correlation', 'seasonal')]
+            for folder in folders:
+                os.makedirs(folder)
+            # A file where the seasonal thumbnails folder should be makes every seasonal write fail
+            open(os.path.join(folders[2], thumbnails.THUMBNAIL_FOLDER), 'w').close()
+
+            failures = cli.generate_graphs(self.dataset, ['temperature', 'humidity'], 'lakelevel', *folders)
+
+            self.assertEqual(sorted((kind, variable) for kind, variable, _ in failures),
+                             [('seasonal', 'humidity'), ('seasonal', 'lakelevel'), ('seasonal', 'temperature')])
+            self.assertTrue(os.path.exists(os.path.join(folders[0], "humidity_timeseries.png")))
+            self.assertEqual([f for f in os.listdir(folders[2]) if f.endswith('.tmp')], [])
+
+            # Failed graphs are left out of the manifest, so the next run renders them again
+            recorded = cli.build_manifest.pop_recorded_entries()
+            self.assertIn(os.path.normpath(os.path.join(folders[0], "humidity_timeseries.png")), recorded)
+            self.assertNotIn(os.path.normpath(os.path.join(folders[2], "humidity_seasonal_correlation.png")), recorded)
+
+class TestCommands(unittest.TestCase):
+    def test_arguments_without_a_command_are_a_full_run(self):
+        arguments = cli.parse_arguments(['data/chemical_data.csv', '--variables', 'calcium', '--bootstrap_replicates', '0'])
+        self.assertEqual((arguments.command, arguments.forecast, arguments.variables), ('plot', True, ['calcium']))
+
+        arguments = cli.parse_arguments(['plot', 'data/chemical_data.csv', '--profile', 'draft'])
+        self.assertEqual((arguments.command, arguments.forecast, arguments.profile), ('plot', False, 'draft'))
+        self.assertEqual(cli.parse_arguments(['headers', 'data/physical_data.csv']).source, 'data/physical_data.csv')
+
+    def test_argument_choices_match_the_core_modules(self):
+        self.assertEqual(cli.RENDER_PROFILES, list(cli.generate_plots.RENDER_PROFILES))
+        self.assertEqual(cli.DEFAULT_RENDER_PROFILE, cli.generate_plots.DEFAULT_RENDER_PROFILE)
+        self.assertEqual(cli.DOWNSAMPLING_METHODS, cli.downsampling.DOWNSAMPLING_METHODS)
+
+    def test_headers_command_does_not_import_numpy_pandas_or_matplotlib(self):
+        code = ("import sys; sys.argv = ['cli.py', 'headers', 'data/physical_data.csv']; sys.path.insert(0, 'src/app'); "
+                "import cli; cli.main(); print([name for name in ('numpy.version', 'pandas.core', 'matplotlib') if name in sys.modules])")
+        result = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).resolve().parent.parent,
+                                capture_output=True, text=True, check=True)
+        lines = result.stdout.splitlines()
+        self.assertIn('temperature', lines)
+        self.assertEqual(lines[-1], '[]')
+
+if __name__ == '__main__':
+    unittest.main()
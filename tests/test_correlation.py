@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.core import correlation
+
+def create_sample_datasets():
+    rng = np.random.default_rng(2)
+    dates = pd.date_range(start="2020-01-01", periods=200, freq="D")
+    temperature = rng.normal(15, 5, 200)
+    physical = pd.DataFrame({
+        "date": dates,
+        "temperature": temperature,
+        "humidity": 80 - temperature + rng.normal(0, 2, 200),
+    })
+    chemical = pd.DataFrame({
+        "date": dates[::10],
+        "calcium": np.round(rng.normal(40, 3, 20)),  # Rounded to create ties
+        "chloride": np.where(rng.random(20) < 0.3, np.nan, rng.normal(20, 2, 20)),
+    })
+    lakelevel = pd.DataFrame({"date": dates[50:], "lakelevel": 20 + 0.01 * temperature[50:]})
+    return {"physical": physical, "chemical": chemical, "lakelevel": lakelevel}
+
+class TestCorrelationMatrix(unittest.TestCase):
+    def setUp(self):
+        self.aligned = correlation.align_datasets(create_sample_datasets())
+        self.values = self.aligned.to_numpy(dtype=float)
+
+    def test_align_datasets_uses_shared_date_axis(self):
+        self.assertEqual(list(self.aligned.columns), ["temperature", "humidity", "calcium", "chloride", "lakelevel"])
+        self.assertEqual(len(self.aligned), 200)
+        self.assertTrue(self.aligned.index.is_monotonic_increasing)
+
+    def test_pearson_and_counts_match_pandas(self):
+        pearson, counts = correlation.pairwise_correlation(self.values)
+        np.testing.assert_allclose(pearson, self.aligned.corr(min_periods=3).to_numpy(), atol=1e-10)
+        valid = self.aligned.notna().astype(int)
+        np.testing.assert_array_equal(counts, (valid.T @ valid).to_numpy())
+
+    def test_spearman_matches_pandas(self):
+        spearman = correlation.spearman_correlation(self.values)
+        np.testing.assert_allclose(spearman, self.aligned.corr(method='spearman', min_periods=3).to_numpy(), atol=1e-10)
+
+    def test_build_correlation_matrices_is_reordered_consistently(self):
+        matrices = correlation.build_correlation_matrices(create_sample_datasets())
+        position = {variable: i for i, variable in enumerate(matrices['variables'])}
+        expected = self.aligned.corr().loc['temperature', 'humidity']
+        self.assertAlmostEqual(matrices['pearson'][position['temperature'], position['humidity']], expected, places=10)
+
+    def test_saved_matrices_load_unchanged(self):
+        matrices = correlation.build_correlation_matrices(create_sample_datasets())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "correlation_matrix.npz")
+            correlation.save_correlation_matrices(matrices, file_path)
+            loaded = correlation.load_correlation_matrices(file_path)
+
+        self.assertEqual(loaded['variables'], matrices['variables'])
+        for name in ('pearson', 'spearman', 'counts'):
+            np.testing.assert_array_equal(loaded[name], matrices[name])
+
+class TestLaggedCrossCorrelation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x = rng.normal(size=(1500, 2)).cumsum(axis=0)
+        self.y = np.roll(self.x[:, 0], 40) + rng.normal(size=1500)
+        self.x[rng.random((1500, 2)) < 0.2] = np.nan
+        self.y[600:800] = np.nan  # Gap in the y series
+
+    def test_matches_pairwise_correlation_at_every_lag(self):
+        lags, correlations, counts = correlation.lagged_cross_correlation(self.x, self.y, max_lag=60)
+        self.assertEqual(correlations.shape, (121, 2))
+
+        for i, lag in enumerate(lags):
+            x_values = self.x[:len(self.x) - lag] if lag >= 0 else self.x[-lag:]
+            y_values = self.y[lag:] if lag >= 0 else self.y[:len(self.y) + lag]
+            for j in range(2):
+                shared = pd.DataFrame({'x': x_values[:, j], 'y': y_values}).dropna()
+                self.assertEqual(counts[i, j], len(shared))
+                self.assertAlmostEqual(correlations[i, j], shared['x'].corr(shared['y']), places=10)
+
+    def test_find_best_lags_recovers_delay(self):
+        dates = pd.date_range(start="2000-01-01", periods=1500, freq="D")
+        x_data = pd.DataFrame({"date": dates, "groundwater": self.x[:, 0], "temperature": self.x[:, 1]})
+        y_data = pd.DataFrame({"date": dates, "lakelevel": self.y}).dropna()
+
+        best_lags = correlation.find_best_lags(x_data, y_data, ['groundwater', 'temperature'], 'lakelevel', max_lag=90)
+
+        groundwater = best_lags.set_index('variable').loc['groundwater']
+        self.assertEqual(groundwater['best_lag_days'], 40)
+        self.assertGreater(groundwater['correlation'], groundwater['same_day_correlation'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import io
 import unittest
+import numpy as np
 import pandas as pd
 
+from src.app import cli
+
 def get_sample_csv():
     return """date,lakelevel,temperature
 2024-01-01,50.2,15.1
@@ -29,5 +32,26 @@ class TestCSVParsing(unittest.TestCase):
         self.assertEqual(df.iloc[3]['lakelevel'], 50.0)
         self.assertEqual(df.iloc[3]['temperature'], 14.8)
 
+    def test_read_measurement_csv_matches_per_cell_cleaning(self):
+        raw_csv = 'Date,Calcium,Sulfate,Nitrate-N\n 2024-01-01 ,"1,234.5", x ,\n2024-01-02, 7 ,"2,000", \n'
+        legacy = pd.read_csv(io.StringIO(raw_csv), dtype=str)
+        legacy = legacy.map(lambda x: x.strip().replace(',', '') if isinstance(x, str) else x).replace('', np.nan)
+        legacy.columns = [col.lower() for col in legacy.columns]
+        for col in legacy.columns:
+            if col != 'date':
+                legacy[col] = pd.to_numeric(legacy[col], errors='coerce')
+
+        df = cli.read_measurement_csv(io.StringIO(raw_csv))
+        pd.testing.assert_frame_equal(df, legacy)
+        self.assertEqual(df['calcium'].iloc[0], 1234.5)
+        self.assertEqual(df['date'].iloc[0], '2024-01-01')
+
+    def test_read_measurement_csv_projects_requested_columns(self):
+        raw_csv = 'Date,Calcium,Sulfate,Nitrate-N\n2024-01-01,"1,234.5",3,4\n2024-01-02,7,"2,000",5\n'
+        full = cli.read_measurement_csv(io.StringIO(raw_csv))
+        projected = cli.read_measurement_csv(io.StringIO(raw_csv), ['nitrate-n', 'calcium'])
+        pd.testing.assert_frame_equal(projected, full[['date', 'calcium', 'nitrate-n']])
+        self.assertEqual(cli.read_csv_headers(io.StringIO(raw_csv)), ['date', 'calcium', 'sulfate', 'nitrate-n'])
+
 if __name__ == '__main__':
     unittest.main()
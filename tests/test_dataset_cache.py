@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+
+from src.app import cli
+
+dataset_cache = cli.dataset_cache  # Patch the module instance the CLI loaders use
+
+def write_sample_csv(filepath):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write("Date,Temperature,Humidity\n")
+        f.write("2024-01-01,15.1,70\n")
+        f.write("2024-01-03,15.3,\n")
+        f.write("2024-01-05,14.9,72\n")
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, 'sample.csv')
+        write_sample_csv(self.csv_path)
+        self.original_cache_dir = dataset_cache.CACHE_DIR
+        dataset_cache.CACHE_DIR = os.path.join(self.tmpdir.name, 'cache')
+        dataset_cache.configure_cache(enabled=True, rebuild=False)
+
+    def tearDown(self):
+        dataset_cache.CACHE_DIR = self.original_cache_dir
+        self.tmpdir.cleanup()
+
+    def test_cache_round_trip_matches_parsed_frame(self):
+        parsed = cli.parse_and_process_x_data(self.csv_path)
+        cli.load_and_process_x_data(self.csv_path)
+        cached = cli.load_and_process_x_data(self.csv_path)
+        pd.testing.assert_frame_equal(cached, parsed)
+        self.assertEqual(len([f for f in os.listdir(dataset_cache.CACHE_DIR) if f.endswith('.npz')]), 1)
+
+    def test_projected_loads_are_cached_separately(self):
+        full = cli.load_and_process_x_data(self.csv_path)
+        projected = cli.load_and_process_x_data(self.csv_path, ['humidity'])
+        pd.testing.assert_frame_equal(projected, full[['date', 'humidity']])
+        self.assertEqual(len([f for f in os.listdir(dataset_cache.CACHE_DIR) if f.endswith('.npz')]), 2)
+
+    def test_streamed_loads_share_an_entry_across_chunk_sizes(self):
+        small = cli.load_and_process_x_data(self.csv_path, chunk_rows=1)
+        large = cli.load_and_process_x_data(self.csv_path, chunk_rows=1000)
+        pd.testing.assert_frame_equal(large, small)
+        self.assertEqual(len([f for f in os.listdir(dataset_cache.CACHE_DIR) if f.endswith('.npz')]), 1)
+
+    def test_changed_source_is_evicted(self):
+        cli.load_and_process_x_data(self.csv_path)
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("2024-01-07,13.0,75\n")
+
+        self.assertEqual(dataset_cache.evict_stale_entries(), 1)
+        reloaded = cli.load_and_process_x_data(self.csv_path)
+        self.assertEqual(len(reloaded), 4)
+
+    def test_touched_source_is_hashed_once(self):
+        cli.load_and_process_x_data(self.csv_path)
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with mock.patch.object(dataset_cache, 'hash_file', wraps=dataset_cache.hash_file) as hash_file:
+            self.assertEqual(dataset_cache.evict_stale_entries(), 0)
+            self.assertEqual(dataset_cache.evict_stale_entries(), 0)
+            cli.load_and_process_x_data(self.csv_path)
+        self.assertEqual(hash_file.call_count, 1)
+
+    def test_memory_entries_are_reused_until_the_source_changes(self):
+        dataset_cache.configure_cache(enabled=False, memory=True)
+        self.addCleanup(dataset_cache.configure_cache)
+
+        first = cli.load_and_process_x_data(self.csv_path)
+        first.loc[0, 'temperature'] = -99  # Callers get copies
+        pd.testing.assert_frame_equal(cli.load_and_process_x_data(self.csv_path), cli.parse_and_process_x_data(self.csv_path))
+        self.assertEqual(len(dataset_cache.MEMORY_ENTRIES), 1)
+
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("2024-01-07,13.0,75\n")
+        self.assertEqual(len(cli.load_and_process_x_data(self.csv_path)), 4)
+
+if __name__ == '__main__':
+    unittest.main()
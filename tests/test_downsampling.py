@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+
+from src.core import downsampling
+from src.core import generate_plots
+
+def reference_lttb(x, y, threshold):
+    """
+    Straightforward per-bucket LTTB as described by Steinarsson (2013).
+    """
+    length = len(x)
+    every = (length - 2) / (threshold - 2)
+    sampled = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, length - 1) if bucket < threshold - 3 else length
+        average_x = np.mean(x[next_start:next_end])
+        average_y = np.mean(y[next_start:next_end])
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        best_area = -1
+        for index in range(start, end):
+            area = abs((x[previous] - average_x) * (y[index] - y[previous]) - (x[previous] - x[index]) * (average_y - y[previous]))
+            if area > best_area:
+                best_area = area
+                best_index = index
+        sampled.append(best_index)
+        previous = best_index
+    sampled.append(length - 1)
+    return np.array(sampled)
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(13)
+        self.x = np.arange(5000, dtype=float)
+        self.y = np.cumsum(rng.normal(size=5000))
+        self.y[2345] = 500  # A single spike must survive
+
+    def test_lttb_matches_reference(self):
+        for max_points in (3, 10, 257, 1000):
+            indices = downsampling.lttb_indices(self.x, self.y, max_points)
+            self.assertEqual(len(indices), max_points)
+            np.testing.assert_array_equal(indices, reference_lttb(self.x, self.y, max_points))
+        self.assertIn(2345, downsampling.lttb_indices(self.x, self.y, 100))
+
+    def test_min_max_keeps_every_bucket_extreme(self):
+        indices = downsampling.min_max_indices(self.y, 200)
+        self.assertLessEqual(len(indices), 200)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        for bucket in np.array_split(np.arange(5000), 100):
+            self.assertIn(bucket[np.argmin(self.y[bucket])], indices)
+            self.assertIn(bucket[np.argmax(self.y[bucket])], indices)
+
+    def test_short_series_and_disabled_budget_are_unchanged(self):
+        x, y = downsampling.downsample(self.x[:50], self.y[:50], 100)
+        np.testing.assert_array_equal(y, self.y[:50])
+        x, y = downsampling.downsample(self.x, self.y, 0, method='minmax')
+        self.assertEqual(len(y), 5000)
+        with self.assertRaises(ValueError):
+            downsampling.downsample(self.x, self.y, 100, method='median')
+
+    def test_timeseries_trend_uses_full_resolution(self):
+        data = pd.DataFrame({'date': pd.date_range('1980-01-01', periods=5000, freq='D'), 'temperature': self.y})
+        renderer = generate_plots.PlotRenderer(dpi=20)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer.render_timeseries(data, 'temperature', os.path.join(tmpdir, 'temperature_timeseries.png'), max_points=300)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'temperature_timeseries.png')))
+
+        template = renderer.get_template('timeseries')
+        self.assertEqual(len(template['data_line'].get_ydata()), 300)
+        numeric_dates = mdates.date2num(data['date'])
+        expected_trend = np.poly1d(np.polyfit(numeric_dates, self.y, 1))(numeric_dates)
+        np.testing.assert_allclose(template['trend_line'].get_ydata(), expected_trend)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,13 @@ import unittest
 import pandas as pd
 import numpy as np
 import io
+import os
 import sys
 import re
+import tempfile
 
 from src.app import cli as cli_main
+from src.core import analysis
 
 class TestForecastFutureLakeLevelOutput(unittest.TestCase):
     def setUp(self):
@@ -32,5 +35,82 @@ class TestForecastFutureLakeLevelOutput(unittest.TestCase):
             "Trend suggests lake would already be dry" in output
         )
 
+class TestRollingLinearRegression(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = 19000.0 + np.arange(500, dtype=float)
+        self.y = 20.0 + np.cumsum(rng.normal(0, 0.01, 500))
+
+    def test_matches_polyfit_on_every_window(self):
+        window = 50
+        slopes, intercepts = analysis.rolling_linear_regression(self.x, self.y, window)
+        expected = np.array([np.polyfit(self.x[i:i+window], self.y[i:i+window], 1)
+                             for i in range(len(self.x) - window + 1)])
+        np.testing.assert_allclose(slopes, expected[:, 0], rtol=1e-8, atol=1e-12)
+        np.testing.assert_allclose(intercepts, expected[:, 1], rtol=1e-8)
+
+    def test_rejects_invalid_window(self):
+        with self.assertRaises(ValueError):
+            analysis.rolling_linear_regression(self.x, self.y, 1)
+        with self.assertRaises(ValueError):
+            analysis.rolling_linear_regression(self.x, self.y, len(self.x) + 1)
+
+class TestBootstrapForecast(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        dates = pd.date_range(start="2015-01-01", periods=400, freq="D")
+        lakelevel = np.linspace(20, 19, 400) + rng.normal(0, 0.02, 400)
+        self.df = pd.DataFrame({"date": dates, "lakelevel": lakelevel})
+        self.x = np.arange(400, dtype=float)
+        self.y = lakelevel
+
+    def test_bootstrap_matches_explicit_refits(self):
+        slopes, intercepts, noise = analysis.bootstrap_trend_lines(self.x, self.y, replicates=50, block_length=20, horizons=4, seed=7)
+        self.assertEqual(noise.shape, (50, 4))
+
+        coefficients = np.polyfit(self.x, self.y, 1)
+        fitted = np.polyval(coefficients, self.x)
+        residuals = self.y - fitted
+        rng = np.random.default_rng(np.random.SeedSequence(7).spawn(1)[0])
+        indices = analysis.block_bootstrap_indices(rng, len(self.x), 20, 50)
+        expected = np.polyfit(self.x, (fitted + residuals[indices]).T, 1)
+
+        np.testing.assert_allclose(slopes, expected[0], rtol=1e-8)
+        np.testing.assert_allclose(intercepts, expected[1], rtol=1e-8)
+
+    def test_bootstrap_does_not_depend_on_jobs(self):
+        serial = analysis.bootstrap_trend_lines(self.x, self.y, replicates=1200, seed=1)
+        parallel = analysis.bootstrap_trend_lines(self.x, self.y, replicates=1200, seed=1, jobs=2)
+        for serial_values, parallel_values in zip(serial, parallel):
+            np.testing.assert_array_equal(serial_values, parallel_values)
+
+    def test_forecast_file_reports_intervals_and_segments(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "forecast.txt")
+            segments = analysis.forecast_future_lake_level(self.df, file_path, replicates=500)
+            with open(file_path, encoding="utf-8") as f:
+                output = f.read()
+
+        self.assertEqual(segments[-1]['end'], len(self.df))
+        self.assertIn("Detected trend segments (pelt):", output)
+        self.assertRegex(output, r"Forecast for 10 years .*: [\d.]+ m \(95% prediction interval [\d.]+ to [\d.]+ m\)")
+        self.assertIn("Days until dry among those", output)
+
+class TestBacktest(unittest.TestCase):
+    def test_backtest_scores_both_horizons(self):
+        rng = np.random.default_rng(5)
+        dates = pd.date_range(start="1990-01-01", periods=9000, freq="D")
+        lakelevel = 20 - 0.0001 * np.arange(9000) + rng.normal(0, 0.01, 9000)
+        df = pd.DataFrame({"date": dates, "lakelevel": lakelevel})
+
+        table = analysis.backtest_lake_level_forecast(df, horizons=(1, 10), step_days=90, min_history_years=5)
+        summary = analysis.summarize_backtest(table)
+
+        self.assertEqual(set(table['horizon_years']), {1, 10})
+        self.assertTrue((table['origin_date'] >= pd.Timestamp("1995-01-01")).all())
+        self.assertTrue((table['trend_start_date'] <= table['origin_date']).all())
+        # A noisy straight line is forecast almost perfectly
+        self.assertLess(summary['mae'].max(), 0.05)
+
 if __name__ == "__main__":
     unittest.main()
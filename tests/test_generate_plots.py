@@ -1,6 +1,8 @@
 import os
 import tempfile
+import threading
 import unittest
+from unittest import mock
 import pandas as pd
 import numpy as np
 
@@ -43,5 +45,120 @@ class TestGeneratePlots(unittest.TestCase):
             generate_plots.plot_seasonal_correlation(self.sample_data, tmpdir + "/")
             self.assertTrue(os.path.exists(os.path.join(tmpdir, "seasonal_correlation.png")))
 
+    def test_large_correlation_is_drawn_as_density(self):
+        rng = np.random.default_rng(14)
+        temperature = rng.normal(10, 5, 20000)
+        data = pd.DataFrame({"temperature": temperature, "lakelevel": 20 - 0.02 * temperature + rng.normal(0, 0.2, 20000)})
+        renderer = generate_plots.PlotRenderer(dpi=20)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer.render_correlation(data, "temperature", "lakelevel", os.path.join(tmpdir, "temperature_correlation.png"),
+                                        density_threshold=5000, bins=50)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "temperature_correlation.png")))
+
+        self.assertNotIn("correlation", renderer.templates)  # No scatter plot was drawn
+        template = renderer.templates["density_marginals"]
+        counts = template["image"].get_array()
+        self.assertEqual(counts.shape, (50, 50))
+        self.assertEqual(counts.sum(), 20000)
+        np.testing.assert_array_equal(template["top_histogram"].get_data().values, np.histogram(temperature, bins=50)[0])
+
+        # The trend line is fitted on every point, not on the bins
+        trend_x, trend_y = template["trend_line"].get_data()
+        slope = np.polyfit(data["temperature"], data["lakelevel"], 1)[0]
+        self.assertAlmostEqual((trend_y[-1] - trend_y[0]) / (trend_x[-1] - trend_x[0]), slope)
+
+    def test_render_profiles(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for profile in ("draft", "web", "publication"):
+                renderer = generate_plots.PlotRenderer(profile=profile)
+                file_path = os.path.join(tmpdir, profile, "lakelevel_timeseries.png")
+                os.makedirs(os.path.dirname(file_path))
+                renderer.render_timeseries(self.sample_data, "lakelevel", file_path)
+
+                written = sorted(os.path.relpath(os.path.join(folder, f), tmpdir) for folder, _, files in os.walk(os.path.join(tmpdir, profile)) for f in files)
+                self.assertEqual(written, sorted(os.path.relpath(path, tmpdir) for path in renderer.get_output_paths(file_path)))
+                with generate_plots.Image.open(file_path) as image:
+                    self.assertEqual(image.width, 10 * generate_plots.RENDER_PROFILES[profile]["dpi"])
+
+            with generate_plots.Image.open(generate_plots.get_thumbnail_path(os.path.join(tmpdir, "web", "lakelevel_timeseries.png"))) as thumbnail:
+                self.assertEqual(thumbnail.size, (480, 288))
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "publication", "lakelevel_timeseries.pdf")))
+
+        with self.assertRaises(ValueError):
+            generate_plots.PlotRenderer(profile="poster")
+
+    def test_graph_bytes_do_not_depend_on_render_order(self):
+        dates = pd.date_range(start="2020-01-01", periods=400, freq="D")
+        data = pd.DataFrame({
+            "date": dates,
+            "lakelevel": np.linspace(50, 55, 400),
+            "temperature": np.linspace(10, 20, 400),
+            "total phosphorus": np.linspace(0.001, 1200000, 400),  # Much wider tick labels than the others
+        })
+        data["month"] = data["date"].dt.month
+        seasonal = data.groupby("month", as_index=False)[["lakelevel", "total phosphorus"]].mean()
+
+        def render(tmpdir, order):
+            renderer = generate_plots.PlotRenderer(profile="draft")
+            for variable in order:
+                renderer.render_timeseries(data, variable, os.path.join(tmpdir, f"{variable}_timeseries.png"))
+                renderer.render_correlation(data, variable, "lakelevel", os.path.join(tmpdir, f"{variable}_correlation.png"))
+                renderer.render_seasonal(seasonal, variable if variable in seasonal else "lakelevel",
+                                         os.path.join(tmpdir, f"{variable}_seasonal_correlation.png"))
+            return {f: open(os.path.join(tmpdir, f), "rb").read() for f in sorted(os.listdir(tmpdir))}
+
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            forward = render(first, ["total phosphorus", "temperature", "lakelevel"])
+            backward = render(second, ["lakelevel", "temperature", "total phosphorus"])
+        self.assertEqual(forward.keys(), backward.keys())
+        self.assertEqual([f for f in forward if forward[f] != backward[f]], [])
+
+    def test_graphs_without_data_do_not_keep_the_previous_view(self):
+        def monthly_means(values):
+            return pd.DataFrame({"month": [1, 2, 3], "lakelevel": values})
+
+        def render(renderer, values, file_path):
+            renderer.render_seasonal(monthly_means(values), "lakelevel", file_path)
+            with open(file_path, "rb") as f:
+                return f.read()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            used = generate_plots.PlotRenderer(profile="draft")
+            render(used, [20, 21, 19], os.path.join(tmpdir, "previous.png"))
+            empty = render(used, [np.nan] * 3, os.path.join(tmpdir, "empty.png"))
+            following = render(used, [5, 6, 7], os.path.join(tmpdir, "following.png"))
+
+            self.assertEqual(empty, render(generate_plots.PlotRenderer(profile="draft"), [np.nan] * 3,
+                                           os.path.join(tmpdir, "fresh_empty.png")))
+            self.assertEqual(following, render(generate_plots.PlotRenderer(profile="draft"), [5, 6, 7],
+                                               os.path.join(tmpdir, "fresh_following.png")))
+
+    def test_cross_correlation_uses_the_loaded_assets(self):
+        generate_plots.get_plot_renderer()
+        lags = np.arange(-10, 11)
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                mock.patch.object(generate_plots, "load_variable_dict_from_file", side_effect=AssertionError("assets read again")):
+            generate_plots.plot_cross_correlation(lags, np.cos(lags / 5), "temperature", "lakelevel", tmpdir + "/")
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "temperature_cross_correlation.png")))
+
+    def test_image_writer_applies_backpressure_and_collects_errors(self):
+        writer = generate_plots.ImageWriter(threads=1, max_pending=1)
+        release = threading.Event()
+        second_submitted = threading.Event()
+        written = []
+
+        writer.submit("first.png", lambda: release.wait() and written.append("first"))
+        submitter = threading.Thread(target=lambda: (writer.submit("second.png", written.append, "second"), second_submitted.set()))
+        submitter.start()
+        self.assertFalse(second_submitted.wait(0.2))  # The only slot is taken until the first write finishes
+
+        release.set()
+        submitter.join()
+        writer.submit("broken.png", lambda: 1 / 0)
+        errors = writer.close()
+        self.assertEqual(written, ["first", "second"])
+        self.assertEqual(list(errors), ["broken.png"])
+        self.assertIn("ZeroDivisionError", errors["broken.png"])
+
 if __name__ == "__main__":
     unittest.main()
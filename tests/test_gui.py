@@ -0,0 +1,140 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # No window is shown, the tests only need a QApplication
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+# The GUI imports the CLI by bare name, like it does when started from src/app
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src" / "app"))
+import gui
+
+APP = QApplication.instance() or QApplication([])
+
+def write_sample_csv(path, variables):
+    frame = pd.DataFrame({"date": pd.date_range(start="2024-01-01", periods=60, freq="D"),
+                          "lakelevel": np.linspace(50, 55, 60)})
+    for variable in variables:
+        frame[variable] = np.linspace(10, 20, 60)
+    frame.to_csv(path, index=False)
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def create_image(width, height):
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(0)
+    return image
+
+class TestPixmapCache(unittest.TestCase):
+    def test_least_recently_used_images_are_evicted_beyond_the_budget(self):
+        cache = gui.PixmapCache(max_bytes=1000)  # Room for two 10x10 ARGB images of 400 bytes
+        cache.put('a', create_image(10, 10))
+        cache.put('b', create_image(10, 10))
+        cache.get('a')
+        cache.put('c', create_image(10, 10))
+
+        self.assertEqual(list(cache.entries), ['a', 'c'])
+        self.assertEqual(cache.used_bytes, 800)
+
+    def test_images_over_the_budget_and_missing_keys_are_not_cached(self):
+        cache = gui.PixmapCache(max_bytes=1000)
+        cache.put('a', create_image(10, 10))
+        cache.put('large', create_image(20, 20))
+        cache.put(None, create_image(10, 10))
+        cache.put('a', create_image(10, 10))
+
+        self.assertEqual(list(cache.entries), ['a'])
+        self.assertEqual(cache.used_bytes, 400)
+
+    def test_key_changes_with_the_file_and_target_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "graph.png")
+            self.assertIsNone(gui.PixmapCache.get_key(path))
+
+            create_image(40, 20).save(path)
+            key = gui.PixmapCache.get_key(path)
+            self.assertEqual(key[0], path)
+            self.assertIsNone(key[2])
+            self.assertEqual(gui.PixmapCache.get_key(path, QSize(100, 50))[2], (100, 50))
+
+            touch_later(path)
+            self.assertNotEqual(gui.PixmapCache.get_key(path), key)
+
+    def test_scaled_images_are_decoded_once_and_fit_the_size(self):
+        cache = gui.PixmapCache()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "graph.png")
+            create_image(40, 20).save(path)
+
+            pixmap = cache.get_scaled(path, QSize(20, 20))
+            self.assertEqual((pixmap.width(), pixmap.height()), (20, 10))
+            self.assertIn(gui.PixmapCache.get_key(path), cache)
+            self.assertIs(cache.get_scaled(path, QSize(20, 20)), pixmap)
+            self.assertIsNone(cache.get_scaled(os.path.join(tmpdir, "missing.png"), QSize(20, 20)))
+
+class TestGraphWorker(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(gui.cli.dataset_cache.configure_cache)
+
+    def test_sessions_are_reused_until_a_source_file_changes(self):
+        worker = gui.GraphWorker()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            write_sample_csv(path, ["temperature"])
+            argv = [path, "--y_variable_source", path, "--y_variable", "lakelevel", "--no-cache"]
+
+            session = worker.get_session(argv)
+            self.assertIs(worker.get_session(argv), session)
+            self.assertNotIn(("timeseries", "humidity"), [task[:2] for task in session['tasks']])
+
+            write_sample_csv(path, ["temperature", "humidity"])
+            touch_later(path)  # The rewrite may land within the filesystem's mtime resolution
+            reloaded = worker.get_session(argv)
+            self.assertIsNot(reloaded, session)
+            self.assertIn(("timeseries", "humidity"), [task[:2] for task in reloaded['tasks']])
+
+    def test_least_recently_used_sessions_are_dropped(self):
+        worker = gui.GraphWorker()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            write_sample_csv(path, ["temperature"])
+            argvs = [[path, "--y_variable", "lakelevel", "--no-cache", "--max_points", str(points)]
+                     for points in range(100, 100 + gui.SESSION_CACHE_SIZE + 1)]
+            for argv in argvs:
+                worker.get_session(argv)
+
+            self.assertEqual(len(worker.sessions), gui.SESSION_CACHE_SIZE)
+            self.assertNotIn(tuple(argvs[0]), [key[0] for key in worker.sessions])
+
+class TestRenderKey(unittest.TestCase):
+    def test_key_changes_with_the_sources_and_the_save_profile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            param_path = os.path.join(tmpdir, "parameters.csv")
+            y_path = os.path.join(tmpdir, "levels.csv")
+            write_sample_csv(param_path, ["temperature"])
+            write_sample_csv(y_path, [])
+
+            def get_key(kind, save_profile=None):
+                return gui.MainWindow.get_render_key(kind, "temperature", "lakelevel", param_path, y_path, save_profile)
+
+            timeseries, correlation = get_key("timeseries"), get_key("correlation")
+            self.assertNotEqual(get_key("timeseries", "web"), timeseries)
+            self.assertNotEqual(get_key("timeseries", "web"), get_key("timeseries", "draft"))
+
+            # Only correlation graphs are drawn from the y variable source
+            touch_later(y_path)
+            self.assertEqual(get_key("timeseries"), timeseries)
+            self.assertNotEqual(get_key("correlation"), correlation)
+            touch_later(param_path)
+            self.assertNotEqual(get_key("timeseries"), timeseries)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.core import interpolation
+from src.core import streaming
+
+DAY = interpolation.NANOSECONDS_PER_DAY
+
+class TestInterpolateTime(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        dates = pd.Series(pd.date_range(start="2000-01-01", periods=300, freq="5D"))
+        self.dates = pd.DatetimeIndex(dates.sample(frac=1, random_state=6))  # Rows out of date order, like the chemical sheet
+        self.times = self.dates.to_numpy().view(np.int64)
+        self.values = rng.normal(size=300)
+        self.values[rng.random(300) < 0.6] = np.nan
+        self.values[:4] = np.nan
+
+    def test_matches_pandas_without_max_gap(self):
+        expected = pd.Series(self.values, index=self.dates).interpolate(method='time').to_numpy()
+        np.testing.assert_array_equal(interpolation.interpolate_time(self.times, self.values), expected)
+
+    def test_long_gaps_stay_missing(self):
+        times = np.array([0, 1, 2, 10, 11, 12, 20, 26]) * DAY
+        values = np.array([np.nan, 1.0, np.nan, np.nan, 3.0, np.nan, 5.0, np.nan])
+
+        filled = interpolation.interpolate_time(times, values, max_gap=5 * DAY)
+
+        # Leading row stays missing, 1 -> 11 is a 10 day gap, 11 -> 20 is 9 days, the last row is 6 days past the last reading
+        np.testing.assert_array_equal(np.isnan(filled), [True, False, True, True, False, True, False, True])
+        np.testing.assert_array_equal(interpolation.interpolate_time(times, values, max_gap=10 * DAY)[[2, 3, 5, 7]],
+                                      [1.2, 2.8, 3 + 2 / 9 * 1, 5.0])
+
+    def test_parse_max_gap_days(self):
+        max_gaps = interpolation.parse_max_gap_days(['30', 'Chlorophyll A=400'])
+        self.assertEqual(max_gaps, {None: 30.0, 'chlorophyll a': 400.0})
+        self.assertEqual(interpolation.get_max_gap(max_gaps, 'calcium'), 30 * DAY)
+        self.assertEqual(interpolation.get_max_gap({}, 'calcium'), np.inf)
+        with self.assertRaises(ValueError):
+            interpolation.parse_max_gap_days(['calcium=often'])
+
+    def test_streaming_applies_the_same_max_gap(self):
+        times = np.sort(self.times)
+        expected = interpolation.interpolate_time(times, self.values, max_gap=20 * DAY)
+
+        interpolator = streaming.StreamingInterpolator(1, max_gaps=[20 * DAY])
+        for start in range(0, 300, 7):
+            interpolator.add_chunk(times[start:start + 7], self.values[start:start + 7, None])
+
+        np.testing.assert_array_equal(interpolator.finish()[1][:, 0], expected)
+
+if __name__ == '__main__':
+    unittest.main()
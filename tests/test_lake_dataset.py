@@ -0,0 +1,61 @@
+import unittest
+import pandas as pd
+import numpy as np
+
+from src.core import lake_dataset
+
+def create_sample_frames():
+    dates = pd.date_range(start="2021-01-01", periods=10, freq="D")
+    physical = pd.DataFrame({
+        "date": dates,
+        "temperature": np.arange(10.0),
+        "calcium": np.full(10, 1.0),
+    })
+    chemical = pd.DataFrame({
+        "date": [dates[2], dates[2], pd.Timestamp("2021-01-20")],  # Two readings on one date
+        "calcium": [40.0, 42.0, 44.0],
+        "chloride": [20.0, np.nan, 22.0],
+    })
+    return {"physical": physical, "chemical": chemical}
+
+class TestLakeDataset(unittest.TestCase):
+    def setUp(self):
+        self.frames = create_sample_frames()
+        self.dataset = lake_dataset.LakeDataset.from_frames(self.frames)
+
+    def test_sources_share_one_sorted_date_axis(self):
+        self.assertEqual(len(self.dataset), 11)
+        self.assertTrue(np.all(np.diff(self.dataset.dates) > np.timedelta64(0)))
+        self.assertEqual(self.dataset.source_rows['chemical'].sum(), 2)
+        self.assertEqual(self.dataset.get_values('calcium', 'chemical')[2], 41.0)
+        self.assertEqual(self.dataset.get_mask('chloride').sum(), 2)
+
+    def test_values_are_views(self):
+        values = self.dataset.get_values('temperature', start="2021-01-03", end="2021-01-05")
+        np.testing.assert_array_equal(values, [2.0, 3.0, 4.0])
+        self.assertTrue(np.shares_memory(values, self.dataset.columns['physical']['temperature']))
+        window = self.dataset.window(end="2021-01-05")
+        self.assertEqual(len(window), 5)
+        self.assertTrue(np.shares_memory(window.get_values('chloride'), self.dataset.get_values('chloride')))
+
+    def test_frame_is_left_merge_onto_source(self):
+        frame = self.dataset.frame('physical', ['temperature', 'calcium', 'chloride'])
+        merged = pd.merge(self.frames['physical'], self.frames['chemical'].groupby('date', as_index=False).mean(),
+                          on='date', how='left', suffixes=('', '_chemical'))
+        pd.testing.assert_frame_equal(frame, merged[['date', 'temperature', 'calcium', 'chloride']])
+
+    def test_compact_storage_and_names(self):
+        compact = lake_dataset.LakeDataset.from_frames(self.frames, dtype=np.float32)
+        self.assertEqual(compact.get_values('temperature').dtype, np.float32)
+        self.assertEqual([name for _, _, name in compact.qualified_names()],
+                         ['temperature', 'calcium (physical)', 'calcium (chemical)', 'chloride'])
+
+    def test_daily_grid_covers_every_day(self):
+        start, grid = self.dataset.daily_grid(['temperature', 'chloride'])
+        self.assertEqual(start, pd.Timestamp("2021-01-01"))
+        self.assertEqual(grid.shape, (20, 2))
+        self.assertEqual(grid[19, 1], 22.0)
+        self.assertTrue(np.isnan(grid[15, 0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.app import cli
+from src.core import streaming
+
+def create_sample_readings():
+    rng = np.random.default_rng(5)
+    dates = pd.date_range(start="2023-03-01", periods=2000, freq="3h")
+    values = rng.normal(size=(2000, 3)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.4] = np.nan
+    values[:25, 0] = np.nan  # Before the first reading
+    values[700:1300, 1] = np.nan  # Gap over several chunks
+    values[-60:, 2] = np.nan  # After the last reading
+    return pd.DataFrame(values, index=dates, columns=['temperature', 'humidity', 'groundwater'])
+
+class TestStreamingInterpolator(unittest.TestCase):
+    def setUp(self):
+        self.readings = create_sample_readings()
+        self.expected = self.readings.interpolate(method='time')
+        self.times = self.readings.index.to_numpy().view(np.int64)
+
+    def stream(self, chunk_rows, daily=False):
+        interpolator = streaming.StreamingInterpolator(3, daily=daily)
+        for start in range(0, len(self.times), chunk_rows):
+            interpolator.add_chunk(self.times[start:start + chunk_rows], self.readings.to_numpy()[start:start + chunk_rows])
+        return interpolator.finish()
+
+    def test_chunks_match_whole_interpolation(self):
+        for chunk_rows in (1, 97, 5000):
+            times, values = self.stream(chunk_rows)
+            np.testing.assert_array_equal(times, self.times)
+            np.testing.assert_array_equal(values, self.expected.to_numpy())
+
+    def test_daily_means(self):
+        days, means = self.stream(97, daily=True)
+        expected = self.expected.groupby(self.expected.index.normalize()).mean()
+        np.testing.assert_array_equal(days, expected.index.to_numpy().astype('datetime64[D]'))
+        np.testing.assert_allclose(means, expected.to_numpy(), rtol=1e-12)
+
+    def test_rows_out_of_order_are_rejected(self):
+        interpolator = streaming.StreamingInterpolator(3)
+        interpolator.add_chunk(self.times[10:20], self.readings.to_numpy()[10:20])
+        with self.assertRaises(ValueError):
+            interpolator.add_chunk(self.times[:10], self.readings.to_numpy()[:10])
+
+    def test_streamed_csv_matches_parsed_csv(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, 'hourly.csv')
+            self.readings.rename_axis('Date').reset_index().to_csv(csv_path, index=False)
+
+            parsed = cli.parse_and_process_x_data(csv_path).reset_index(drop=True)
+            streamed = cli.stream_and_process_x_data(csv_path, chunk_rows=150)
+            pd.testing.assert_frame_equal(streamed, parsed, check_dtype=False)
+
+            projected = cli.stream_and_process_x_data(csv_path, ['humidity'], chunk_rows=150)
+            self.assertEqual(list(projected.columns), ['date', 'humidity'])
+
+if __name__ == '__main__':
+    unittest.main()